@@ -0,0 +1,80 @@
+# alertEngine.py
+"""
+Due-date alert engine for the Task Manager application.
+Keeps unfinished tasks that are not yet due soon in a min-heap ordered by due
+date, so moving to a new day only pops the tasks whose "(!)" alert switches
+on, instead of rescanning every task. Changes to tasks are applied one task
+at a time.
+"""
+import heapq
+from datetime import date, datetime, timedelta
+
+ALERT_DAYS = 1  # A task alerts when it is due within this many days and not completed
+
+class AlertEngine:
+    """Tracks which tasks of a TaskCollection currently show the due-soon alert."""
+
+    def __init__(self, tasks, today=None):
+        self.tasks = tasks
+        self.today = today or date.today().toordinal()
+        self.alerting = set()  # Sequence numbers of alerting tasks
+        self.pending = {}  # Sequence number -> due ordinal of tasks that will alert later
+        self.heap = []  # (due ordinal, sequence number); entries not matching pending are stale
+        for seq in tasks.sortedSeqs():
+            self.place(seq, tasks.get(seq))
+        heapq.heapify(self.heap)
+
+    def place(self, seq, task):
+        """Put a task into the alerting set or the heap (without restoring heap order)."""
+        if task.completed:
+            return
+        if task.due - self.today <= ALERT_DAYS:
+            self.alerting.add(seq)
+        else:
+            self.pending[seq] = task.due
+            self.heap.append((task.due, seq))
+
+    def isAlerting(self, seq):
+        """Return True if the task with sequence number seq shows the alert."""
+        return seq in self.alerting
+
+    def taskChanged(self, seq):
+        """Update the alert state of an added or edited task."""
+        self.taskRemoved(seq)
+        task = self.tasks.get(seq)
+        if not task.completed and task.due - self.today > ALERT_DAYS:
+            self.pending[seq] = task.due
+            heapq.heappush(self.heap, (task.due, seq))
+        elif not task.completed:
+            self.alerting.add(seq)
+
+    def taskRemoved(self, seq):
+        """Forget a deleted task; its heap entry becomes stale and is skipped later."""
+        self.alerting.discard(seq)
+        self.pending.pop(seq, None)
+        if len(self.heap) > 2 * len(self.pending) + 64:
+            self.heap = [(due, seq) for seq, due in self.pending.items()]
+            heapq.heapify(self.heap)
+
+    def advance(self, today=None):
+        """Move to a new day and return the sequence numbers whose alert switched on."""
+        self.today = today or date.today().toordinal()
+        started = []
+        heap = self.heap
+        while heap and heap[0][0] - self.today <= ALERT_DAYS:
+            due, seq = heapq.heappop(heap)
+            if self.pending.get(seq) == due:
+                del self.pending[seq]
+                self.alerting.add(seq)
+                started.append(seq)
+        return started
+
+    def secondsUntilNextChange(self, now=None):
+        """Seconds until the next task starts alerting, or None if none will."""
+        while self.heap and self.pending.get(self.heap[0][1]) != self.heap[0][0]:
+            heapq.heappop(self.heap)  # Drop stale entries so the top is meaningful
+        if not self.heap:
+            return None
+        now = now or datetime.now()
+        startDay = date.fromordinal(self.heap[0][0] - ALERT_DAYS)
+        return max(0.0, (datetime.combine(startDay, datetime.min.time()) - now) / timedelta(seconds=1))
\ No newline at end of file
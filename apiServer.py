@@ -0,0 +1,302 @@
+# apiServer.py
+"""
+HTTP/JSON API for the Task Manager application.
+Serves the in-memory task list to many clients at once using asyncio, with
+keep-alive connections. Changes are collected and written together once per
+flush interval (one journal append or one database transaction) instead of
+once per request; the write runs on a worker thread, so connections keep
+being accepted and read meanwhile, and requests wait only to touch the tasks.
+
+    GET    /tasks[?sort=priority|dueDate&offset=N&limit=N]   list tasks
+    GET    /tasks/today                                      tasks due today
+    GET    /tasks/ID                                         one task
+    POST   /tasks                                            add a task
+    PATCH  /tasks/ID                                         change some fields
+    DELETE /tasks/ID                                         delete a task
+
+Tasks are sent and received in their tasks.json form and addressed by id;
+a repeat rule may also be sent as text such as "weekly" or "every 2 days".
+"""
+import argparse
+import asyncio
+import json
+import threading
+from datetime import date
+from itertools import islice
+from urllib.parse import urlsplit, parse_qs
+from fileOperations import saveTasks, recordChanges, changeLogActive, syncTasks
+from taskModel import Task, Priority, Recurrence, parseDate, finishOccurrence, stampCompletion
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+FLUSH_INTERVAL = 0.5  # Seconds between writes of the collected changes
+IDLE_TIMEOUT = 60  # Seconds a keep-alive connection may wait for its next request
+MAX_BODY_SIZE = 1024 * 1024
+
+STATUS_TEXT = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+}
+
+class ApiError(Exception):
+    """Raised for a request that cannot be served; carries the HTTP status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def parseHead(head):
+    """Split a request head into (method, target, version, headers with lowercase names)."""
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ")
+    except ValueError:
+        raise ApiError(400, "malformed request line")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    return method, target, version, headers
+
+def wantsKeepAlive(version, headers):
+    """Return True if the connection stays open after this request (HTTP/1.1 default)."""
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        return connection == "keep-alive"
+    return connection != "close"
+
+def responseBytes(status, payload, keepAlive):
+    """Encode a JSON response."""
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keepAlive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+def readJson(body):
+    """Return the JSON object sent as a request body."""
+    try:
+        data = json.loads(body)
+    except ValueError:
+        raise ApiError(400, "body must be JSON")
+    if not isinstance(data, dict):
+        raise ApiError(400, "body must be a JSON object")
+    return data
+
+def taskFromJson(data, task=None):
+    """Build a task from request fields; missing fields are taken from task, if given."""
+    fields = {}
+    for key, kind in (("title", str), ("description", str), ("completed", bool)):
+        if key in data:
+            if not isinstance(data[key], kind):
+                raise ApiError(400, f"{key} must be a {kind.__name__}")
+            fields[key] = data[key]
+        elif task is not None:
+            fields[key] = getattr(task, key)
+    if "priority" in data:
+        fields["priority"] = Priority.parse(data["priority"])
+        if fields["priority"] is None:
+            raise ApiError(400, "priority must be high, medium or low")
+    else:
+        fields["priority"] = task.priority if task is not None else Priority.MEDIUM
+    if "dueDate" in data:
+        try:
+            fields["due"] = parseDate(str(data["dueDate"]))
+        except ValueError:
+            raise ApiError(400, "dueDate must be a valid DD-MM-YYYY date")
+    elif task is not None:
+        fields["due"] = task.due
+    if "title" not in fields or "due" not in fields:
+        raise ApiError(400, "title and dueDate are required")
+    repeat = task.repeat if task is not None else None
+    if "repeat" in data:
+        try:
+            if isinstance(data["repeat"], dict):
+                repeat = Recurrence.fromDict(data["repeat"])
+            else:
+                repeat = Recurrence.fromText(data["repeat"] or "", fields["due"])
+        except (KeyError, TypeError, ValueError, AttributeError):
+            raise ApiError(400, "repeat must be null, a rule such as \"every 2 weeks\" or {unit, every, anchor[, until]}")
+    # Completing a recurring task finishes this occurrence and moves it on to the next;
+    # completing any other task records the day, which decides when it is archived
+    return stampCompletion(finishOccurrence(Task(fields["title"], fields.get("description", ""), fields["priority"],
+                                                 fields["due"], fields.get("completed", False),
+                                                 task.extra if task is not None else None, repeat=repeat)), task)
+
+def contentLength(headers):
+    """Return the request's Content-Length as a non-negative integer."""
+    text = headers.get("content-length", "0")
+    if not text.isdigit():
+        raise ApiError(400, "Content-Length must be a non-negative integer")
+    length = int(text)
+    if length > MAX_BODY_SIZE:
+        raise ApiError(413, "request body too large")
+    return length
+
+def queryNumber(query, name, default):
+    """Return a non-negative integer query parameter."""
+    values = query.get(name)
+    if not values:
+        return default
+    if not values[0].isdigit():
+        raise ApiError(400, f"{name} must be a non-negative integer")
+    return int(values[0])
+
+class TaskServer:
+    """Serves a TaskCollection over HTTP and writes its changes in batches."""
+
+    def __init__(self, tasks, save=saveTasks, flushInterval=FLUSH_INTERVAL):
+        self.tasks = tasks
+        self.save = save  # Used when no journal or store records changes
+        self.flushInterval = flushInterval
+        self.changes = []  # (action, index, task) not written yet
+        self.busy = None  # asyncio.Lock held while a request or a flush uses the tasks, created by serve
+        self.flushing = threading.Lock()  # Keeps the final flush from overlapping one still running on its thread
+
+    async def handleConnection(self, reader, writer):
+        """Serve the requests of one connection until the client closes it or goes idle."""
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), IDLE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+                    break
+                try:
+                    method, target, version, headers = parseHead(head)
+                    length = contentLength(headers)
+                except ApiError as error:
+                    writer.write(responseBytes(error.status, {"error": str(error)}, False))
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keepAlive = wantsKeepAlive(version, headers)
+                async with self.busy:  # Not while a flush is syncing the tasks on its thread
+                    status, payload = self.respond(method, target, body)
+                writer.write(responseBytes(status, payload, keepAlive))
+                await writer.drain()
+                if not keepAlive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def respond(self, method, target, body):
+        """Return (status, JSON payload) for one request."""
+        url = urlsplit(target)
+        parts = [part for part in url.path.split("/") if part]
+        try:
+            if not parts or parts[0] != "tasks" or len(parts) > 2:
+                raise ApiError(404, "no such resource")
+            if len(parts) == 1:
+                if method == "GET":
+                    return 200, self.listTasks(parse_qs(url.query))
+                if method == "POST":
+                    return 201, self.addTask(readJson(body))
+            elif parts[1] == "today":
+                if method == "GET":
+                    return 200, self.todayTasks()
+            else:
+                seq = self.tasks.seqById.get(parts[1])
+                if seq is None:
+                    raise ApiError(404, "no task with that id")
+                if method == "GET":
+                    return 200, self.tasks.get(seq).toDict()
+                if method in ("PATCH", "PUT"):
+                    return 200, self.editTask(seq, readJson(body))
+                if method == "DELETE":
+                    return 200, self.deleteTask(seq)
+            raise ApiError(405, f"{method} is not allowed here")
+        except ApiError as error:
+            return error.status, {"error": str(error)}
+
+    def listTasks(self, query):
+        """Return a page of the tasks, optionally sorted by priority or due date."""
+        sortBy = query.get("sort", [None])[0]
+        if sortBy not in (None, "priority", "dueDate"):
+            raise ApiError(400, "sort must be priority or dueDate")
+        offset = queryNumber(query, "offset", 0)
+        limit = queryNumber(query, "limit", None)
+        page = islice(self.tasks.sortedBy(sortBy), offset, None if limit is None else offset + limit)
+        return {"total": len(self.tasks), "tasks": [task.toDict() for task in page]}
+
+    def todayTasks(self):
+        """Return the tasks due today, read from the due-date index."""
+        bySeq = self.tasks.bySeq
+        return {"tasks": [bySeq[seq].toDict() for seq in self.tasks.seqsDueOn(date.today().toordinal())]}
+
+    def addTask(self, data):
+        """Add a task and return it with its new id."""
+        task = taskFromJson(data)
+        self.tasks.append(task)
+        self.changes.append(("add", None, task))
+        return task.toDict()
+
+    def editTask(self, seq, data):
+        """Replace some fields of a task and return the new version."""
+        self.tasks.replaceSeq(seq, taskFromJson(data, self.tasks.get(seq)))
+        task = self.tasks.get(seq)
+        self.changes.append(("edit", None, task))
+        return task.toDict()
+
+    def deleteTask(self, seq):
+        """Delete a task and return it."""
+        deletedTask = self.tasks.removeSeq(seq)
+        self.changes.append(("delete", None, deletedTask))
+        return deletedTask.toDict()
+
+    def flush(self):
+        """Write the collected changes in one go, then pick up other processes' changes."""
+        with self.flushing:
+            changes, self.changes = self.changes, []
+            if changes:
+                if changeLogActive():
+                    recordChanges(changes)
+                else:
+                    self.save(self.tasks)
+            syncTasks()
+
+    async def flushPeriodically(self):
+        """Flush once per flush interval while the server runs, on a worker thread so the event loop keeps serving I/O."""
+        while True:
+            await asyncio.sleep(self.flushInterval)
+            async with self.busy:
+                await asyncio.to_thread(self.flush)
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+        """Accept connections until cancelled; calls ready(server) once listening."""
+        self.busy = asyncio.Lock()
+        server = await asyncio.start_server(self.handleConnection, host, port)
+        flusher = asyncio.create_task(self.flushPeriodically())
+        try:
+            async with server:
+                if ready is not None:
+                    ready(server)
+                await server.serve_forever()
+        finally:
+            flusher.cancel()
+            self.flush()
+
+def runServer(tasks, argv=(), save=saveTasks):
+    """Run the API server in the foreground until Ctrl+C; argv may give --host, --port and --flush-interval."""
+    parser = argparse.ArgumentParser(prog="main.py serve", description="Serve the tasks as an HTTP/JSON API")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--flush-interval", type=float, default=FLUSH_INTERVAL,
+                        help="seconds between writes of the collected changes")
+    args = parser.parse_args(list(argv))
+    taskServer = TaskServer(tasks, save, args.flush_interval)
+
+    def announce(server):
+        host, port = server.sockets[0].getsockname()[:2]
+        print(f"Serving tasks on http://{host}:{port}/tasks (Ctrl+C to stop)", flush=True)
+
+    try:
+        asyncio.run(taskServer.serve(args.host, args.port, announce))
+    except KeyboardInterrupt:
+        pass
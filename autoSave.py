@@ -0,0 +1,93 @@
+# autoSave.py
+"""
+Background autosave for the Task Manager application.
+Every change is already appended to the journal as it happens; this folds
+the journal into a fresh tasks.json snapshot once changes pause, so the file
+on disk stays compact and up to date. The snapshot is encoded and written to
+a temporary file on a worker thread; the UI thread only copies the task list
+and, once the worker reports back, renames the file into place. The UI
+calls poll periodically (e.g. from root.after), so it never waits for disk.
+"""
+import os
+import queue
+import threading
+import time
+from fileOperations import currentJournal, prepareSnapshot
+
+AUTOSAVE_DELAY = 2.0  # Seconds without changes before a snapshot is written
+
+class AutoSaver:
+    """Writes snapshots of a journaled task file after a quiet period, on a worker thread."""
+
+    def __init__(self, journal, delay=AUTOSAVE_DELAY):
+        self.journal = journal
+        self.delay = delay
+        self.version = 0  # Changes seen so far
+        self.savedVersion = 0  # Version of the last snapshot written
+        self.dueAt = None  # time.monotonic() at which a snapshot is due, if one is
+        self.busy = False  # A snapshot is being written by the worker
+        self.requests = queue.Queue()  # (version, tasks, journal header, journal offset), None to stop
+        self.results = queue.Queue()  # (version, temporary path, stamp, header, offset, error)
+        self.thread = threading.Thread(target=self.work, name="autosave", daemon=True)
+        self.thread.start()
+
+    def changed(self):
+        """Note a change; the snapshot waits until changes pause for delay seconds."""
+        self.version += 1
+        self.dueAt = time.monotonic() + self.delay
+
+    def poll(self):
+        """Install a finished snapshot and start the next one if it is due; call from the UI thread.
+
+        Returns the version just saved, or None if no snapshot finished.
+        """
+        saved = None
+        while True:
+            try:
+                version, tempPath, stamp, header, offset, error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.busy = False
+            if error is not None:
+                print(f"Autosave failed: {error}")
+                self.dueAt = time.monotonic() + self.delay
+            elif self.journal.commitSnapshot(tempPath, stamp, header, offset):
+                self.savedVersion = saved = version
+            elif self.version > self.savedVersion:
+                self.dueAt = time.monotonic() + self.delay  # Stale: something was journaled meanwhile
+        if not self.busy and self.dueAt is not None and time.monotonic() >= self.dueAt:
+            self.dueAt = None
+            self.journal.sync()
+            # Tasks are replaced, never changed in place, so a shallow copy is a consistent snapshot
+            self.requests.put((self.version, self.journal.tasks.copy(), self.journal.header, self.journal.offset))
+            self.busy = True
+        return saved
+
+    def work(self):
+        """Worker thread: encode and write each requested snapshot."""
+        while True:
+            request = self.requests.get()
+            if request is None:
+                return
+            version, tasks, header, offset = request
+            try:
+                tempPath, stamp = prepareSnapshot(tasks, self.journal.filePath)
+                self.results.put((version, tempPath, stamp, header, offset, None))
+            except OSError as error:
+                self.results.put((version, None, None, header, offset, error))
+
+    def close(self):
+        """Stop the worker, dropping any snapshot it had not installed yet."""
+        self.requests.put(None)
+        self.thread.join()
+        while not self.results.empty():
+            tempPath = self.results.get_nowait()[1]
+            if tempPath is not None:
+                os.remove(tempPath)
+
+def startAutoSave(delay=AUTOSAVE_DELAY):
+    """Start autosaving the journaled task file; returns None when nothing is journaled."""
+    journal = currentJournal()
+    if journal is None:
+        return None
+    return AutoSaver(journal, delay)
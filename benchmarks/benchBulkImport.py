@@ -0,0 +1,48 @@
+# benchBulkImport.py
+"""
+Throughput benchmark for bulkOperations.importTasks and exportTasks.
+Generates a CSV and an NDJSON file and reports tasks per second, with and
+without the change journal recording each chunk.
+Run from the repository root: python benchmarks/benchBulkImport.py [COUNT]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bulkOperations import importTasks, exportTasks
+from fileOperations import openJournal, closeJournal
+from taskCollection import TaskCollection
+from taskGenerator import generateTasks
+
+def timeImport(filePath, journalPath=None):
+    """Import filePath into a new collection and return (tasks, tasks per second)."""
+    tasks = TaskCollection()
+    if journalPath:
+        openJournal(tasks, journalPath, compactSize=1 << 40)
+    start = time.perf_counter()
+    report = importTasks(tasks, filePath)
+    elapsed = time.perf_counter() - start
+    closeJournal()
+    return tasks, report.accepted / elapsed
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as directory:
+        csvPath = os.path.join(directory, "tasks.csv")
+        ndjsonPath = os.path.join(directory, "tasks.ndjson")
+        exportTasks(generateTasks(count), csvPath)
+        tasks, rate = timeImport(csvPath)
+        print(f"{'import CSV':<28} {rate:>12,.0f} tasks/s")
+        _, rate = timeImport(csvPath, os.path.join(directory, "journaled.json"))
+        print(f"{'import CSV with journal':<28} {rate:>12,.0f} tasks/s")
+        start = time.perf_counter()
+        exportTasks(tasks, ndjsonPath)
+        print(f"{'export NDJSON':<28} {count / (time.perf_counter() - start):>12,.0f} tasks/s")
+        _, rate = timeImport(ndjsonPath)
+        print(f"{'import NDJSON':<28} {rate:>12,.0f} tasks/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# benchStartup.py
+"""
+Startup-time benchmark for the command interface.
+Compares a batch command with the cost of importing the GUI (which main.py
+used to do on every start), and many single-command invocations with one
+batch invocation reading the same commands from stdin.
+Run from the repository root: python benchmarks/benchStartup.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+MAIN = os.path.join(ROOT, "main.py")
+RUNS = 10
+COMMANDS = 200
+
+def timeRun(arguments, stdin=None):
+    """Return the wall time of one process run, in milliseconds."""
+    start = time.perf_counter()
+    subprocess.run(arguments, input=stdin, stdout=subprocess.DEVNULL, check=False, cwd=ROOT, text=True)
+    return (time.perf_counter() - start) * 1000
+
+def medianRun(arguments, stdin=None):
+    """Median wall time of RUNS process runs, in milliseconds."""
+    return statistics.median(timeRun(arguments, stdin) for _ in range(RUNS))
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        taskFile = os.path.join(directory, "tasks.json")
+        base = [sys.executable, MAIN, "--file", taskFile]
+
+        interpreter = medianRun([sys.executable, "-c", "pass"])
+        guiImport = medianRun([sys.executable, "-c", f"import sys; sys.path.insert(0, {ROOT!r}); import gui"])
+        today = medianRun(base + ["today"])
+        print(f"{'bare interpreter':<34} {interpreter:>9.1f} ms")
+        print(f"{'import gui (old startup cost)':<34} {guiImport:>9.1f} ms")
+        print(f"{'main.py today':<34} {today:>9.1f} ms")
+
+        start = time.perf_counter()
+        for i in range(COMMANDS):
+            subprocess.run(base + ["add", f"Task {i}", "--due", "01-01-2030"], stdout=subprocess.DEVNULL, check=False)
+        separate = (time.perf_counter() - start) * 1000
+        lines = "".join(f'add "Task {i}" --due 01-01-2030\n' for i in range(COMMANDS))
+        batch = timeRun(base + ["batch"], stdin=lines)
+        print(f"{f'{COMMANDS} adds, one process each':<34} {separate:>9.1f} ms ({separate / COMMANDS:.2f} ms/task)")
+        print(f"{f'{COMMANDS} adds, one batch process':<34} {batch:>9.1f} ms ({batch / COMMANDS:.2f} ms/task)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# benchSuite.py
+"""
+Benchmark suite for the hot paths of the Task Manager application.
+Times loading and saving the task file, sorting by each key, showing tasks
+(all and today's, with stdout redirected), date validation and the data
+preparation behind the GUI's refreshTaskList, on synthetic tasks from
+taskGenerator at several sizes. Results are written as JSON; passing an
+earlier results file with --compare reports the change per benchmark and
+exits with status 1 if any got slower than --threshold allows.
+Run from the repository root:
+    python benchmarks/benchSuite.py [--sizes 1000 10000] [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from taskGenerator import writeTaskFile
+from displayUtils import sortTasks, showTasks
+from fileOperations import loadTasks, saveTasks
+from taskModel import parseDate
+from taskOperations import validateDate
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+REPEAT = 3
+THRESHOLD = 1.25  # Slower than this many times the baseline counts as a regression
+GUI_WINDOW = 15  # Rows the GUI materializes in virtual mode
+
+def timeBest(function, repeat):
+    """Return the best wall time of repeat calls of function, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def validateAll(dates):
+    """Validate every date string from a cold parse cache, as at startup."""
+    parseDate.cache_clear()
+    for text in dates:
+        validateDate(text)
+
+def guiCases(tasks):
+    """Return the refreshTaskList data-preparation cases, or none if tkinter is missing."""
+    try:
+        from gui import viewOrder, rowOptions, VIRTUAL_THRESHOLD
+        from alertEngine import AlertEngine
+    except ImportError:
+        return {}
+    alerts = AlertEngine(tasks)
+
+    def refresh(sortBy):
+        seqs = viewOrder(tasks, sortBy)
+        shown = seqs[:GUI_WINDOW] if len(seqs) > VIRTUAL_THRESHOLD else seqs
+        for seq in shown:
+            rowOptions(tasks.get(seq), alerts.isAlerting(seq))
+
+    return {
+        "refreshTaskList": lambda: refresh(None),
+        "refreshTaskList.priority": lambda: refresh("priority"),
+        "refreshTaskList.dueDate": lambda: refresh("dueDate"),
+    }
+
+def runSize(size, directory, repeat):
+    """Run every benchmark on size tasks and return their results."""
+    filePath = os.path.join(directory, f"tasks{size}.json")
+    writeTaskFile(filePath, size)
+    tasks = loadTasks(filePath)
+    dates = [task.dueDate for task in tasks]
+    devNull = open(os.devnull, 'w')
+    cases = {
+        "loadTasks": lambda: loadTasks(filePath),
+        "saveTasks": lambda: saveTasks(tasks, filePath),
+        "sortTasks.priority": lambda: list(sortTasks(tasks, "priority")),
+        "sortTasks.dueDate": lambda: list(sortTasks(tasks, "dueDate")),
+        "showTasks": lambda: showTasks(tasks),
+        "showTasks.today": lambda: showTasks(tasks, filterToday=True),
+        "validateDate": lambda: validateAll(dates),
+    }
+    cases.update(guiCases(tasks))
+    results = []
+    with devNull, contextlib.redirect_stdout(devNull):
+        for name, function in cases.items():
+            seconds = timeBest(function, repeat)
+            results.append({"name": name, "size": size, "seconds": seconds})
+            print(f"{name:<28} {size:>9} {seconds * 1000:>11.2f} ms", file=sys.stderr)
+    return results
+
+def compareResults(results, baseline, threshold):
+    """Print (to stderr) the change against a baseline run and return the number of regressions."""
+    before = {(entry["name"], entry["size"]): entry["seconds"] for entry in baseline["results"]}
+    regressions = 0
+    print(f"{'benchmark':<28} {'size':>9} {'before ms':>11} {'after ms':>11} {'ratio':>7}", file=sys.stderr)
+    for entry in results:
+        old = before.get((entry["name"], entry["size"]))
+        if not old:
+            continue
+        ratio = entry["seconds"] / old
+        flag = ""
+        if ratio > threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{entry['name']:<28} {entry['size']:>9} {old * 1000:>11.2f} {entry['seconds'] * 1000:>11.2f} "
+              f"{ratio:>6.2f}x{flag}", file=sys.stderr)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the Task Manager hot paths")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="runs per benchmark; the best is kept")
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="slowdown ratio that counts as a regression")
+    args = parser.parse_args()
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            results.extend(runSize(size, directory, args.repeat))
+    report = {
+        "date": date.today().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        with open(args.compare, 'r', encoding="utf-8") as file:
+            baseline = json.load(file)
+        if compareResults(results, baseline, args.threshold):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
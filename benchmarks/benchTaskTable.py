@@ -0,0 +1,56 @@
+# benchTaskTable.py
+"""
+Benchmark comparing the list-of-tasks path in displayUtils with the NumPy
+TaskTable for sorting, "due today" filtering and due-soon alerts.
+Run from the repository root: python benchmarks/benchTaskTable.py
+"""
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from displayUtils import sortTasks
+from taskGenerator import generateTasks
+from taskTable import TaskTable
+
+SIZES = (10_000, 100_000, 1_000_000)
+
+def timeIt(function):
+    """Return the best wall time of three runs of function, in milliseconds."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def listPath(tasks, today):
+    """Sorting and filtering the way displayUtils.showTasks does it."""
+    sortTasks(tasks, "priority")
+    sortTasks(tasks, "dueDate")
+    [task for task in tasks if task.due == today]
+    sum(1 for task in tasks if task.due - today <= 1 and not task.completed)
+
+def tablePath(table, today):
+    """The same work done with TaskTable masks and argsort."""
+    table.sortOrder("priority")
+    table.sortOrder("dueDate")
+    table.dueTodayMask(today).nonzero()
+    table.countAlerts(today)
+
+def main():
+    today = date.today().toordinal()
+    print(f"{'tasks':>10} {'list (ms)':>12} {'table (ms)':>12} {'build (ms)':>12} {'speedup':>8}")
+    for size in SIZES:
+        tasks = generateTasks(size)
+        start = time.perf_counter()
+        table = TaskTable(tasks)
+        build = (time.perf_counter() - start) * 1000
+        listTime = timeIt(lambda: listPath(tasks, today))
+        tableTime = timeIt(lambda: tablePath(table, today))
+        print(f"{size:>10} {listTime:>12.1f} {tableTime:>12.1f} {build:>12.1f} {listTime / tableTime:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# loadServer.py
+"""
+Load generator for the HTTP/JSON API (apiServer.py).
+Opens many keep-alive connections that each send a mix of list, today, add
+and edit requests, then reports requests per second and latency percentiles.
+Without --port it starts its own server on a temporary task file.
+Run from the repository root:
+    python benchmarks/loadServer.py [--clients 50] [--requests 200] [--tasks 10000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from taskGenerator import writeTaskFile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+MAIN = os.path.join(ROOT, "main.py")
+
+def freePort():
+    """Return a localhost port nobody is listening on."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+async def waitForServer(host, port, timeout=30):
+    """Wait until the server accepts connections."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+async def request(reader, writer, method, path, payload=None):
+    """Send one request on a keep-alive connection and return (status, JSON body)."""
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    length = next(int(line.split(":")[1]) for line in lines if line.lower().startswith("content-length:"))
+    return status, json.loads(await reader.readexactly(length))
+
+async def client(host, port, count, writeRatio, rng, latencies, errors):
+    """Send count requests over one connection, recording each latency in milliseconds."""
+    reader, writer = await asyncio.open_connection(host, port)
+    ids = []
+    try:
+        for i in range(count):
+            choice = rng.random()
+            if choice < writeRatio / 2 or (choice < writeRatio and not ids):
+                call = ("POST", "/tasks", {"title": f"Load {i}", "dueDate": "01-01-2027", "priority": "high"})
+            elif choice < writeRatio:
+                call = ("PATCH", f"/tasks/{rng.choice(ids)}", {"completed": True})
+            elif choice < (1 + writeRatio) / 2:
+                call = ("GET", f"/tasks?sort={rng.choice(('priority', 'dueDate'))}&limit=20", None)
+            else:
+                call = ("GET", "/tasks/today", None)
+            start = time.perf_counter()
+            status, body = await request(reader, writer, *call)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status >= 400:
+                errors.append(status)
+            elif call[0] == "POST":
+                ids.append(body["id"])
+    finally:
+        writer.close()
+
+def percentile(values, fraction):
+    """Return the value below which fraction of the sorted values fall."""
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+async def runLoad(args):
+    """Run all clients at once and print the results."""
+    await waitForServer(args.host, args.port)
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(args.host, args.port, args.requests, args.write_ratio,
+                                  random.Random(number), latencies, errors)
+                           for number in range(args.clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"{len(latencies)} requests from {args.clients} clients in {elapsed:.2f} s")
+    print(f"{len(latencies) / elapsed:,.0f} requests/s, p50 {percentile(latencies, 0.5):.2f} ms, "
+          f"p99 {percentile(latencies, 0.99):.2f} ms, max {latencies[-1]:.2f} ms, errors {len(errors)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Task Manager API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="port of a running server; by default one is started")
+    parser.add_argument("--clients", type=int, default=50, help="concurrent keep-alive connections")
+    parser.add_argument("--requests", type=int, default=200, help="requests per client")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="share of add and edit requests")
+    parser.add_argument("--tasks", type=int, default=10000, help="tasks in the server's file when starting one")
+    args = parser.parse_args()
+    server = None
+    with tempfile.TemporaryDirectory() as directory:
+        if args.port is None:
+            filePath = os.path.join(directory, "tasks.json")
+            writeTaskFile(filePath, args.tasks)
+            args.port = freePort()
+            server = subprocess.Popen([sys.executable, MAIN, "--file", filePath, "serve", "--port", str(args.port)],
+                                      cwd=directory, stdout=subprocess.DEVNULL)
+        try:
+            asyncio.run(runLoad(args))
+        finally:
+            if server is not None:
+                server.send_signal(signal.SIGINT if os.name != "nt" else signal.SIGTERM)
+                server.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# taskGenerator.py
+"""
+Seeded synthetic tasks for the benchmarks.
+The same seed and count always give the same tasks. Priorities, due dates,
+completion and text follow rough real-world shapes: most tasks are medium
+priority, due dates cluster in the coming weeks with a tail of overdue and
+far-future tasks, overdue tasks are more often completed, and about a third
+of the tasks have a description.
+"""
+import os
+import random
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from fileOperations import writeSnapshot
+from taskModel import Task, Priority
+
+PRIORITY_WEIGHTS = ((Priority.LOW, 30), (Priority.MEDIUM, 50), (Priority.HIGH, 20))
+VERBS = ("Buy", "Call", "Clean", "Email", "Fix", "Pay", "Plan", "Prepare", "Review", "Send", "Update", "Write")
+OBJECTS = ("groceries", "report", "invoice", "dentist", "slides", "budget", "car", "garden", "taxes",
+           "newsletter", "backup", "contract", "kitchen", "presentation", "rent", "tickets")
+DETAILS = ("before the meeting", "for the team", "with Ana", "and confirm by email", "at the office",
+           "for next week", "if it is still open", "and file the receipt")
+
+def dueOffset(rng):
+    """Return a due date as days from today: mostly the next weeks, some overdue, a few far ahead."""
+    roll = rng.random()
+    if roll < 0.15:
+        return -rng.randint(1, 60)  # Overdue
+    if roll < 0.20:
+        return 0  # Due today
+    if roll < 0.90:
+        return min(365, int(rng.expovariate(1 / 14)) + 1)  # The coming weeks
+    return rng.randint(60, 730)  # Far future
+
+def generateTasks(count, seed=1, today=None):
+    """Return count synthetic tasks; the same seed always gives the same tasks (relative to today)."""
+    rng = random.Random(seed)
+    today = today or date.today().toordinal()
+    priorities = [priority for priority, weight in PRIORITY_WEIGHTS]
+    weights = [weight for priority, weight in PRIORITY_WEIGHTS]
+    tasks = []
+    for i in range(count):
+        offset = dueOffset(rng)
+        title = f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} {i}"
+        description = f"{title} {rng.choice(DETAILS)}" if rng.random() < 0.35 else ""
+        completed = rng.random() < (0.6 if offset < 0 else 0.1)
+        tasks.append(Task(title, description, rng.choices(priorities, weights)[0], today + offset, completed))
+    return tasks
+
+def writeTaskFile(filePath, count, seed=1, today=None):
+    """Write count synthetic tasks to a JSON (or NDJSON, by extension) task file."""
+    writeSnapshot(generateTasks(count, seed, today), filePath)
@@ -0,0 +1,291 @@
+# binaryTasks.py
+"""
+Binary task file format for the Task Manager application.
+A file holds a header, one fixed-width record per task (due-date ordinal,
+priority code, completed flag), the task numbers in due-date order and in
+priority order, a string table with each task's title, description, id
+and extra JSON keys (a repeat rule among them), and the task numbers of the
+recurring tasks. MappedTasks opens a file with mmap and answers
+counts, "due today" and sorted listings straight from those arrays,
+building Task objects only for the tasks it hands out. fileOperations reads
+and writes this format for files ending in .bin.
+"""
+import json
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from itertools import chain
+from taskModel import Task, Priority, Recurrence
+
+MAGIC = b"TASKBIN1"
+BINARY_EXTENSION = ".bin"
+HEADER = struct.Struct("<8sQQ")  # Magic, task count, string table size
+RECORD = struct.Struct("<iBB2x")  # Due ordinal, priority code, completed flag
+DUE = struct.Struct("<i")
+COUNT = struct.Struct("<I")  # Number of recurring tasks, after the string table
+STRINGS_PER_TASK = 4  # Title, description, id, extra keys as JSON
+PRIORITIES = (None, Priority.LOW, Priority.MEDIUM, Priority.HIGH)  # Indexed by priority code
+SWAP_BYTES = sys.byteorder != "little"  # Arrays are stored little-endian
+
+def isBinary(filePath, data=None):
+    """Return True if filePath holds (or, being new, should hold) the binary format."""
+    if data is None:
+        try:
+            with open(filePath, 'rb') as file:
+                data = file.read(len(MAGIC))
+        except FileNotFoundError:
+            return filePath.endswith(BINARY_EXTENSION)
+    if not data:
+        return filePath.endswith(BINARY_EXTENSION)
+    return data.startswith(MAGIC)
+
+def packArray(typecode, values):
+    """Return the little-endian bytes of an array of values."""
+    values = array(typecode, values)
+    if SWAP_BYTES:
+        values.byteswap()
+    return values.tobytes()
+
+def layout(count):
+    """Return the byte offsets of the records, due order, priority order, string offsets and strings."""
+    records = HEADER.size
+    byDue = records + count * RECORD.size
+    byPriority = byDue + count * 4
+    stringOffsets = byPriority + count * 4
+    strings = stringOffsets + (count * STRINGS_PER_TASK + 1) * 8
+    return records, byDue, byPriority, stringOffsets, strings
+
+def extraText(task):
+    """Return the JSON text stored for a task's extra keys and repeat rule, or "" if it has neither."""
+    extra = task.extra
+    if task.repeat is not None:
+        extra = dict(extra or {}, repeat=task.repeat.toDict())
+    return json.dumps(extra) if extra else ""
+
+def encodeTasks(tasks):
+    """Return the binary file contents for a list of tasks."""
+    tasks = list(tasks)
+    records = b"".join(RECORD.pack(task.due, task.priority, task.completed) for task in tasks)
+    dues = [task.due for task in tasks]
+    negatedPriorities = [-task.priority for task in tasks]
+    # Stable sorts, so equal keys keep list order just like TaskCollection's indexes
+    byDue = sorted(range(len(tasks)), key=dues.__getitem__)
+    byPriority = sorted(range(len(tasks)), key=negatedPriorities.__getitem__)
+    strings = []
+    offsets = [0]
+    size = 0
+    for task in tasks:
+        for text in (task.title, task.description, task.id or "", extraText(task)):
+            encoded = text.encode("utf-8")
+            strings.append(encoded)
+            size += len(encoded)
+            offsets.append(size)
+    recurring = [index for index, task in enumerate(tasks) if task.repeat is not None]
+    return b"".join([HEADER.pack(MAGIC, len(tasks), size), records, packArray('I', byDue),
+                     packArray('I', byPriority), packArray('Q', offsets)] + strings
+                    + [COUNT.pack(len(recurring)), packArray('I', recurring)])
+
+class MappedTasks:
+    """Read-only, list-like view of a binary task file; tasks are built only when accessed."""
+
+    def __init__(self, buffer, file=None):
+        self.buffer = buffer  # bytes, or an mmap of the file
+        self.file = file
+        magic, count, stringsSize = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("not a binary task file")
+        self.count = count
+        self.recordsStart, byDue, byPriority, stringOffsets, strings = layout(count)
+        if len(buffer) < strings + stringsSize:
+            raise ValueError("binary task file is truncated")
+        view = self.view = memoryview(buffer)
+        self.records = view[self.recordsStart:byDue]
+        self.byDue = self.readArray(view[byDue:byPriority], 'I')
+        self.byPriority = self.readArray(view[byPriority:stringOffsets], 'I')
+        self.offsets = self.readArray(view[stringOffsets:strings], 'Q')
+        self.strings = view[strings:strings + stringsSize]
+        recurring = strings + stringsSize
+        if len(buffer) >= recurring + COUNT.size:
+            end = recurring + COUNT.size + COUNT.unpack_from(buffer, recurring)[0] * 4
+            if len(buffer) < end:
+                raise ValueError("binary task file is truncated")
+            self.recurring = self.readArray(view[recurring + COUNT.size:end], 'I')
+        else:
+            self.recurring = ()  # Written before tasks could repeat
+
+    @staticmethod
+    def readArray(view, typecode):
+        """Return an indexable view of a stored array, copying it only on big-endian machines."""
+        if SWAP_BYTES:
+            values = array(typecode, view.tobytes())
+            values.byteswap()
+            return values
+        return view.cast(typecode)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self.task(index)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("task index out of range")
+        return self.task(index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Release the mapping and the file.
+
+        The views into the mapping are released first, so a sortedBy
+        generator still holding one cannot keep the mmap from closing; using
+        it afterwards raises ValueError.
+        """
+        for view in (self.records, self.byDue, self.byPriority, self.offsets, self.strings, self.recurring, self.view):
+            if isinstance(view, memoryview):
+                view.release()
+        self.records = self.byDue = self.byPriority = self.offsets = self.strings = self.recurring = self.view = None
+        if self.file is not None:
+            self.buffer.close()
+            self.file.close()
+            self.file = None
+
+    def due(self, index):
+        """Return the due ordinal of task index, read from its record."""
+        return DUE.unpack_from(self.records, index * RECORD.size)[0]
+
+    def text(self, number):
+        """Return string number of the string table."""
+        return str(self.strings[self.offsets[number]:self.offsets[number + 1]], "utf-8")
+
+    def task(self, index):
+        """Build the Task stored at index."""
+        due, priority, completed = RECORD.unpack_from(self.records, index * RECORD.size)
+        first = index * STRINGS_PER_TASK
+        extra = self.text(first + 3)
+        extra = json.loads(extra) if extra else {}
+        repeat = extra.pop("repeat", None)
+        return Task(self.text(first), self.text(first + 1), PRIORITIES[priority], due, bool(completed),
+                    extra or None, self.text(first + 2) or None, Recurrence.fromDict(repeat) if repeat else None)
+
+    def indexOrder(self, sortBy=None):
+        """Return the task indexes in the order given by sortBy."""
+        if sortBy == "priority":
+            return self.byPriority
+        elif sortBy == "dueDate":
+            return self.byDue
+        return range(self.count)
+
+    def sortedBy(self, sortBy=None):
+        """Lazily iterate over the tasks in the order given by sortBy, like TaskCollection.sortedBy."""
+        return (self.task(index) for index in self.indexOrder(sortBy))
+
+    def numberedBy(self, sortBy=None):
+        """Lazily iterate over (list number, task) pairs in the order given by sortBy, like TaskCollection.numberedBy."""
+        return ((index + 1, self.task(index)) for index in self.indexOrder(sortBy))
+
+    def dueBound(self, day):
+        """Return how many tasks are due before day (binary search over the due-date order)."""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.due(self.byDue[middle]) < day:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def duePosition(self, index):
+        """Return where task index appears in due-date order."""
+        due = self.due(index)
+        # Within a due date the order is by index, so bisect finds the task's place
+        return bisect_left(self.byDue, index, self.dueBound(due), self.dueBound(due + 1))
+
+    def repeatingOn(self, day):
+        """Return the indexes of the recurring tasks with an earlier next occurrence that also occur on day."""
+        return [index for index in self.recurring if self.due(index) < day and self.task(index).occursOn(day)]
+
+    def dueOn(self, day):
+        """Return the indexes of the tasks due on day, in list order, building only recurring tasks."""
+        return sorted(chain(self.byDue[self.dueBound(day):self.dueBound(day + 1)], self.repeatingOn(day)))
+
+    def countDueOn(self, day):
+        """Return the number of tasks due on day."""
+        return self.dueBound(day + 1) - self.dueBound(day) + len(self.repeatingOn(day))
+
+    def priorityCode(self, index):
+        """Return the priority code of task index, read from its record."""
+        return self.records[index * RECORD.size + 4]
+
+    def priorityBound(self, priority):
+        """Return how many tasks have a priority above the given code (binary search over the priority order)."""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.priorityCode(self.byPriority[middle]) > priority:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def priorityGroups(self):
+        """Return the (start, end) of each priority code's run in the priority order."""
+        return {code: (self.priorityBound(code), self.priorityBound(code - 1)) for code in range(1, len(PRIORITIES))}
+
+    def priorityPosition(self, index, groups=None):
+        """Return where task index appears in priority order."""
+        start, end = (groups or self.priorityGroups())[self.priorityCode(index)]
+        # Within a priority the order is by index, so bisect finds the task's place
+        return bisect_left(self.byPriority, index, start, end)
+
+    def numberedDueOn(self, day, sortBy=None):
+        """Yield (list number, task) for the tasks due on day, in the sortBy order.
+
+        Lets displayUtils show "today" from the due-date order, building only
+        the tasks it prints.
+        """
+        start, end = self.dueBound(day), self.dueBound(day + 1)
+        repeating = self.repeatingOn(day)
+        if sortBy == "dueDate":
+            # Recurring tasks come first: their next occurrence sorts before day
+            for position in chain(sorted(map(self.duePosition, repeating)), range(start, end)):
+                index = self.byDue[position]
+                yield index + 1, self.task(index)
+            return
+        indexes = sorted(chain(self.byDue[start:end], repeating))
+        if sortBy == "priority":
+            groups = self.priorityGroups()
+            indexes.sort(key=lambda index: self.priorityPosition(index, groups))
+        for index in indexes:
+            yield index + 1, self.task(index)
+
+def openMapped(filePath):
+    """Open a binary task file as MappedTasks backed by a read-only memory map."""
+    file = open(filePath, 'rb')
+    try:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        file.close()  # An empty file cannot be mapped; it holds no tasks
+        return MappedTasks(encodeTasks(()))
+    try:
+        return MappedTasks(buffer, file)
+    except ValueError:
+        buffer.close()
+        file.close()
+        raise
+
+def decodeTasks(data):
+    """Yield every task of binary file contents."""
+    tasks = MappedTasks(data)
+    for index in range(len(tasks)):
+        yield tasks.task(index)
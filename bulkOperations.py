@@ -0,0 +1,237 @@
+# bulkOperations.py
+"""
+Bulk import and export of tasks for the Task Manager application.
+Streams CSV, NDJSON or JSON task files in chunks, validates and normalizes
+each chunk in one pass (dates go through the cached taskModel.parseDate),
+reports rejected rows with the reason, and records every accepted chunk
+with a single journal or database write. In CSV a repeat rule is written as
+text ("weekly until 31-12-2025") and anchored at the task's due date when read.
+
+Deltas carry only what changed: exportChanges writes the change feed
+entries after a given version (see changeFeed.py) and applyChanges merges
+them into another copy of the store, so backups and replicas grow with the
+number of changes rather than the number of tasks.
+"""
+import csv
+import json
+import os
+from itertools import islice
+from changeFeed import readApplied, writeApplied
+from fileOperations import recordChanges, syncTasks, isNdjson, fileLock, NDJSON_EXTENSIONS
+from taskModel import Task, Priority, Recurrence, parseDate, newTaskId
+
+CHUNK_SIZE = 10000
+CSV_COLUMNS = ("title", "description", "priority", "dueDate", "completed", "repeat")
+KNOWN_KEYS = frozenset(CSV_COLUMNS + ("id",))  # Imported tasks get new ids, so an exported id is dropped
+COMPLETED_VALUES = {"": False, "false": False, "no": False, "0": False,
+                    "true": True, "yes": True, "1": True}
+
+class ImportReport:
+    """Outcome of an import: how many rows were added and which were rejected."""
+
+    def __init__(self):
+        self.accepted = 0
+        self.rejected = []  # (row number, reason)
+
+    def __repr__(self):
+        return f"ImportReport(accepted={self.accepted}, rejected={len(self.rejected)})"
+
+def chunks(iterable, size):
+    """Yield lists of up to size items from iterable."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def isCsv(filePath):
+    """Return True if filePath should be read or written as CSV."""
+    return filePath.lower().endswith(".csv")
+
+def readRows(filePath):
+    """Yield (row number, record) pairs; record is a dict, or an error message for unreadable rows."""
+    if isCsv(filePath):
+        with open(filePath, 'r', newline='', encoding="utf-8") as file:
+            reader = csv.reader(file)
+            header = next(reader, [])
+            for number, row in enumerate(reader, 2):  # Row 1 is the header
+                if row:
+                    yield number, dict(zip(header, row))
+    elif isNdjson(filePath):
+        with open(filePath, 'r', encoding="utf-8") as file:
+            for number, line in enumerate(file, 1):
+                if line.strip():
+                    try:
+                        yield number, json.loads(line)
+                    except ValueError as error:
+                        yield number, f"malformed JSON: {error}"
+    else:
+        with open(filePath, 'r', encoding="utf-8") as file:
+            yield from enumerate(json.load(file), 1)
+
+def parseRepeatValue(value, due):
+    """Return the Recurrence of an imported repeat value (JSON rule or text), or None; raises ValueError."""
+    if not value:
+        return None
+    if isinstance(value, dict):
+        return Recurrence.fromDict(value)
+    text, _, until = str(value).partition(" until ")
+    return Recurrence.fromText(text, due, parseDate(until.strip()) if until else None)
+
+def validateRows(rows, report):
+    """Turn a chunk of (row number, record) pairs into tasks, rejecting invalid rows."""
+    tasks = []
+    rejected = report.rejected
+    priorities = {}  # Raw priority text -> Priority, so each spelling is normalized once
+    for number, record in rows:
+        if not isinstance(record, dict):
+            rejected.append((number, record if isinstance(record, str) else "not a task object"))
+            continue
+        title = record.get("title")
+        if not title:
+            rejected.append((number, "missing title"))
+            continue
+        rawPriority = record.get("priority") or ""
+        priority = priorities.get(rawPriority)
+        if priority is None:
+            priority = priorities[rawPriority] = Priority.parse(rawPriority)
+        if priority is None:
+            rejected.append((number, f"invalid priority {record.get('priority')!r}"))
+            continue
+        dueDate = record.get("dueDate") or ""
+        try:
+            due = parseDate(dueDate)
+        except (ValueError, AttributeError):
+            rejected.append((number, f"invalid due date {dueDate!r}"))
+            continue
+        completed = record.get("completed", False)
+        if not isinstance(completed, bool):
+            completed = COMPLETED_VALUES.get(str(completed).strip().lower())
+            if completed is None:
+                rejected.append((number, f"invalid completed value {record.get('completed')!r}"))
+                continue
+        try:
+            repeat = parseRepeatValue(record.get("repeat"), due)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            rejected.append((number, f"invalid repeat rule {record.get('repeat')!r}"))
+            continue
+        extra = None
+        if not record.keys() <= KNOWN_KEYS:
+            extra = {key: value for key, value in record.items() if key not in KNOWN_KEYS}
+        # Ids are given now because the chunk is journaled before it joins the collection
+        tasks.append(Task(title, record.get("description") or "", priority, due, completed, extra, newTaskId(), repeat))
+    return tasks
+
+def importTasks(tasks, filePath, chunkSize=CHUNK_SIZE):
+    """Append the valid tasks of a CSV, NDJSON or JSON file to tasks, chunk by chunk.
+
+    Each chunk joins tasks before it is recorded, like any other change, so
+    a compaction triggered by the write snapshots it too, and if reading
+    fails partway (e.g. a UnicodeDecodeError) the chunks already journaled
+    are exactly the ones in memory.
+    """
+    report = ImportReport()
+    for chunk in chunks(readRows(filePath), chunkSize):
+        accepted = validateRows(chunk, report)
+        tasks.extend(accepted)
+        recordChanges(("add", None, task) for task in accepted)
+        report.accepted += len(accepted)
+    return report
+
+def exportTasks(tasks, filePath, chunkSize=CHUNK_SIZE):
+    """Write tasks to a CSV or NDJSON (or JSON) file; returns the number written."""
+    tempPath = filePath + ".tmp"
+    count = 0
+    with open(tempPath, 'w', newline='', encoding="utf-8") as file:
+        if isCsv(filePath):
+            writer = csv.writer(file)
+            writer.writerow(CSV_COLUMNS)
+            for chunk in chunks(tasks, chunkSize):
+                writer.writerows((task.title, task.description, str(task.priority), task.dueDate,
+                                  "true" if task.completed else "false", str(task.repeat or ""))
+                                 for task in chunk)
+                count += len(chunk)
+        elif filePath.endswith(NDJSON_EXTENSIONS):
+            for chunk in chunks(tasks, chunkSize):
+                file.write("".join(json.dumps(task.toDict()) + "\n" for task in chunk))
+                count += len(chunk)
+        else:
+            items = [task.toDict() for task in tasks]
+            json.dump(items, file, indent=4)
+            count = len(items)
+    os.replace(tempPath, filePath)
+    return count
+
+def exportChanges(tasks, feed, filePath, since=0):
+    """Write the changes after version since to an NDJSON delta file; returns (changes written, version).
+
+    Each task changed since then appears once, in its latest state taken from
+    tasks (deletes by id only); version is the store version the delta brings
+    a copy up to.
+    """
+    with fileLock(feed.filePath):
+        syncTasks()  # The feed names the changed tasks; their records come from tasks as last saved
+        version = feed.version()
+        if since > version:
+            raise ValueError(f"version {since} is newer than the store (version {version})")
+        entries = []
+        for changed, action, taskId in feed.changesSince(since):
+            entry = {"version": changed, "action": action, "id": taskId}
+            task = tasks.getById(taskId) if action != "delete" else None
+            if task is not None:
+                entry["task"] = task.toDict()
+            else:
+                entry["action"] = "delete"
+            entries.append(entry)
+        header = {"delta": {"store": feed.id(), "since": since, "version": version}}
+    tempPath = filePath + ".tmp"
+    with open(tempPath, 'w', encoding="utf-8") as file:
+        file.write(json.dumps(header) + "\n")
+        for chunk in chunks(entries, CHUNK_SIZE):
+            file.write("".join(json.dumps(entry) + "\n" for entry in chunk))
+    os.replace(tempPath, filePath)
+    return len(entries), version
+
+def applyChanges(tasks, filePath, storePath, storeId=None):
+    """Merge a delta file from exportChanges into tasks, the store kept in storePath; returns (changes applied, version).
+
+    Tasks are matched by id: an added or edited task replaces this copy's
+    version of it, or is added if it is missing. The last version applied
+    from each store is kept in storePath.applied, so deltas may overlap but
+    must not leave a gap (the first one from a store starts at version 0),
+    and changes already applied are skipped.
+    """
+    with open(filePath, 'r', encoding="utf-8") as file:
+        try:
+            delta = json.loads(file.readline())["delta"]
+        except (ValueError, KeyError, TypeError):
+            raise ValueError(f"{filePath} is not a delta file written by 'export --since'")
+        source = delta["store"]
+        if source == storeId:
+            raise ValueError("the delta was exported from this store")
+        applied = readApplied(storePath)
+        last = applied.get(source)
+        if delta["since"] > (last or 0):
+            raise ValueError(f"the delta starts after version {delta['since']} but only version {last or 0} of that "
+                             f"store was applied; export again with --since {last or 0}")
+        changes = []
+        for line in file:
+            entry = json.loads(line)
+            if last is not None and entry["version"] <= last:
+                continue  # Applied with an earlier delta
+            seq = tasks.seqById.get(entry["id"])
+            if entry["action"] == "delete":
+                if seq is not None:
+                    changes.append(("delete", None, tasks.removeSeq(seq)))
+            elif seq is None:
+                task = Task.fromDict(entry["task"])
+                tasks.append(task)
+                changes.append(("add", None, task))
+            else:
+                tasks.replaceSeq(seq, Task.fromDict(entry["task"]))
+                changes.append(("edit", None, tasks.get(seq)))
+    recordChanges(changes)
+    applied[source] = max(delta["version"], last or 0)
+    writeApplied(storePath, applied)
+    return len(changes), delta["version"]
@@ -0,0 +1,203 @@
+# changeFeed.py
+"""
+Change feed of a task file for the Task Manager application.
+Every add, edit and delete journaled to a task file is also appended to its
+feed (tasks.json.changes) under the next version number, so the store has a
+monotonic version and "what changed since version N" is read from the feed
+instead of comparing whole files. An entry is one short line,
+[version, action, task id], or [first version, "addMany", [task ids]] for a
+run of adds; the task's record itself stays in the task file and its
+journal, and a delta takes it from there.
+
+A feed starts with an entry for every task already in the file, so the
+changes since version 0 describe the whole store. Each process keeps the
+latest entry of every task in memory, reading only what other processes
+appended since it last looked. Once more than SUPERSEDED_RATIO of the
+entries have been superseded by a later change to the same task, the feed
+is rewritten from that map. Deletes are kept, so a delta can be built from
+any earlier version. The caller holds the task file's lock while writing
+(see fileOperations).
+"""
+import json
+import os
+from json.encoder import encode_basestring_ascii
+
+FEED_FORMAT = 2  # Feeds in an older format are started again, under a new store id
+COMPACT_MIN_ENTRIES = 10000  # Smaller feeds are never compacted
+SUPERSEDED_RATIO = 0.5  # Share of superseded entries that triggers a compaction
+
+def feedPath(filePath):
+    """Return the change feed of a task file."""
+    return filePath + ".changes"
+
+def appliedPath(filePath):
+    """Return the file recording which versions of other stores were applied to a task file."""
+    return filePath + ".applied"
+
+def feedLine(version, action, taskId):
+    """Return the feed line of one change."""
+    return f'[{version}, "{action}", {encode_basestring_ascii(taskId)}]\n'
+
+def addManyLine(version, taskIds):
+    """Return the feed line of a run of adds, the first of them under version."""
+    return f'[{version}, "addMany", {json.dumps(taskIds)}]\n'
+
+def readApplied(filePath):
+    """Return {store id: last version applied} for the deltas merged into a task file."""
+    try:
+        with open(appliedPath(filePath), 'r', encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+def writeApplied(filePath, applied):
+    """Store the versions applied from other stores."""
+    tempPath = appliedPath(filePath) + ".tmp"
+    with open(tempPath, 'w', encoding="utf-8") as file:
+        json.dump(applied, file)
+    os.replace(tempPath, appliedPath(filePath))
+
+class ChangeFeed:
+    """Versioned, append-only log of the changes to a task file."""
+
+    def __init__(self, filePath):
+        self.filePath = filePath
+        self.path = feedPath(filePath)
+        self.storeId = None
+        self.latest = {}  # Task id -> version of its last entry
+        self.deleted = set()  # Ids whose last entry is a delete
+        self.entries = 0  # Entries in the feed, superseded ones included
+        self.lastVersion = 0
+        self.offset = 0  # Bytes of the feed read into latest
+        self.signature = None  # os.stat of the feed when it was last read or written
+
+    def exists(self):
+        """Return True if the feed has been started, in the current format."""
+        try:
+            with open(self.path, 'rb') as file:
+                return json.loads(file.readline()).get("format") == FEED_FORMAT
+        except (FileNotFoundError, ValueError):
+            return False
+
+    def stat(self):
+        """Return the signature of the feed file, or None if it is missing."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+    def write(self, lines, entries):
+        """Replace the feed with its header and lines holding that many entries."""
+        tempPath = self.path + ".tmp"
+        with open(tempPath, 'w', encoding="utf-8") as file:
+            file.write(json.dumps({"feed": self.storeId, "format": FEED_FORMAT}) + "\n" + "".join(lines))
+        os.replace(tempPath, self.path)
+        self.signature = self.stat()
+        self.offset = self.signature[0]
+        self.entries = entries
+
+    def start(self, tasks):
+        """Create the feed with an "add" entry for every task already in the file."""
+        self.storeId = os.urandom(6).hex()
+        self.latest = {task.id: version for version, task in enumerate(tasks, 1)}
+        self.deleted = set()
+        self.lastVersion = len(self.latest)
+        self.write([addManyLine(1, list(self.latest))] if self.latest else [], len(self.latest))
+
+    def id(self):
+        """Return the random id that tells this store's versions apart from another store's."""
+        self.catchUp()
+        return self.storeId
+
+    def catchUp(self):
+        """Read the entries appended since this process last looked; costs one os.stat when there are none."""
+        signature = self.stat()
+        if signature == self.signature:
+            return
+        if signature is None:
+            self.__init__(self.filePath)
+            return
+        with open(self.path, 'rb') as file:
+            if self.signature is None or signature[2] != self.signature[2] or signature[0] < self.offset:
+                # Not read yet, or rewritten by another process's compaction
+                self.storeId = json.loads(file.readline())["feed"]
+                self.latest, self.deleted, self.entries, self.offset = {}, set(), 0, file.tell()
+            file.seek(self.offset)
+            data = file.read()
+        end = data.rfind(b"\n") + 1  # A torn last line from a crash is left out
+        if end:
+            for version, action, taskId in json.loads(b"[" + data[:end - 1].replace(b"\n", b",") + b"]"):
+                if action == "addMany":
+                    self.record(version, taskId)
+                    version += len(taskId) - 1
+                else:
+                    self.record(version, [taskId], action == "delete")
+            self.lastVersion = max(self.lastVersion, version)
+        self.offset += end
+        self.signature = signature
+
+    def record(self, version, taskIds, deleted=False):
+        """Note entries for taskIds, numbered from version, in latest."""
+        self.latest.update(zip(taskIds, range(version, version + len(taskIds))))
+        if deleted:
+            self.deleted.update(taskIds)
+        elif self.deleted:
+            self.deleted.difference_update(taskIds)
+        self.entries += len(taskIds)
+
+    def version(self):
+        """Return the version of the last change (0 before any change)."""
+        self.catchUp()
+        return self.lastVersion
+
+    def append(self, changes):
+        """Append (action, task) changes under the next versions; returns the new version."""
+        self.catchUp()
+        if not changes:
+            return self.lastVersion
+        version = self.lastVersion
+        lines = []
+        added = []  # Ids of a run of consecutive adds, written as one line
+        for action, task in changes:
+            version += 1
+            if action == "add":
+                added.append(task.id)
+                continue
+            if added:
+                lines.append(addManyLine(version - len(added), added))
+                self.record(version - len(added), added)
+                added = []
+            lines.append(feedLine(version, action, task.id))
+            self.record(version, [task.id], action == "delete")
+        if added:
+            lines.append(addManyLine(version - len(added) + 1, added))
+            self.record(version - len(added) + 1, added)
+        data = "".join(lines).encode("utf-8")
+        with open(self.path, 'r+b') as file:
+            file.truncate(self.offset)  # Drop a torn write left by a crash
+            file.seek(self.offset)
+            file.write(data)
+        self.offset += len(data)
+        self.lastVersion = version
+        self.signature = self.stat()
+        self.compactIfNeeded()
+        return version
+
+    def changesSince(self, version):
+        """Return (version, action, task id) for the latest change of each task changed after version, oldest first.
+
+        The action is "delete" for deleted tasks and "edit" for the others,
+        whether they were added or edited.
+        """
+        self.catchUp()
+        deleted = self.deleted
+        return sorted((changed, "delete" if taskId in deleted else "edit", taskId)
+                      for taskId, changed in self.latest.items() if changed > version)
+
+    def compactIfNeeded(self):
+        """Drop the entries superseded by a later change to the same task once they are SUPERSEDED_RATIO of the feed."""
+        superseded = self.entries - len(self.latest)
+        if self.entries < COMPACT_MIN_ENTRIES or superseded <= self.entries * SUPERSEDED_RATIO:
+            return
+        self.write([feedLine(*entry) for entry in self.changesSince(0)], len(self.latest))
@@ -0,0 +1,291 @@
+# cli.py
+"""
+Non-interactive command interface for the Task Manager application.
+Runs add, list, today, edit, delete, sort, search, query, import, export, apply, version,
+archive, history, restore and lists commands without the menu, so scripts can apply many changes in one process. Several commands can
+be given on one command line separated by ';', or read one per line from a
+file or stdin.
+"""
+import argparse
+import shlex
+import sys
+from fileOperations import recordChange, currentJournal
+from bulkOperations import importTasks, exportTasks, exportChanges, applyChanges
+from changeFeed import readApplied
+from displayUtils import showTasks, showSearchResults, showArchivedTasks, showLists, showListTasks
+from searchIndex import searchTasks
+from taskQuery import buildQuery
+from taskModel import Task, Priority, Recurrence, parseDate, parseRepeat, finishOccurrence, stampCompletion
+
+COMMAND_SEPARATOR = ";"
+READ_ONLY_COMMANDS = ("list", "today", "sort", "lists")  # Commands that only show tasks
+# Commands that change no task, though they need the list loaded
+LOOKUP_COMMANDS = READ_ONLY_COMMANDS + ("search", "query", "history", "export", "version")
+
+class CommandError(Exception):
+    """Raised for a command that cannot be parsed or applied."""
+
+class CommandParser(argparse.ArgumentParser):
+    """Argument parser that reports errors instead of exiting the process."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, add_help=False, **kwargs)
+
+    def error(self, message):
+        raise CommandError(message)
+
+def priorityArgument(text):
+    """argparse type for a priority name."""
+    priority = Priority.parse(text)
+    if priority is None:
+        raise argparse.ArgumentTypeError("must be high, medium or low")
+    return priority
+
+def dateArgument(text):
+    """argparse type for a DD-MM-YYYY date."""
+    try:
+        return parseDate(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError("must be a valid DD-MM-YYYY date")
+
+def repeatArgument(text):
+    """argparse type for a repeat rule; returns the text, or "" for none."""
+    try:
+        return "" if parseRepeat(text) is None else text
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error))
+
+def yesNoArgument(text):
+    """argparse type for a yes/no answer."""
+    if text.lower() not in ("yes", "no"):
+        raise argparse.ArgumentTypeError("must be yes or no")
+    return text.lower() == "yes"
+
+def buildParser():
+    """Build the parser for a single command."""
+    parser = CommandParser(prog="main.py")
+    commands = parser.add_subparsers(dest="command", required=True, parser_class=CommandParser)
+
+    add = commands.add_parser("add", help="add a task")
+    add.add_argument("title")
+    add.add_argument("--due", required=True, type=dateArgument, help="due date (DD-MM-YYYY)")
+    add.add_argument("--priority", default=Priority.MEDIUM, type=priorityArgument)
+    add.add_argument("--description", default="")
+    add.add_argument("--repeat", type=repeatArgument, default="",
+                     help="daily, weekly, monthly or every N days/weeks/months")
+    add.add_argument("--until", type=dateArgument, help="last day a repeating task can fall on (DD-MM-YYYY)")
+
+    listCommand = commands.add_parser("list", help="show all tasks")
+    listCommand.add_argument("--sort", choices=["priority", "dueDate"])
+
+    today = commands.add_parser("today", help="show tasks due today")
+    today.add_argument("--all", action="store_true", help="in every task list, read from the lists' summaries")
+
+    sort = commands.add_parser("sort", help="show tasks sorted by priority or due date")
+    sort.add_argument("sortBy", choices=["priority", "dueDate"])
+
+    for showCommand in (listCommand, today, sort):
+        showCommand.add_argument("--offset", type=int, default=0, help="skip this many tasks")
+        showCommand.add_argument("--limit", type=int, help="show at most this many tasks")
+
+    edit = commands.add_parser("edit", help="change a task, given the number list, sort, today, search or query show for it")
+    edit.add_argument("number", type=int)
+    edit.add_argument("--title")
+    edit.add_argument("--description")
+    edit.add_argument("--priority", type=priorityArgument)
+    edit.add_argument("--due", type=dateArgument)
+    edit.add_argument("--completed", type=yesNoArgument, help="yes or no (completing a repeating task moves it to its next date)")
+    edit.add_argument("--repeat", type=repeatArgument, help="new repeat rule, or 'none'")
+    edit.add_argument("--until", type=dateArgument, help="last day a repeating task can fall on (DD-MM-YYYY)")
+
+    search = commands.add_parser("search", help="show tasks whose title or description has words starting with every WORD")
+    search.add_argument("words", nargs="+")
+
+    query = commands.add_parser("query", help="show tasks matching filters, in several-key order, optionally only the first N")
+    query.add_argument("--sort", default="", help="comma-separated keys, e.g. priority:desc,dueDate (':desc' for descending)")
+    query.add_argument("--pending", action="store_true", help="only tasks that are not completed")
+    query.add_argument("--priority", type=priorityArgument, help="only tasks with this priority")
+    query.add_argument("--due-within", type=int, metavar="DAYS", help="only tasks due within DAYS days (overdue included)")
+    query.add_argument("--limit", type=int, help="show at most this many tasks")
+
+    delete = commands.add_parser("delete", help="delete a task, given the number list, sort, today, search or query show for it")
+    delete.add_argument("number", type=int)
+
+    importCommand = commands.add_parser("import", help="append the tasks of a CSV, NDJSON or JSON file")
+    importCommand.add_argument("path")
+
+    export = commands.add_parser("export", help="write all tasks to a CSV, NDJSON or JSON file")
+    export.add_argument("path")
+    export.add_argument("--since", type=int, metavar="VERSION",
+                        help="write only the changes after VERSION, as a delta file for 'apply'")
+
+    apply = commands.add_parser("apply", help="merge a delta file written by 'export --since' into the tasks")
+    apply.add_argument("path")
+
+    commands.add_parser("version", help="show the store's change version and the versions applied from other stores")
+
+    archive = commands.add_parser("archive", help="move tasks completed more than DAYS days ago to the archive")
+    archive.add_argument("--days", type=int, help="age in days (default: --archive-after)")
+
+    history = commands.add_parser("history", help="show archived tasks, or those with words starting with every WORD")
+    history.add_argument("words", nargs="*")
+
+    restore = commands.add_parser("restore", help="move an archived task back, given its number in 'history'")
+    restore.add_argument("number", type=int)
+
+    commands.add_parser("lists", help="show the task lists with their task counts")
+    return parser
+
+def taskIndex(tasks, number):
+    """Convert a 1-based task number into a list index."""
+    if not 1 <= number <= len(tasks):
+        raise CommandError(f"task number must be between 1 and {len(tasks)}")
+    return number - 1
+
+def runCommand(tasks, args, archive=None, workspaces=None, store=None):
+    """Apply one parsed command to the task list (archive commands need the TaskArchive, list commands the WorkspaceManager).
+
+    With a SQLite store, the list, today and sort views are filtered and sorted by its indexed queries.
+    """
+    shown = tasks if store is None else store.view(tasks)
+    if args.command in ("archive", "history", "restore") and archive is None:
+        raise CommandError("the archive is only available with JSON storage")
+    if (args.command == "lists" or getattr(args, "all", False)) and workspaces is None:
+        raise CommandError("task lists are only available with JSON storage")
+    journal = currentJournal()
+    if (args.command in ("apply", "version") or getattr(args, "since", None) is not None) and journal is None:
+        raise CommandError("the change feed is only available with JSON storage")
+    if args.command == "add":
+        task = Task(args.title, args.description, args.priority, args.due,
+                    repeat=Recurrence.fromText(args.repeat, args.due, args.until))
+        tasks.append(task)
+        recordChange("add", task=task)
+    elif args.command == "list":
+        showTasks(shown, sortBy=args.sort, offset=args.offset, limit=args.limit)
+    elif args.command == "today" and args.all:
+        showListTasks(workspaces.dueToday())
+    elif args.command == "today":
+        showTasks(shown, filterToday=True, offset=args.offset, limit=args.limit)
+    elif args.command == "sort":
+        showTasks(shown, sortBy=args.sortBy, offset=args.offset, limit=args.limit)
+    elif args.command == "edit":
+        index = taskIndex(tasks, args.number)
+        task = tasks[index]
+        due = task.due if args.due is None else args.due
+        repeat = task.repeat
+        if args.repeat is not None:
+            repeat = Recurrence.fromText(args.repeat, due, repeat.until if repeat is not None else None)
+        if args.until is not None:
+            if repeat is None:
+                raise CommandError("--until needs a repeating task")
+            repeat = Recurrence(repeat.unit, repeat.every, repeat.anchor, args.until)
+        tasks[index] = stampCompletion(finishOccurrence(Task(
+            task.title if args.title is None else args.title,
+            task.description if args.description is None else args.description,
+            task.priority if args.priority is None else args.priority,
+            due,
+            task.completed if args.completed is None else args.completed,
+            task.extra,
+            repeat=repeat,
+        )), task)
+        recordChange("edit", index, tasks[index])
+    elif args.command == "delete":
+        index = taskIndex(tasks, args.number)
+        deletedTask = tasks.pop(index)
+        recordChange("delete", index, deletedTask)
+    elif args.command == "search":
+        showSearchResults(tasks, searchTasks(tasks, " ".join(args.words)))
+    elif args.command == "query":
+        taskQuery = buildQuery(args.sort, args.pending, args.priority, args.due_within, args.limit)
+        showSearchResults(tasks, taskQuery.seqs(tasks))
+    elif args.command == "import":
+        report = importTasks(tasks, args.path)
+        for number, reason in report.rejected:
+            print(f"{args.path}:{number}: rejected: {reason}", file=sys.stderr)
+        print(f"Imported {report.accepted} tasks, rejected {len(report.rejected)}.")
+        if report.rejected:
+            raise CommandError(f"{len(report.rejected)} rows rejected")
+    elif args.command == "export" and args.since is not None:
+        count, version = exportChanges(tasks, journal.feed, args.path, args.since)
+        print(f"Exported {count} changes (versions {args.since} to {version}) to {args.path}.")
+    elif args.command == "export":
+        print(f"Exported {exportTasks(tasks, args.path)} tasks to {args.path}.")
+    elif args.command == "apply":
+        count, version = applyChanges(tasks, args.path, journal.filePath, journal.feed.id())
+        print(f"Applied {count} changes, up to version {version} of the source store.")
+    elif args.command == "version":
+        print(f"Version {journal.feed.version()} (store {journal.feed.id()})")
+        for store, version in readApplied(journal.filePath).items():
+            print(f"Applied from store {store}: up to version {version}")
+    elif args.command == "archive":
+        print(f"Archived {archive.moveCompleted(tasks, args.days)} tasks.")
+    elif args.command == "history":
+        if args.words:
+            showArchivedTasks(archive.search(" ".join(args.words)))
+        else:
+            showTasks(archive.tasks())
+    elif args.command == "restore":
+        archived = archive.tasks()
+        task = archived[taskIndex(archived, args.number)]
+        if archive.restore(tasks, task) is None:
+            raise CommandError("the task is no longer in the archive")
+        print(f"Restored '{task.title}'.")
+    elif args.command == "lists":
+        showLists(workspaces.overview(), workspaces.active.name if workspaces.active is not None else None)
+
+def splitCommands(argv):
+    """Split a command line into the commands separated by ';'."""
+    commands, current = [], []
+    for token in argv:
+        if token == COMMAND_SEPARATOR:
+            if current:
+                commands.append(current)
+            current = []
+        else:
+            current.append(token)
+    if current:
+        commands.append(current)
+    return commands
+
+def readCommands(file):
+    """Yield the command lines of a file, skipping blank lines and # comments."""
+    for line in file:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+def isReadOnly(argv):
+    """Return True if every command in argv only shows tasks (a batch is never assumed read-only)."""
+    commands = splitCommands(argv)
+    return bool(commands) and all(command[0] in READ_ONLY_COMMANDS for command in commands)
+
+def changesTasks(argv):
+    """Return True unless every command in argv leaves the tasks unchanged (a batch may always change them)."""
+    commands = splitCommands(argv)
+    return not commands or any(command[0] not in LOOKUP_COMMANDS for command in commands)
+
+def runCommands(tasks, argv, archive=None, workspaces=None, store=None):
+    """Run the commands in argv, or from stdin/a file for 'batch [PATH]'.
+
+    Returns the number of commands that failed, suitable as an exit status.
+    """
+    if argv and argv[0] == "batch":
+        if len(argv) > 1 and argv[1] != "-":
+            with open(argv[1], 'r', encoding="utf-8") as file:
+                return applyCommands(tasks, readCommands(file), archive, workspaces, store)
+        return applyCommands(tasks, readCommands(sys.stdin), archive, workspaces, store)
+    return applyCommands(tasks, splitCommands(argv), archive, workspaces, store)
+
+def applyCommands(tasks, commands, archive=None, workspaces=None, store=None):
+    """Parse and apply each command (a token list or a command line), reporting failures on stderr."""
+    parser = buildParser()
+    failures = 0
+    for number, command in enumerate(commands, 1):
+        try:
+            tokens = shlex.split(command) if isinstance(command, str) else command
+            runCommand(tasks, parser.parse_args(tokens), archive, workspaces, store)
+        except (CommandError, OSError, ValueError, KeyError) as error:
+            print(f"error: command {number} ({command if isinstance(command, str) else ' '.join(command)}): {error}",
+                  file=sys.stderr)
+            failures += 1
+    return failures
\ No newline at end of file
@@ -2,9 +2,16 @@
 """
 Utility module for displaying tasks in the Task Manager application.
 Provides functions to sort and display tasks in the console or GUI,
-with color-coded priorities and alerts for due dates.
+with color-coded priorities and alerts for due dates. Console output is
+built into one string per page (or per WRITE_CHUNK lines) and written at
+once, and long lists can be paged through interactively.
 """
-from datetime import datetime, timedelta
+import shutil
+import sys
+from datetime import date
+from operator import attrgetter
+from profiling import profiled
+from taskModel import Priority
 
 class Colors:
     RED = '\033[91m'
@@ -12,45 +19,190 @@ class Colors:
     GREEN = '\033[92m'
     RESET = '\033[0m'
 
+PRIORITY_COLORS = {
+    Priority.HIGH: Colors.RED,
+    Priority.MEDIUM: Colors.YELLOW,
+    Priority.LOW: Colors.GREEN,
+}
+
+# Each line's format with its priority's color and label already filled in
+LINE_FORMATS = {
+    priority: f"{color}{{}}. {{}} - {priority} - {{}} [{{}}]{{}}{Colors.RESET}"
+    for priority, color in PRIORITY_COLORS.items()
+}
+STATUS_MARKS = ("✘", "✔")  # Indexed by task.completed
+ALERT_WARNING = f"{Colors.RED}Warning! Some tasks are close to their due date.{Colors.RESET}"
+CLEAR_SCREEN = "\033[2J\033[H"  # Erase the screen and move the cursor home
+WRITE_CHUNK = 4096  # Lines per write when showing everything at once
+PAGE_MARGIN = 4  # Terminal lines kept free for the warning and the paging prompt
+
+SORT_KEYS = {
+    "priority": attrgetter("priority"),
+    "dueDate": attrgetter("due"),
+}
+
+@profiled
 def sortTasks(tasks, sortBy=None):
-    """Sort tasks by priority or due date."""
-    if not sortBy:
-        return tasks
-    
-    priorityLevels = {"high": 3, "medium": 2, "low": 1}
-    
+    """Sort tasks by priority or due date.
+
+    A TaskCollection (or a mapped binary file) is read lazily from its sort
+    indexes; any other list is sorted into a new list.
+    """
+    sortedBy = getattr(tasks, "sortedBy", None)
+    if sortedBy is not None:
+        return sortedBy(sortBy)
     if sortBy == "priority":
-        return sorted(tasks, key=lambda x: priorityLevels.get(x["priority"], 0), reverse=True)
+        return sorted(tasks, key=SORT_KEYS[sortBy], reverse=True)
     elif sortBy == "dueDate":
-        return sorted(tasks, key=lambda x: datetime.strptime(x["dueDate"], "%d-%m-%Y"))
+        return sorted(tasks, key=SORT_KEYS[sortBy])
     return tasks
 
-def showTasks(tasks, filterToday=False, sortBy=None):
-    """Display tasks with optional filter for today and sorting."""
-    tasksToDisplay = sortTasks(tasks.copy(), sortBy)
-    
-    today = datetime.now().date()
+def numberedTasks(tasks, sortBy=None):
+    """Return (number in the list, task) pairs in the order given by sortBy.
+
+    Tasks keep the number edit and delete take whatever the order. A
+    TaskCollection (or a mapped binary file) is read lazily from its sort
+    indexes; any other list is sorted into a new list.
+    """
+    numberedBy = getattr(tasks, "numberedBy", None)
+    if numberedBy is not None:
+        return numberedBy(sortBy)
+    if sortBy in SORT_KEYS:
+        key = SORT_KEYS[sortBy]
+        return sorted(enumerate(tasks, 1), key=lambda numbered: key(numbered[1]), reverse=sortBy == "priority")
+    return enumerate(tasks, 1)
+
+def titleText(task):
+    """Return the title to show for a task, with its repeat rule if it has one."""
+    return task.title if task.repeat is None else f"{task.title} ({task.repeat})"
+
+def taskLine(number, task, alert):
+    """Return the colored console line for a task."""
+    return LINE_FORMATS[task.priority].format(number, titleText(task), task.dueDate, STATUS_MARKS[task.completed], alert)
+
+def clearScreen():
+    """Clear the console with ANSI escape codes instead of running a clear command."""
+    sys.stdout.write(CLEAR_SCREEN)
+    sys.stdout.flush()
+
+def pageSize():
+    """Return how many task lines fit on the terminal."""
+    return max(5, shutil.get_terminal_size().lines - PAGE_MARGIN)
+
+def renderTasks(tasks, filterToday=False, sortBy=None, offset=0, limit=None):
+    """Write the shown tasks numbered by their place in the list; return (tasks read, more left).
+
+    offset and limit count shown tasks (after the today filter). Reading
+    stops after the page when tasks has a length, so the count is then that
+    length; a stream is read to its end to count it.
+    """
+    try:
+        total = len(tasks)
+    except TypeError:
+        total = None
+    today = date.today().toordinal()
     hasAlerts = False
-    for i, task in enumerate(tasksToDisplay, 1):
-        dueDate = datetime.strptime(task["dueDate"], "%d-%m-%Y").date()
-        if filterToday and dueDate != today:
+    lines = []
+    shown = 0
+    count = 0
+    more = False
+    if filterToday and hasattr(tasks, "numberedDueOn"):
+        numbered = tasks.numberedDueOn(today, sortBy)  # Only today's tasks, found by binary search
+    else:
+        numbered = numberedTasks(tasks, sortBy)
+    for i, task in numbered:
+        count += 1
+        if filterToday and task.due != today and not task.occursOn(today):
             continue
-        
-        if task["priority"] == "high":
-            color = Colors.RED
-        elif task["priority"] == "medium":
-            color = Colors.YELLOW
-        else:
-            color = Colors.GREEN
-        
-        daysRemaining = (dueDate - today).days
-        alert = " (!)" if daysRemaining <= 1 and not task["completed"] else ""
+        shown += 1
+        if shown <= offset:
+            continue
+        if limit is not None and shown > offset + limit:
+            more = True
+            if total is not None:
+                break
+            continue
+        alert = " (!)" if task.due - today <= 1 and not task.completed else ""
         if alert:
             hasAlerts = True
-        
-        status = "✔" if task["completed"] else "✘"
-        print(f"{color}{i}. {task['title']} - {task['priority']} - {task['dueDate']} [{status}]{alert}{Colors.RESET}")
-    
+        lines.append(taskLine(i, task, alert))
+        if len(lines) >= WRITE_CHUNK:
+            sys.stdout.write("\n".join(lines) + "\n")
+            lines = []
     if hasAlerts:
-        print(f"{Colors.RED}Warning! Some tasks are close to their due date.{Colors.RESET}")
-    return len(tasksToDisplay)
\ No newline at end of file
+        lines.append(ALERT_WARNING)
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+    return (count if total is None else total), more
+
+@profiled
+def showTasks(tasks, filterToday=False, sortBy=None, offset=0, limit=None):
+    """Display tasks with optional filter for today, sorting and an offset/limit page.
+
+    tasks may be any iterable, such as the stream from fileOperations.iterTasks.
+    Returns the number of tasks read.
+    """
+    return renderTasks(tasks, filterToday, sortBy, offset, limit)[0]
+
+def pageTasks(tasks, filterToday=False, sortBy=None, size=None):
+    """Display tasks one screen at a time, asking before each next page.
+
+    Returns the number of tasks, like showTasks. A list that fits on one
+    screen is shown without any prompt.
+    """
+    size = size or pageSize()
+    offset = 0
+    while True:
+        count, more = renderTasks(tasks, filterToday, sortBy, offset, size)
+        if not more and not offset:
+            return count
+        prompt = "Enter: next page, p: previous page, q: stop" if more else "End of list. p: previous page, Enter: stop"
+        answer = input(f"-- Page {offset // size + 1} -- {prompt}: ").strip().lower()
+        if answer == "p":
+            offset = max(0, offset - size)
+        elif answer == "q" or not more:
+            return count
+        else:
+            offset += size
+        clearScreen()
+
+def showSearchResults(tasks, seqs):
+    """Display the tasks with the given sequence numbers, numbered by their place in the list.
+
+    Returns the number of tasks shown.
+    """
+    today = date.today().toordinal()
+    lines = []
+    for seq in seqs:
+        task = tasks.get(seq)
+        alert = " (!)" if task.due - today <= 1 and not task.completed else ""
+        lines.append(taskLine(tasks.indexOf(seq) + 1, task, alert))
+    sys.stdout.write("\n".join(lines) + "\n" if lines else "No matching tasks.\n")
+    return len(seqs)
+
+def showArchivedTasks(numbered):
+    """Display archived tasks given as (number, task) pairs; returns the number shown."""
+    lines = [taskLine(number, task, "") for number, task in numbered]
+    sys.stdout.write("\n".join(lines) + "\n" if lines else "No matching archived tasks.\n")
+    return len(lines)
+
+def showLists(rows, active=None):
+    """Display (name, task count, pending count, loaded) rows of the task lists, marking the active one."""
+    lines = [f"{'*' if name == active else ' '} {name}: {count} tasks, {pending} pending{' (loaded)' if loaded else ''}"
+             for name, count, pending, loaded in rows]
+    sys.stdout.write("\n".join(lines) + "\n")
+    return len(lines)
+
+def showListTasks(due):
+    """Display tasks of several lists given as (list name, [(number, task)]) pairs; returns the number shown."""
+    today = date.today().toordinal()
+    lines = []
+    shown = 0
+    for name, numbered in due:
+        lines.append(f"== {name} ==")
+        for number, task in numbered:
+            alert = " (!)" if task.due - today <= 1 and not task.completed else ""
+            lines.append(taskLine(number, task, alert))
+            shown += 1
+    sys.stdout.write("\n".join(lines) + "\n" if lines else "No tasks due today in any list.\n")
+    return shown
@@ -1,21 +1,796 @@
 # fileOperations.py
 """
 Module for handling file operations in the Task Manager application.
-Provides functions to load and save tasks to a JSON file for persistent storage.
+Provides functions to load and save tasks to a JSON file for persistent storage,
+plus an optional append-only journal so that single changes do not require
+rewriting the whole file. Files ending in .ndjson or .jsonl hold one task per
+line and can be streamed with iterTasks instead of being loaded whole; files
+ending in .bin use the memory-mapped binary format of binaryTasks.
+
+Several processes may share one task file. Journal entries name tasks by id
+and are appended under a file lock after catching up with what the other
+processes appended, so their changes are merged task by task; syncTasks
+applies new entries to a running process without re-reading the whole file.
+Journaled changes are also appended to the file's versioned change feed
+(see changeFeed.py), which is kept across snapshots.
 """
 import json
 import os
+import threading
+import zlib
+from contextlib import contextmanager
+from itertools import count, islice
+from binaryTasks import MAGIC, BINARY_EXTENSION, isBinary, encodeTasks, decodeTasks, openMapped
+from changeFeed import ChangeFeed
+from profiling import profiled, addCount
+from taskCollection import TaskCollection
+from taskModel import Task
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+JOURNAL_COMPACT_SIZE = 1024 * 1024  # Journal size (bytes) that triggers a new snapshot
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+LOAD_BATCH = 1000  # Tasks parsed between two progress calls of loadTasks
+
+activeJournal = None
+activeChangeLog = None  # Journal or storage engine that receives recordChange calls
+loadedStamps = {}  # filePath -> stamp of the snapshot whose journal was replayed cleanly
+loadedJournals = {}  # filePath -> (journal header line, bytes of the journal applied) for loadedStamps
+loadedBases = {}  # filePath -> {seq: task} as last loaded or saved, the base for merging on save
+threadLocks = {}  # filePath -> RLock keeping the other threads of this process out while one holds the file
+threadLocksGuard = threading.Lock()  # Guards creating the entries of threadLocks
+
+class HeldLocks(threading.local):
+    """Per-thread fileLock nesting depth of each file, so nested calls do not lock the file twice."""
+
+    def __init__(self):
+        self.depths = {}
+
+heldLocks = HeldLocks()
+
+def journalPath(filePath):
+    """Return the path of the journal that belongs to a snapshot file."""
+    return filePath + ".journal"
+
+def lockPath(filePath):
+    """Return the path of the lock file that guards a snapshot and its journal."""
+    return filePath + ".lock"
+
+@contextmanager
+def fileLock(filePath):
+    """Hold an exclusive lock on filePath and its journal against other processes and threads.
+
+    A per-file RLock keeps the other threads of this process out, and the
+    lock file is locked by the outermost call of the holding thread; nested
+    calls in that thread share it. If the lock file cannot be created (e.g. a
+    read-only directory) only the threads of this process are kept out.
+    """
+    with threadLocksGuard:
+        threadLock = threadLocks.setdefault(filePath, threading.RLock())
+    with threadLock:
+        depths = heldLocks.depths
+        if depths.get(filePath):
+            depths[filePath] += 1
+            try:
+                yield
+            finally:
+                depths[filePath] -= 1
+            return
+        try:
+            lockFile = open(lockPath(filePath), 'a+b')
+        except OSError:
+            lockFile = None
+        depths[filePath] = 1
+        try:
+            if lockFile is None:
+                yield
+            else:
+                with lockFile, processLock(lockFile):
+                    yield
+        finally:
+            depths[filePath] = 0
+
+@contextmanager
+def processLock(lockFile):
+    """Hold the OS lock on an open lock file."""
+    if fcntl is not None:
+        fcntl.flock(lockFile.fileno(), fcntl.LOCK_EX)
+    else:
+        lockFile.seek(0)
+        msvcrt.locking(lockFile.fileno(), msvcrt.LK_LOCK, 1)
+    try:
+        yield
+    finally:
+        if fcntl is not None:
+            fcntl.flock(lockFile.fileno(), fcntl.LOCK_UN)
+        else:
+            lockFile.seek(0)
+            msvcrt.locking(lockFile.fileno(), msvcrt.LK_UNLCK, 1)
+
+def snapshotStamp(data):
+    """Return the size and checksum that identify a snapshot's contents."""
+    return [len(data), zlib.crc32(data)]
+
+def fileStamp(filePath):
+    """Return a stamp of the snapshot and journal that filePath's tasks were loaded from or saved to.
+
+    Returns None if the journal could not be replayed cleanly.
+    """
+    stamp = loadedStamps.get(filePath)
+    if stamp is None:
+        return None
+    return stamp + [loadedJournals.get(filePath, (None, 0))[1]]
+
+def isNdjson(filePath, data=None):
+    """Return True if filePath holds (or should hold) one JSON task per line.
+
+    The extension decides for new files; existing files are sniffed, so a
+    JSON array saved under any name is still read correctly.
+    """
+    if data is None:
+        try:
+            with open(filePath, 'rb') as file:
+                data = file.read(4096)
+        except FileNotFoundError:
+            return filePath.endswith(NDJSON_EXTENSIONS)
+    if data.startswith(MAGIC):
+        return False
+    start = data.lstrip()[:1]
+    if not start:
+        return filePath.endswith(NDJSON_EXTENSIONS)
+    return start != b"["
+
+def parseTasks(data, filePath):
+    """Parse the contents of a task file in any of the formats."""
+    if not data.strip():
+        return iter(())  # Missing or empty file
+    if data.startswith(MAGIC):
+        return decodeTasks(data)
+    if isNdjson(filePath, data):
+        return (Task.fromDict(json.loads(line)) for line in data.splitlines() if line.strip())
+    return (Task.fromDict(item) for item in json.loads(data))
+
+def readSnapshot(filePath):
+    """Return the bytes of a task file, or b"" if it does not exist."""
+    try:
+        with open(filePath, 'rb') as file:
+            return file.read()
+    except FileNotFoundError:
+        return b""
+
+def withIds(tasks, fallbackIds):
+    """Give tasks saved before tasks had ids an id from fallbackIds."""
+    for task in tasks:
+        if task.id is None:
+            task.id = next(fallbackIds)
+        yield task
+
+def readTaskFile(filePath, progress=None):
+    """Read a snapshot and replay its journal.
+
+    Returns (tasks, snapshot stamp, journal header, journal bytes applied);
+    the header is None without a journal, and the byte count is None if the
+    journal did not belong to the snapshot or ended in a torn write. If
+    progress is given, it is called with each batch of LOAD_BATCH snapshot
+    tasks once they are in the collection.
+    """
+    data = readSnapshot(filePath)
+    stamp = snapshotStamp(data)
+    # Tasks without ids get ids derived from the snapshot, so every process reading it agrees on them
+    fallbackIds = (f"{stamp[1]:08x}-{number:x}" for number in count())
+    parsed = withIds(parseTasks(data, filePath), fallbackIds)
+    if progress is None:
+        tasks = TaskCollection(parsed)
+    else:
+        tasks = TaskCollection()
+        for batch in iter(lambda: list(islice(parsed, LOAD_BATCH)), []):
+            tasks.extend(batch)
+            progress(batch)
+    header, offset = replayJournal(tasks, filePath, stamp, fallbackIds)
+    return tasks, stamp, header, offset
+
+@profiled
+def loadTasks(filePath='tasks.json', progress=None):
+    """Load tasks from the JSON file, replaying any journaled changes.
+
+    progress, if given, is called with each batch of tasks as it is parsed
+    (see readTaskFile), e.g. to show them while the rest of the file loads.
+    """
+    with fileLock(filePath):
+        tasks, stamp, header, offset = readTaskFile(filePath, progress)
+    if offset is not None:
+        loadedStamps[filePath] = stamp
+        loadedJournals[filePath] = (header, offset)
+    else:
+        loadedStamps.pop(filePath, None)
+        loadedJournals.pop(filePath, None)
+    loadedBases[filePath] = dict(tasks.bySeq)
+    return tasks
+
+def iterTasks(filePath='tasks.json'):
+    """Yield tasks one at a time without holding the whole file in memory.
+
+    NDJSON files are streamed and binary files are read through a memory map;
+    a JSON array, or a file with pending journaled changes, is read in full
+    first, without changing what loadTasks remembered about the file.
+    """
+    if not hasJournalEntries(filePath) and isBinary(filePath):
+        try:
+            tasks = openMapped(filePath)
+        except FileNotFoundError:
+            return
+        with tasks:
+            yield from tasks
+        return
+    if not isNdjson(filePath) or hasJournalEntries(filePath):
+        with fileLock(filePath):
+            tasks = readTaskFile(filePath)[0]
+        yield from tasks
+        return
+    try:
+        file = open(filePath, 'r', encoding="utf-8")
+    except FileNotFoundError:
+        return
+    with file:
+        for line in file:
+            if line.strip():
+                yield Task.fromDict(json.loads(line))
+
+def isStreamable(filePath):
+    """Return True if iterTasks reads filePath one task at a time rather than in full."""
+    return os.path.isfile(filePath) and not hasJournalEntries(filePath) \
+        and (isBinary(filePath) or isNdjson(filePath))
+
+class TaskStream:
+    """Task file that is streamed with iterTasks each time it is iterated, for read-only display."""
+
+    def __init__(self, filePath):
+        self.filePath = filePath
+
+    def __iter__(self):
+        return iterTasks(self.filePath)
+
+def hasJournalEntries(filePath):
+    """Return True if the file's journal records changes beyond its header."""
+    try:
+        with open(journalPath(filePath), 'r', encoding="utf-8") as file:
+            file.readline()
+            return bool(file.readline())
+    except FileNotFoundError:
+        return False
+
+def convertTasks(sourcePath, targetPath):
+    """Copy tasks between the JSON array, NDJSON and binary formats, in any direction.
+
+    The target format follows the target's extension. NDJSON and binary
+    sources are streamed straight into an NDJSON target; returns the number
+    of tasks written.
+    """
+    if targetPath.endswith(NDJSON_EXTENSIONS):
+        count = 0
+        tempPath = targetPath + ".tmp"
+        with open(tempPath, 'w', encoding="utf-8") as file:
+            for task in iterTasks(sourcePath):
+                file.write(json.dumps(task.toDict()) + "\n")
+                count += 1
+        os.replace(tempPath, targetPath)
+        return count
+    tasks = list(iterTasks(sourcePath))
+    writeSnapshot(tasks, targetPath)
+    return len(tasks)
+
+@profiled
+def saveTasks(tasks, filePath=None):
+    """Save tasks to the JSON file (by default the journaled file, or tasks.json).
+
+    Without a journal, changes another process saved since this one loaded the
+    file are merged in first (see mergeSaved) instead of being overwritten.
+    """
+    if filePath is None:
+        filePath = activeJournal.filePath if activeJournal is not None else 'tasks.json'
+    if activeJournal is not None and activeJournal.filePath == filePath:
+        # Changes are already on disk; only fold the journal in if it grew too big
+        activeJournal.compactIfNeeded()
+    else:
+        with fileLock(filePath):
+            if isinstance(tasks, TaskCollection) and fileChanged(filePath):
+                mergeSaved(tasks, filePath)
+            feedSaved(tasks, filePath)
+            loadedStamps[filePath] = writeSnapshot(tasks, filePath)
+            loadedJournals[filePath] = (None, 0)
+            try:
+                os.remove(journalPath(filePath))
+            except FileNotFoundError:
+                pass
+        if isinstance(tasks, TaskCollection):
+            loadedBases[filePath] = dict(tasks.bySeq)
+    textIndex = getattr(tasks, "textIndex", None)
+    if textIndex is not None:
+        textIndex.save(tasks, filePath)
+    print(f"Tasks saved to: {os.path.abspath(filePath)}")
+
+def fileChanged(filePath):
+    """Return True if filePath was saved by someone else since this process loaded or saved it."""
+    stamp = loadedStamps.get(filePath)
+    if stamp is None:
+        return False  # Never loaded cleanly: saving simply replaces the file, as before
+    try:
+        journalSize = os.path.getsize(journalPath(filePath))
+    except FileNotFoundError:
+        journalSize = 0
+    return journalSize != loadedJournals.get(filePath, (None, 0))[1] or snapshotStamp(readSnapshot(filePath)) != stamp
+
+def mergeSaved(tasks, filePath):
+    """Fold the tasks another process saved to filePath into tasks, task by task.
 
-def loadTasks(filePath='tasks.json'):
-    """Load tasks from the JSON file."""
+    A task changed on only one side takes that side's version. When both sides
+    changed it, a delete wins over an edit and otherwise this (later) save wins.
+    """
+    theirs = readTaskFile(filePath)[0]
+    base = {task.id: task for task in loadedBases.get(filePath, {}).values()}
+    for seq in list(tasks.order):
+        task = tasks.get(seq)
+        theirSeq = theirs.seqById.get(task.id)
+        if theirSeq is None:
+            if task.id in base:
+                tasks.removeSeq(seq)  # Deleted by the other process
+        elif task is base.get(task.id):
+            theirTask = theirs.get(theirSeq)
+            if theirTask != task:
+                tasks.replaceSeq(seq, theirTask)  # Changed only by the other process
+    tasks.extend(task for task in theirs if task.id not in base and task.id not in tasks.seqById)
+
+def feedSaved(tasks, filePath):
+    """Append what a full save changes to the file's change feed, if it has one.
+
+    Changes are found by comparing tasks, by id, with the tasks as this
+    process last loaded or saved them (or, failing that, as the file holds them).
+    """
+    feed = ChangeFeed(filePath)
+    if not feed.exists():
+        return  # A feed is started by the journal
+    if filePath in loadedBases:
+        base = {task.id: task for task in loadedBases[filePath].values()}
+    else:
+        base = {task.id: task for task in readTaskFile(filePath)[0]}
+    current = set()
+    changes = []
+    for task in tasks:
+        current.add(task.id)
+        old = base.get(task.id)
+        if old is None:
+            changes.append(("add", task))
+        elif old is not task and old != task:
+            changes.append(("edit", task))
+    changes.extend(("delete", task) for taskId, task in base.items() if taskId not in current)
+    feed.append(changes)
+
+def encodeSnapshot(tasks, filePath):
+    """Return the contents of filePath for the given tasks (a JSON array, or NDJSON or binary by extension)."""
+    if filePath.endswith(BINARY_EXTENSION):
+        return encodeTasks(tasks)
+    if filePath.endswith(NDJSON_EXTENSIONS):
+        return "".join(json.dumps(task.toDict()) + "\n" for task in tasks).encode("utf-8")
+    return json.dumps([task.toDict() for task in tasks], indent=4).encode("utf-8")
+
+def writeSynced(filePath, data):
+    """Write data to filePath and flush it to disk."""
+    with open(filePath, 'wb') as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    addCount("task file bytes written", len(data))
+
+def writeSnapshot(tasks, filePath):
+    """Write the full task list to filePath and return its snapshot stamp."""
+    data = encodeSnapshot(tasks, filePath)
+    tempPath = filePath + ".tmp"
+    writeSynced(tempPath, data)
+    os.replace(tempPath, filePath)
+    return snapshotStamp(data)
+
+def prepareSnapshot(tasks, filePath):
+    """Write a snapshot of tasks next to filePath without replacing it.
+
+    Touches neither the journal nor any shared state, so a worker thread can
+    run it on a copy of the tasks. Returns (temporary path, snapshot stamp);
+    Journal.commitSnapshot moves the file into place.
+    """
+    data = encodeSnapshot(tasks, filePath)
+    tempPath = filePath + ".autosave.tmp"
+    writeSynced(tempPath, data)
+    return tempPath, snapshotStamp(data)
+
+def newTasks(tasks, added, fallbackIds):
+    """Yield the added tasks that are not in tasks yet, giving id-less ones a fallback id."""
+    for task in withIds(added, fallbackIds):
+        if task.id not in tasks.seqById:
+            yield task
+
+def replayJournal(tasks, filePath, stamp, fallbackIds):
+    """Apply the journaled changes recorded on top of the given snapshot.
+
+    Returns (header line, bytes applied). The header is None if there is no
+    journal; the byte count is None if the journal does not belong to the
+    snapshot or ends in a torn write, meaning it must not be appended to.
+    """
+    try:
+        with open(journalPath(filePath), 'rb') as file:
+            data = file.read()
+    except FileNotFoundError:
+        return None, 0
+    header, newline, body = data.partition(b"\n")
+    try:
+        if not newline or json.loads(header).get("snapshot") != stamp:
+            return header, None  # Journal predates the current snapshot and is already folded in
+    except ValueError:
+        return header, None
+    offset = len(header) + 1
+    added = []  # Consecutive adds are applied as one bulk extend
+    for line in body.splitlines(keepends=True):
+        try:
+            if not line.endswith(b"\n"):
+                raise ValueError("unterminated line")
+            entry = json.loads(line)
+        except ValueError:
+            tasks.extend(newTasks(tasks, added, fallbackIds))
+            return header + b"\n", None  # Torn last write from a crash; everything before it is valid
+        if entry["action"] == "add":
+            added.append(Task.fromDict(entry["task"]))
+        elif entry["action"] == "addMany":
+            added.extend(Task.fromDict(item) for item in entry["tasks"])
+        else:
+            tasks.extend(newTasks(tasks, added, fallbackIds))
+            added = []
+            applyChange(tasks, entry)
+        offset += len(line)
+    tasks.extend(newTasks(tasks, added, fallbackIds))
+    return header + b"\n", offset
+
+def entrySeq(tasks, entry):
+    """Return the sequence number of the task an edit or delete entry refers to, or None if it is gone."""
+    if "id" not in entry:
+        return tasks.seqAt(entry["index"])  # Written before tasks had ids
+    return tasks.seqById.get(entry["id"])
+
+def applyChange(tasks, entry):
+    """Apply a single journal entry to the task list."""
+    action = entry["action"]
+    if action == "add":
+        tasks.append(Task.fromDict(entry["task"]))
+    elif action == "addMany":
+        tasks.extend(Task.fromDict(item) for item in entry["tasks"])
+    elif action == "edit":
+        seq = entrySeq(tasks, entry)
+        if seq is not None:
+            tasks.replaceSeq(seq, Task.fromDict(entry["task"]))
+    elif action == "delete":
+        seq = entrySeq(tasks, entry)
+        if seq is not None:
+            tasks.removeSeq(seq)
+
+def journalLine(action, index=None, task=None):
+    """Return the journal line that records one change.
+
+    Edits and deletes name the task by id when the task is given, so that
+    they still find it after other processes added or deleted tasks.
+    """
+    entry = {"action": action}
+    if action != "add" and task is not None:
+        entry["id"] = task.id
+    elif index is not None:
+        entry["index"] = index
+    if task is not None and action != "delete":
+        entry["task"] = task.toDict()
+    return json.dumps(entry) + "\n"
+
+def addLine(added):
+    """Return the journal line for a run of added tasks (given in JSON form)."""
+    if len(added) == 1:
+        return json.dumps({"action": "add", "task": added[0]}) + "\n"
+    return json.dumps({"action": "addMany", "tasks": added}) + "\n"
+
+class Journal:
+    """Append-only log of add/edit/delete operations for a task file, shared by every process using it."""
+
+    def __init__(self, tasks, filePath='tasks.json', compactSize=JOURNAL_COMPACT_SIZE):
+        self.tasks = tasks
+        self.filePath = filePath
+        self.compactSize = compactSize
+        self.file = None
+        self.header = None  # First line of the journal being appended to
+        self.offset = 0  # Bytes of the journal applied to tasks
+        self.signature = None  # os.stat of the journal when last read or written, for cheap change checks
+        self.pending = {}  # id -> action of the changes being recorded; they win edit conflicts
+        self.dropped = set()  # Pending ids whose change lost to another process's delete
+        self.changes = []  # (action, seq) applied for other processes, not yet returned by poll
+        self.feed = ChangeFeed(filePath)
+        with fileLock(filePath):
+            if loadedStamps.get(filePath) is None or filePath not in loadedJournals:
+                self.compact()
+            else:
+                # Catch up with anything saved since loadTasks, then keep appending to that journal
+                self.header, self.offset = loadedJournals[filePath]
+                self.sync()
+            self.compactIfNeeded()
+            if not self.feed.exists():
+                self.feed.start(self.tasks)
+
+    def record(self, action, index=None, task=None):
+        """Append one change to the journal and compact it if it grew too big."""
+        self.recordMany([(action, index, task)])
+
+    def recordMany(self, changes):
+        """Append several (action, index, task) changes with a single write.
+
+        Entries other processes appended meanwhile are applied first. Runs of
+        consecutive adds are stored as one "addMany" entry, which is much
+        cheaper to encode and replay than one line per task.
+        """
+        changes = list(changes)
+        with fileLock(self.filePath):
+            self.pending = {task.id: action for action, index, task in changes if task is not None}
+            try:
+                self.sync()
+                dropped = self.dropped
+            finally:
+                self.pending = {}
+                self.dropped = set()
+            lines = []
+            added = []
+            recorded = []
+            for action, index, task in changes:
+                if task is not None and task.id in dropped:
+                    continue
+                if task is not None:
+                    recorded.append((action, task))
+                if action == "add":
+                    added.append(task.toDict())
+                    continue
+                if added:
+                    lines.append(addLine(added))
+                    added = []
+                lines.append(journalLine(action, index, task))
+            if added:
+                lines.append(addLine(added))
+            data = "".join(lines).encode("utf-8")
+            self.file.write(data)
+            self.file.flush()
+            addCount("journal bytes written", len(data))
+            self.offset += len(data)
+            self.remember()
+            self.feed.append(recorded)
+            self.compactIfNeeded()
+
+    def poll(self):
+        """Apply new entries from other processes; return the (action, seq) changes made since the last poll."""
+        self.sync()
+        changes, self.changes = self.changes, []
+        return changes
+
+    def sync(self):
+        """Apply the entries other processes appended, or their new snapshot, since this one last looked."""
+        path = journalPath(self.filePath)
+        if self.file is not None and self.signature == statSignature(path):
+            return  # Only this process has written since
+        with fileLock(self.filePath):
+            try:
+                with open(path, 'rb') as file:
+                    header = file.readline()
+                    if header == self.header:
+                        file.seek(self.offset)
+                        data = file.read()
+            except FileNotFoundError:
+                header = None
+            if header is None or header != self.header:
+                self.reload()
+                return
+            end = data.rfind(b"\n") + 1
+            for line in data[:end].splitlines():
+                self.applyEntry(json.loads(line))
+            self.offset += end
+            if self.file is None:
+                self.file = open(path, 'ab')
+            self.remember()
+
+    def applyEntry(self, entry):
+        """Apply one entry another process appended, resolving conflicts with pending changes."""
+        tasks = self.tasks
+        action = entry["action"]
+        if action in ("add", "addMany"):
+            items = [entry["task"]] if action == "add" else entry["tasks"]
+            start = len(tasks)
+            tasks.extend(task for task in map(Task.fromDict, items) if task.id not in tasks.seqById)
+            self.changes.extend(("add", tasks.seqAt(index)) for index in range(start, len(tasks)))
+            return
+        taskId = entry.get("id")
+        seq = entrySeq(tasks, entry)
+        if seq is None:
+            if taskId in self.pending:
+                self.dropped.add(taskId)  # Both deleted it
+            return
+        if action == "edit":
+            if taskId not in self.pending:  # Otherwise the pending edit is newer and wins
+                tasks.replaceSeq(seq, Task.fromDict(entry["task"]))
+                self.changes.append(("edit", seq))
+        elif action == "delete":
+            if taskId in self.pending:
+                self.dropped.add(taskId)  # A delete wins over an edit
+            tasks.removeSeq(seq)
+            self.changes.append(("delete", seq))
+
+    def reload(self):
+        """Catch up after another process wrote a new snapshot: diff the whole file by task id."""
+        stamp = loadedStamps.get(self.filePath)
+        if self.header is None and not os.path.exists(journalPath(self.filePath)) \
+                and snapshotStamp(readSnapshot(self.filePath)) == stamp:
+            self.startJournal(stamp)  # Nothing changed; this file just had no journal yet
+            return
+        theirs, stamp, header, offset = readTaskFile(self.filePath)
+        tasks = self.tasks
+        for seq in [seq for seq in tasks.order if tasks.get(seq).id not in theirs.seqById]:
+            taskId = tasks.get(seq).id
+            if self.pending.get(taskId) == "add":
+                continue  # Added here and not written yet
+            if taskId in self.pending:
+                self.dropped.add(taskId)
+            tasks.removeSeq(seq)
+            self.changes.append(("delete", seq))
+        for task in theirs:
+            seq = tasks.seqById.get(task.id)
+            if seq is None:
+                if self.pending.get(task.id) != "delete":
+                    tasks.append(task)
+                    self.changes.append(("add", tasks.seqAt(-1)))
+            elif task.id not in self.pending and task != tasks.get(seq):
+                tasks.replaceSeq(seq, task)
+                self.changes.append(("edit", seq))
+        self.close()
+        if offset is None:
+            # Their journal is unusable: the merged tasks, pending changes included, become the new snapshot
+            self.dropped.update(self.pending)
+            self.compact()
+            return
+        loadedStamps[self.filePath] = stamp
+        if header is None:
+            self.startJournal(stamp)
+        else:
+            self.header, self.offset = header, offset
+            self.file = open(journalPath(self.filePath), 'ab')
+            self.remember()
+
+    def remember(self):
+        """Note the journal's current state as seen by this process."""
+        self.signature = statSignature(journalPath(self.filePath))
+        loadedJournals[self.filePath] = (self.header, self.offset)
+
+    def compactIfNeeded(self):
+        """Fold the journal into a new snapshot once it passes compactSize."""
+        self.sync()
+        if self.offset > self.compactSize:
+            self.compact()
+
+    def compact(self):
+        """Write a fresh snapshot and start an empty journal on top of it."""
+        with fileLock(self.filePath):
+            self.close()
+            stamp = writeSnapshot(self.tasks, self.filePath)
+            loadedStamps[self.filePath] = stamp
+            self.startJournal(stamp)
+
+    def commitSnapshot(self, tempPath, stamp, header, offset):
+        """Replace the task file with a prepared snapshot of the tasks at journal position (header, offset).
+
+        If anything was journaled since that position the snapshot is stale:
+        it is discarded and False is returned.
+        """
+        with fileLock(self.filePath):
+            self.sync()
+            if self.header != header or self.offset != offset:
+                os.remove(tempPath)
+                return False
+            self.close()
+            os.replace(tempPath, self.filePath)
+            loadedStamps[self.filePath] = stamp
+            self.startJournal(stamp)
+        return True
+
+    def startJournal(self, stamp):
+        """Create an empty journal on top of the snapshot identified by stamp."""
+        # The generation tells a new journal apart from an older one on an identical snapshot
+        self.header = (json.dumps({"snapshot": stamp, "generation": os.urandom(4).hex()}) + "\n").encode("utf-8")
+        # Append mode, so writes never land before what other processes appended
+        self.file = open(journalPath(self.filePath), 'ab')
+        self.file.truncate(0)
+        self.file.write(self.header)
+        self.file.flush()
+        self.offset = len(self.header)
+        self.remember()
+
+    def close(self):
+        """Close the journal file."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+def statSignature(path):
+    """Return the size, modification time and inode of a file, or None if it is missing."""
     try:
-        with open(filePath, 'r') as file:
-            return json.load(file)
+        stat = os.stat(path)
     except FileNotFoundError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+def openJournal(tasks, filePath='tasks.json', compactSize=JOURNAL_COMPACT_SIZE, closeActive=True):
+    """Start journaling changes to tasks instead of rewriting filePath on save.
+
+    With closeActive False the previously active journal stays open, so that
+    several task lists can be kept journaled and switched with activateJournal.
+    """
+    if closeActive:
+        closeJournal()
+    journal = Journal(tasks, filePath, compactSize)
+    loadedBases.pop(filePath, None)  # The journal merges changes itself
+    activateJournal(journal)
+    return journal
+
+def activateJournal(journal):
+    """Make an open journal the one that recordChange, syncTasks and saveTasks use."""
+    global activeJournal
+    activeJournal = journal
+    setChangeLog(journal)
+
+def closeJournal(journal=None):
+    """Stop journaling (the active journal, or the given one); later saves rewrite the whole file again."""
+    global activeJournal
+    journal = journal or activeJournal
+    if journal is not None:
+        journal.sync()
+        # Later saves without the journal merge against the tasks as they are now
+        loadedBases[journal.filePath] = dict(journal.tasks.bySeq)
+        journal.close()
+        if activeChangeLog is journal:
+            setChangeLog(None)
+        if activeJournal is journal:
+            activeJournal = None
+
+def currentJournal():
+    """Return the active Journal, or None if changes are not being journaled."""
+    return activeJournal
+
+def syncTasks():
+    """Apply changes other processes saved to the journaled task file.
+
+    Returns (action, seq) pairs for the tasks that were added, edited or
+    deleted, so a view can update just those rows. Costs one os.stat when
+    nothing changed.
+    """
+    if activeJournal is None:
         return []
+    return activeJournal.poll()
+
+def setChangeLog(changeLog):
+    """Send future recordChange calls to changeLog (anything with a record method)."""
+    global activeChangeLog
+    activeChangeLog = changeLog
+
+def changeLogActive():
+    """Return True if recordChange writes changes somewhere (a journal or a store)."""
+    return activeChangeLog is not None
+
+def recordChange(action, index=None, task=None):
+    """Record an add, edit or delete in the active journal or store, if there is one.
+
+    For a delete, pass the deleted task so the journal can name it by id.
+    """
+    if activeChangeLog is not None:
+        activeChangeLog.record(action, index, task)
 
-def saveTasks(tasks, filePath='tasks.json'):
-    """Save tasks to the JSON file."""
-    with open(filePath, 'w') as file:
-        json.dump(tasks, file, indent=4)
-    print(f"Tasks saved to: {os.path.abspath(filePath)}")
\ No newline at end of file
+def recordChanges(changes):
+    """Record several (action, index, task) changes in one write to the active journal or store."""
+    if activeChangeLog is not None:
+        activeChangeLog.recordMany(changes)
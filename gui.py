@@ -2,19 +2,79 @@
 """
 Graphical User Interface (GUI) for the Task Manager application.
 Built with Tkinter, this module provides a visual way to manage tasks,
-including adding, editing, deleting, and sorting tasks by priority or due date.
+including adding, editing, deleting, searching, filtering, and sorting tasks by priority or due date,
+browsing and restoring archived tasks, and switching between task lists.
+Given no tasks, the window opens at once and the task list is loaded on a
+worker thread (see taskLoader.py), its rows appearing as the file is parsed.
 """
+import time
 import tkinter as tk
+from bisect import bisect_left
 from tkinter import ttk, messagebox
-from datetime import datetime
-from taskOperations import addTask, editTask, deleteTask, validateDate
-from fileOperations import saveTasks
-from displayUtils import Colors, sortTasks
+from taskOperations import validateDate
+from taskModel import Task, Priority, Recurrence, parseDate, formatDate, finishOccurrence, stampCompletion
+from fileOperations import saveTasks, recordChange, syncTasks
+from displayUtils import titleText
+from alertEngine import AlertEngine
+from searchIndex import searchTasks
+from taskQuery import buildQuery, SORT_ORDERS
+from autoSave import startAutoSave
+from taskCollection import TaskCollection, SEQ_MASK
+from taskLoader import TaskLoader
+from workspaces import WorkspaceError
+from profiling import profiled, addCount
+
+VIRTUAL_THRESHOLD = 10000  # Above this many tasks only the visible rows are kept in the Treeview
+SEARCH_DELAY_MS = 200  # Typing pause before the search box filters the list
+SYNC_INTERVAL_MS = 1000  # How often to look for changes other processes saved to the task file
+ALERT_RECHECK_MS = 60000  # Longest wait between alert checks, in case the clock jumps or the machine sleeps
+LOAD_POLL_MS = 50  # How often to show the tasks loaded in the background so far
+LOAD_TICK_MS = 30  # Longest time spent adding loaded tasks before the window is redrawn
+
+def viewOrder(tasks, sortBy=None, query="", filters=None):
+    """Return the sequence numbers of the tasks to list in display order.
+
+    Only the matches of the search query are listed, if one is given, and of
+    filters (buildQuery options such as a priority or limit), if given.
+    """
+    if filters:
+        taskQuery = buildQuery(SORT_ORDERS[sortBy], **filters)
+        return taskQuery.seqs(tasks, searchTasks(tasks, query) if query else None)
+    if query:
+        return tasks.sortSeqs(searchTasks(tasks, query), sortBy)
+    return list(tasks.sortedSeqs(sortBy))
+
+def rowOptions(task, alerting):
+    """Return the Treeview values and tags for a task."""
+    alert = " (!)" if alerting else ""
+    tag = str(task.priority)
+    return {
+        "values": (titleText(task) + alert, tag, task.dueDate, "✔" if task.completed else "✘"),
+        "tags": (tag,),
+    }
 
 class TaskManagerGUI:
-    def __init__(self, root, tasks):
+    def __init__(self, root, tasks, store=None, virtual=None, archive=None, workspaces=None, listName=None):
+        loading = tasks is None  # Load list listName of workspaces in the background
+        if loading:
+            tasks = TaskCollection()  # What has loaded so far, until the loaded list replaces it
         self.root = root
         self.tasks = tasks
+        self.store = store
+        self.archive = archive  # taskArchive.TaskArchive, read only when the history window opens
+        self.workspaces = workspaces  # workspaces.WorkspaceManager, or None with SQLite storage
+        self.virtual = len(tasks) > VIRTUAL_THRESHOLD if virtual is None else virtual
+        self.sortBy = None
+        self.viewOrder = []  # TaskCollection.sortKey of each listed task, in display order
+        self.viewKeys = {}  # Sequence number of each listed task -> its key in viewOrder
+        self.firstRow = 0  # First row of viewOrder shown in virtual mode
+        self.alerts = AlertEngine(tasks)
+        self.searchQuery = ""
+        self.filters = None  # buildQuery options from the filter bar, or None when no filter is set
+        self.pendingSearch = None  # after() id of a search waiting for typing to pause
+        self.autoSaver = startAutoSave() if store is None and not loading else None  # The SQLite store commits every change itself
+        self.loader = None  # TaskLoader while the task list loads in the background
+        self.loadedOnly = []  # Widgets that change tasks or lists, disabled while the list loads
         self.root.title("Task Manager")
         self.root.geometry("800x600")
 
@@ -33,6 +93,51 @@ class TaskManagerGUI:
         titleLabel = ttk.Label(self.mainContainer, text="Task Manager", font=("Helvetica", 16, "bold"))
         titleLabel.grid(row=0, column=0, columnspan=2, pady=(0, 20))
 
+        # Task list selector; typing a new name and pressing Enter creates that list
+        if workspaces is not None:
+            listFrame = ttk.Frame(self.mainContainer)
+            listFrame.grid(row=0, column=2, sticky=tk.E, pady=(0, 20))
+            ttk.Label(listFrame, text="List:").grid(row=0, column=0, padx=(0, 5))
+            self.listVar = tk.StringVar(value=listName if loading else workspaces.active.name)
+            self.listBox = ttk.Combobox(listFrame, textvariable=self.listVar, values=workspaces.names(), width=15,
+                                        postcommand=lambda: self.listBox.configure(values=self.workspaces.names()))
+            self.listBox.grid(row=0, column=1)
+            self.listBox.bind("<<ComboboxSelected>>", self.switchList)
+            self.listBox.bind("<Return>", self.switchList)
+            self.loadedOnly.append(self.listBox)
+
+        # Search box
+        searchFrame = ttk.Frame(self.mainContainer)
+        searchFrame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
+        ttk.Label(searchFrame, text="Search:").grid(row=0, column=0, padx=(0, 5))
+        self.searchVar = tk.StringVar()
+        searchEntry = ttk.Entry(searchFrame, textvariable=self.searchVar, width=50)
+        searchEntry.grid(row=0, column=1)
+        searchEntry.bind("<KeyRelease>", self.onSearchTyped)
+
+        # Filter bar; with a limit, "Sort by" picks the first N in that order without a full sort
+        filterFrame = ttk.Frame(searchFrame)
+        filterFrame.grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        ttk.Label(filterFrame, text="Priority:").grid(row=0, column=0, padx=(0, 5))
+        self.priorityVar = tk.StringVar(value="any")
+        priorityBox = ttk.Combobox(filterFrame, textvariable=self.priorityVar, values=["any", "high", "medium", "low"],
+                                   state="readonly", width=8)
+        priorityBox.grid(row=0, column=1, padx=(0, 10))
+        priorityBox.bind("<<ComboboxSelected>>", self.onSearchTyped)
+        self.hideCompletedVar = tk.BooleanVar(value=False)
+        ttk.Checkbutton(filterFrame, text="Hide completed", variable=self.hideCompletedVar,
+                        command=self.onSearchTyped).grid(row=0, column=2, padx=(0, 10))
+        ttk.Label(filterFrame, text="Due within (days):").grid(row=0, column=3, padx=(0, 5))
+        self.dueWithinVar = tk.StringVar()
+        dueWithinEntry = ttk.Entry(filterFrame, textvariable=self.dueWithinVar, width=5)
+        dueWithinEntry.grid(row=0, column=4, padx=(0, 10))
+        dueWithinEntry.bind("<KeyRelease>", self.onSearchTyped)
+        ttk.Label(filterFrame, text="Show first:").grid(row=0, column=5, padx=(0, 5))
+        self.limitVar = tk.StringVar()
+        limitEntry = ttk.Entry(filterFrame, textvariable=self.limitVar, width=6)
+        limitEntry.grid(row=0, column=6)
+        limitEntry.bind("<KeyRelease>", self.onSearchTyped)
+
         # Task list
         self.taskList = ttk.Treeview(self.mainContainer, columns=("Title", "Priority", "Due Date", "Completed"), show="headings", height=15)
         self.taskList.heading("Title", text="Title")
@@ -43,64 +148,349 @@ class TaskManagerGUI:
         self.taskList.column("Priority", width=100)
         self.taskList.column("Due Date", width=120)
         self.taskList.column("Completed", width=100)
-        self.taskList.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.taskList.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.taskList.tag_configure("high", foreground="red")
+        self.taskList.tag_configure("medium", foreground="orange")
+        self.taskList.tag_configure("low", foreground="green")
 
         # Scrollbar for task list
-        scrollbar = ttk.Scrollbar(self.mainContainer, orient=tk.VERTICAL, command=self.taskList.yview)
-        self.taskList.configure(yscroll=scrollbar.set)
-        scrollbar.grid(row=1, column=2, sticky=(tk.N, tk.S))
+        self.scrollbar = ttk.Scrollbar(self.mainContainer, orient=tk.VERTICAL)
+        self.scrollbar.grid(row=2, column=2, sticky=(tk.N, tk.S))
+        self.setVirtual(self.virtual)
 
         # Button frame
         buttonFrame = ttk.Frame(self.mainContainer, padding="10")
-        buttonFrame.grid(row=2, column=0, columnspan=2, pady=20)
+        buttonFrame.grid(row=3, column=0, columnspan=2, pady=20)
 
         # Buttons
-        ttk.Button(buttonFrame, text="Add Task", command=self.openAddTaskWindow).grid(row=0, column=0, padx=5)
-        ttk.Button(buttonFrame, text="Edit Task", command=self.openEditTaskWindow).grid(row=0, column=1, padx=5)
-        ttk.Button(buttonFrame, text="Delete Task", command=self.deleteTask).grid(row=0, column=2, padx=5)
+        addButton = ttk.Button(buttonFrame, text="Add Task", command=self.openAddTaskWindow)
+        addButton.grid(row=0, column=0, padx=5)
+        editButton = ttk.Button(buttonFrame, text="Edit Task", command=self.openEditTaskWindow)
+        editButton.grid(row=0, column=1, padx=5)
+        deleteButton = ttk.Button(buttonFrame, text="Delete Task", command=self.deleteTask)
+        deleteButton.grid(row=0, column=2, padx=5)
+        self.loadedOnly.extend([addButton, editButton, deleteButton])
+        if archive is not None or loading:
+            historyButton = ttk.Button(buttonFrame, text="History", command=self.openHistoryWindow)
+            historyButton.grid(row=0, column=3, padx=5)
+            self.loadedOnly.append(historyButton)
+        if workspaces is not None:
+            dueTodayButton = ttk.Button(buttonFrame, text="Due Today (All Lists)", command=self.openDueTodayWindow)
+            dueTodayButton.grid(row=1, column=3, padx=5, pady=5)
+            self.loadedOnly.append(dueTodayButton)
         ttk.Button(buttonFrame, text="Sort by Priority", command=lambda: self.sortTasks("priority")).grid(row=1, column=0, padx=5, pady=5)
         ttk.Button(buttonFrame, text="Sort by Due Date", command=lambda: self.sortTasks("dueDate")).grid(row=1, column=1, padx=5, pady=5)
         ttk.Button(buttonFrame, text="Exit", command=self.exit).grid(row=1, column=2, padx=5, pady=5)
 
+        # Autosave status
+        self.statusLabel = ttk.Label(self.mainContainer, text="")
+        self.statusLabel.grid(row=4, column=0, columnspan=2, sticky=tk.W)
+
         # Initial task display
         self.refreshTaskList()
-
+        self.scheduleAlertCheck()
+        if loading:
+            # Sorting and searching work on the tasks loaded so far; changes wait for the whole list
+            for widget in self.loadedOnly:
+                widget.configure(state="disabled")
+            self.progressBar = ttk.Progressbar(self.mainContainer, mode="indeterminate")
+            self.progressBar.grid(row=5, column=0, columnspan=2, sticky=(tk.W, tk.E))
+            self.progressBar.start()
+            self.statusLabel.config(text="Loading tasks...")
+            self.loader = TaskLoader(lambda progress: workspaces.switch(listName, progress))
+            self.root.after(LOAD_POLL_MS, self.pollLoad)
+        else:
+            self.root.after(SYNC_INTERVAL_MS, self.pollChanges)
+
+    def setVirtual(self, virtual):
+        """Keep every row in the Treeview, or (virtual) only the rows of the visible window."""
+        self.virtual = virtual
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            if virtual:
+                self.taskList.bind(sequence, self.onMouseWheel)
+            else:
+                self.taskList.unbind(sequence)
+        if virtual:
+            # The Treeview only holds one screen of rows; the scrollbar moves that window
+            self.scrollbar.configure(command=self.scrollWindow)
+            self.taskList.configure(yscrollcommand="")
+        else:
+            self.scrollbar.configure(command=self.taskList.yview)
+            self.taskList.configure(yscrollcommand=self.scrollbar.set)
+
+    @profiled
     def refreshTaskList(self, sortBy=None):
-        """Refresh the task list display."""
-        for item in self.taskList.get_children():
-            self.taskList.delete(item)
-
-        tasksToDisplay = sortTasks(self.tasks.copy(), sortBy)
-
-        today = datetime.now().date()
-        for task in tasksToDisplay:
-            dueDate = datetime.strptime(task["dueDate"], "%d-%m-%Y").date()
-            daysRemaining = (dueDate - today).days
-            alert = " (!)" if daysRemaining <= 1 and not task["completed"] else ""
-            
-            if task["priority"] == "high":
-                tag = "high"
-            elif task["priority"] == "medium":
-                tag = "medium"
+        """Show the tasks (only the search and filter matches, if any) in the given order, moving existing rows instead of recreating them."""
+        self.sortBy = sortBy
+        self.setViewOrder(viewOrder(self.tasks, sortBy, self.searchQuery, self.filters))
+        if self.virtual:
+            self.renderWindow()
+        else:
+            self.syncRows(self.viewSeqs())
+
+    def setViewOrder(self, seqs):
+        """List the tasks with sequence numbers seqs, given in display order."""
+        sortKey = self.tasks.sortKey
+        self.viewOrder = [sortKey(seq, self.sortBy) for seq in seqs]
+        self.viewKeys = dict(zip(seqs, self.viewOrder))
+
+    def viewSeqs(self, start=0, stop=None):
+        """Return the sequence numbers of the listed tasks from row start to row stop."""
+        return [key & SEQ_MASK for key in self.viewOrder[start:stop]]
+
+    def rowOptions(self, seq):
+        """Return the Treeview values and tags for the task with sequence number seq."""
+        return rowOptions(self.tasks.get(seq), self.alerts.isAlerting(seq))
+
+    def syncRows(self, seqs, updateValues=False):
+        """Make the Treeview show exactly the tasks in seqs, in that order."""
+        wanted = [str(seq) for seq in seqs]
+        wantedSet = set(wanted)
+        current = self.taskList.get_children()
+        stale = [iid for iid in current if iid not in wantedSet]
+        if stale:
+            self.taskList.delete(*stale)
+            addCount("Treeview rows deleted", len(stale))
+        kept = [iid for iid in current if iid in wantedSet]
+        keptSet = set(kept)
+        inOrder = kept == [iid for iid in wanted if iid in keptSet]
+        addCount("Treeview rows inserted", len(wanted) - len(kept))
+
+        for position, iid in enumerate(wanted):
+            if iid in keptSet:
+                if not inOrder:
+                    self.taskList.move(iid, "", position)
+                if updateValues:
+                    self.taskList.item(iid, **self.rowOptions(int(iid)))
             else:
-                tag = "low"
-            
-            self.taskList.insert("", tk.END, values=(
-                task["title"] + alert,
-                task["priority"],
-                task["dueDate"],
-                "✔" if task["completed"] else "✘"
-            ), tags=(tag,))
-
-        self.taskList.tag_configure("high", foreground="red")
-        self.taskList.tag_configure("medium", foreground="orange")
-        self.taskList.tag_configure("low", foreground="green")
-
+                self.taskList.insert("", position, iid=iid, **self.rowOptions(int(iid)))
+
+    def renderWindow(self):
+        """Virtual mode: materialize only the rows in the visible window."""
+        height = int(self.taskList.cget("height"))
+        total = len(self.viewOrder)
+        self.firstRow = max(0, min(self.firstRow, total - height))
+        self.syncRows(self.viewSeqs(self.firstRow, self.firstRow + height), updateValues=True)
+        if total:
+            self.scrollbar.set(self.firstRow / total, min(total, self.firstRow + height) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scrollWindow(self, action, amount, unit=None):
+        """Scrollbar command for virtual mode."""
+        if action == "moveto":
+            self.firstRow = int(float(amount) * len(self.viewOrder))
+        elif action == "scroll":
+            step = int(self.taskList.cget("height")) if unit == "pages" else 1
+            self.firstRow += int(amount) * step
+        self.renderWindow()
+
+    def onMouseWheel(self, event):
+        """Scroll the virtual window with the mouse wheel."""
+        if event.num == 4 or event.delta > 0:
+            self.scrollWindow("scroll", -3)
+        else:
+            self.scrollWindow("scroll", 3)
+        return "break"
+
+    def onSearchTyped(self, event=None):
+        """Filter the list once typing in the search box or filter bar pauses."""
+        if self.pendingSearch is not None:
+            self.root.after_cancel(self.pendingSearch)
+        self.pendingSearch = self.root.after(SEARCH_DELAY_MS, self.applySearch)
+
+    @profiled
+    def applySearch(self):
+        """Show only the tasks matching the search box and the filter bar."""
+        self.pendingSearch = None
+        query = self.searchVar.get().strip()
+        filters = self.readFilters()
+        if query != self.searchQuery or filters != self.filters:
+            self.searchQuery = query
+            self.filters = filters
+            self.firstRow = 0
+            self.refreshTaskList(self.sortBy)
+
+    def readFilters(self):
+        """Return the filter bar settings as buildQuery options, or None if no filter is set.
+
+        Numbers that are still being typed (not yet digits) count as unset.
+        """
+        priority = self.priorityVar.get()
+        dueWithin = self.dueWithinVar.get().strip()
+        limit = self.limitVar.get().strip()
+        filters = {
+            "pending": self.hideCompletedVar.get(),
+            "priority": None if priority == "any" else priority,
+            "dueWithinDays": int(dueWithin) if dueWithin.isdigit() else None,
+            "limit": int(limit) if limit.isdigit() else None,
+        }
+        if not any(value not in (None, False) for value in filters.values()):
+            return None
+        return filters
+
+    def pollChanges(self):
+        """Show changes saved by other processes and finish autosaves, then look again later."""
+        self.showChanges([])
+        if self.autoSaver is not None and self.autoSaver.poll() is not None:
+            self.statusLabel.config(text=f"All changes saved at {time.strftime('%H:%M:%S')}")
+        self.root.after(SYNC_INTERVAL_MS, self.pollChanges)
+
+    @profiled
+    def pollLoad(self):
+        """Show the tasks loaded in the background since the last call, then look again later."""
+        added = False
+        deadline = time.monotonic() + LOAD_TICK_MS / 1000
+        while time.monotonic() < deadline:
+            message = self.loader.poll()
+            if message is None:
+                break
+            kind, value = message
+            if kind == "batch":
+                for seq in self.tasks.extend(value):
+                    self.alerts.taskChanged(seq)
+                added = True
+            elif kind == "loaded":
+                self.listLoaded(value)
+                return
+            else:
+                self.loader = None
+                messagebox.showerror("Error", f"Could not load the tasks: {value}")
+                self.root.destroy()
+                return
+        if added:
+            if not self.virtual and len(self.tasks) > VIRTUAL_THRESHOLD:
+                self.taskList.delete(*self.taskList.get_children())
+                self.setVirtual(True)
+            # Only the rows of the new tasks are inserted; the others stay where they are
+            self.refreshTaskList(self.sortBy)
+            self.statusLabel.config(text=f"Loading tasks... {len(self.tasks)} loaded")
+        self.root.after(LOAD_POLL_MS, self.pollLoad)
+
+    def listLoaded(self, workspace):
+        """Replace the tasks shown while loading with the loaded list and allow changes."""
+        self.loader = None
+        # The loaded list numbers its tasks in the same order, so the rows shown so far are kept
+        self.tasks, self.archive = workspace.tasks, workspace.archive
+        self.alerts = AlertEngine(self.tasks)
+        self.autoSaver = startAutoSave()
+        if not self.virtual and len(self.tasks) > VIRTUAL_THRESHOLD:
+            self.taskList.delete(*self.taskList.get_children())
+            self.setVirtual(True)
+        self.setViewOrder(viewOrder(self.tasks, self.sortBy, self.searchQuery, self.filters))
+        if self.virtual:
+            self.renderWindow()
+        else:
+            self.syncRows(self.viewSeqs(), updateValues=True)  # The journal may have changed some of them
+        self.progressBar.destroy()
+        for widget in self.loadedOnly:
+            widget.configure(state="normal")
+        self.statusLabel.config(text=f"Loaded {len(self.tasks)} tasks")
+        self.root.after(SYNC_INTERVAL_MS, self.pollChanges)
+
+    def showChanges(self, changes):
+        """Update the rows for (action, seq) changes made here plus those other processes saved."""
+        if changes and self.autoSaver is not None:
+            self.autoSaver.changed()
+        changes = changes + syncTasks()
+        if len(changes) == 1:
+            action, seq = changes[0]
+            if action == "add":
+                self.rowAdded(seq)
+            elif action == "edit":
+                self.rowUpdated(seq)
+            else:
+                self.rowDeleted(seq)
+        elif changes:
+            # Row positions are only exact one change at a time; re-sync the view for a batch
+            edited = set()
+            for action, seq in changes:
+                if self.tasks.hasSeq(seq):
+                    self.alerts.taskChanged(seq)
+                    edited.add(seq)
+                else:
+                    self.alerts.taskRemoved(seq)
+            self.refreshTaskList(self.sortBy)
+            for seq in edited:
+                if self.taskList.exists(str(seq)):
+                    self.taskList.item(str(seq), **self.rowOptions(seq))
+
+    def scheduleAlertCheck(self):
+        """Arrange for checkAlerts to run when the next task starts alerting (e.g. at midnight)."""
+        seconds = self.alerts.secondsUntilNextChange()
+        delay = ALERT_RECHECK_MS if seconds is None else min(ALERT_RECHECK_MS, int(seconds * 1000) + 1)
+        self.root.after(delay, self.checkAlerts)
+
+    def checkAlerts(self):
+        """Redraw only the rows whose alert switched on since the last check."""
+        for seq in self.alerts.advance():
+            if self.taskList.exists(str(seq)):
+                self.taskList.item(str(seq), **self.rowOptions(seq))
+        self.scheduleAlertCheck()
+
+    def rowAdded(self, seq):
+        """Show a newly added task."""
+        if not self.tasks.hasSeq(seq):
+            return  # Already deleted again by another process
+        self.alerts.taskChanged(seq)
+        if self.searchQuery or self.filters:
+            self.refreshTaskList(self.sortBy)  # The new task may or may not match the search or filters
+            return
+        position = self.listRow(seq)
+        if self.virtual:
+            self.renderWindow()
+        else:
+            self.taskList.insert("", position, iid=str(seq), **self.rowOptions(seq))
+            addCount("Treeview rows inserted")
+
+    def rowUpdated(self, seq):
+        """Redraw an edited task, moving it if its place in the sort order changed."""
+        if not self.tasks.hasSeq(seq):
+            return  # Deleted by another process; its rowDeleted follows
+        self.alerts.taskChanged(seq)
+        if self.searchQuery or self.filters:
+            self.refreshTaskList(self.sortBy)  # The edit may have changed whether the task matches
+            return
+        self.unlistRow(seq)
+        position = self.listRow(seq)
+        if self.virtual:
+            self.renderWindow()
+        else:
+            self.taskList.item(str(seq), **self.rowOptions(seq))
+            self.taskList.move(str(seq), "", position)
+
+    def listRow(self, seq):
+        """Add a task to viewOrder at the place of its sort key (binary search); returns its row."""
+        key = self.viewKeys[seq] = self.tasks.sortKey(seq, self.sortBy)
+        position = bisect_left(self.viewOrder, key)
+        self.viewOrder.insert(position, key)
+        return position
+
+    def unlistRow(self, seq):
+        """Remove a task from viewOrder, found by binary search for the key it was listed under."""
+        del self.viewOrder[bisect_left(self.viewOrder, self.viewKeys.pop(seq))]
+
+    def rowDeleted(self, seq):
+        """Remove a deleted task's row."""
+        self.alerts.taskRemoved(seq)
+        if seq not in self.viewKeys:
+            return  # Hidden by the search box or filters
+        if self.filters and self.filters["limit"] is not None:
+            self.refreshTaskList(self.sortBy)  # The next task moves up into the first N
+            return
+        self.unlistRow(seq)
+        if self.virtual:
+            self.renderWindow()
+        else:
+            self.taskList.delete(str(seq))
+            addCount("Treeview rows deleted")
+
+    @profiled
     def openAddTaskWindow(self):
         """Open a window to add a new task."""
         self.taskWindow = tk.Toplevel(self.root)
         self.taskWindow.title("Add Task")
-        self.taskWindow.geometry("400x350")
+        self.taskWindow.geometry("400x420")
 
         formFrame = ttk.Frame(self.taskWindow, padding="20")
         formFrame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
@@ -123,34 +513,72 @@ class TaskManagerGUI:
         self.dueDateEntry = ttk.Entry(formFrame, width=30)
         self.dueDateEntry.grid(row=4, column=1, padx=5, pady=5)
 
-        ttk.Button(formFrame, text="Add", command=self.addTask).grid(row=5, column=0, columnspan=2, pady=20)
-
+        self.addRepeatFields(formFrame, 5)
+
+        ttk.Button(formFrame, text="Add", command=self.addTask).grid(row=7, column=0, columnspan=2, pady=20)
+
+    def addRepeatFields(self, formFrame, row, repeat=None):
+        """Add the Repeat and Until fields of the task windows at row and row + 1."""
+        ttk.Label(formFrame, text="Repeat:").grid(row=row, column=0, padx=5, pady=5, sticky=tk.W)
+        self.repeatCombo = ttk.Combobox(formFrame, values=["none", "daily", "weekly", "monthly", "every 2 weeks"], width=27)
+        self.repeatCombo.set(str(Recurrence(repeat.unit, repeat.every, repeat.anchor)) if repeat is not None else "none")
+        self.repeatCombo.grid(row=row, column=1, padx=5, pady=5)
+
+        ttk.Label(formFrame, text="Until (DD-MM-YYYY):").grid(row=row + 1, column=0, padx=5, pady=5, sticky=tk.W)
+        self.untilEntry = ttk.Entry(formFrame, width=30)
+        if repeat is not None and repeat.until is not None:
+            self.untilEntry.insert(0, formatDate(repeat.until))
+        self.untilEntry.grid(row=row + 1, column=1, padx=5, pady=5)
+
+    def readRepeat(self, anchor, current=None):
+        """Return the repeat rule entered in the task window, or False after showing an error.
+
+        A rule left as it was keeps its original anchor date.
+        """
+        until = self.untilEntry.get().strip()
+        if until and not validateDate(until):
+            messagebox.showerror("Error", "Invalid repeat end date. Please use DD-MM-YYYY (e.g., 25-02-2025).")
+            return False
+        try:
+            repeat = Recurrence.fromText(self.repeatCombo.get(), anchor, parseDate(until) if until else None)
+        except ValueError as error:
+            messagebox.showerror("Error", str(error))
+            return False
+        if repeat is not None and current is not None and (repeat.unit, repeat.every) == (current.unit, current.every):
+            repeat.anchor = current.anchor
+        return repeat
+
+    @profiled
     def addTask(self):
         """Add a new task from the GUI."""
         title = self.titleEntry.get()
         description = self.descEntry.get()
-        priority = self.priorityCombo.get().lower()
+        priority = Priority.parse(self.priorityCombo.get())
         dueDate = self.dueDateEntry.get()
 
         if not title:
             messagebox.showerror("Error", "Title cannot be empty.")
             return
+        if priority is None:
+            messagebox.showerror("Error", "Invalid priority. Please choose high, medium or low.")
+            return
         if not validateDate(dueDate):
             messagebox.showerror("Error", "Invalid date format or value. Please use DD-MM-YYYY (e.g., 25-02-2025).")
             return
 
-        task = {
-            "title": title,
-            "description": description,
-            "priority": priority,
-            "dueDate": dueDate,
-            "completed": False
-        }
+        repeat = self.readRepeat(parseDate(dueDate))
+        if repeat is False:
+            return
+
+        task = Task(title, description, priority, parseDate(dueDate), repeat=repeat)
         self.tasks.append(task)
-        self.refreshTaskList()
+        seq = self.tasks.seqAt(-1)
+        recordChange("add", task=task)
+        self.showChanges([("add", seq)])
         self.taskWindow.destroy()
         messagebox.showinfo("Success", "Task added successfully!")
 
+    @profiled
     def openEditTaskWindow(self):
         """Open a window to edit the selected task."""
         selected = self.taskList.selection()
@@ -158,12 +586,12 @@ class TaskManagerGUI:
             messagebox.showerror("Error", "Please select a task to edit.")
             return
 
-        selectedIndex = self.taskList.index(selected[0])
-        task = self.tasks[selectedIndex]
+        seq = int(selected[0])  # Row ids are the tasks' sequence numbers, whatever the sort order
+        task = self.tasks.get(seq)
 
         self.editWindow = tk.Toplevel(self.root)
         self.editWindow.title("Edit Task")
-        self.editWindow.geometry("400x350")
+        self.editWindow.geometry("400x460")
 
         formFrame = ttk.Frame(self.editWindow, padding="20")
         formFrame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
@@ -171,56 +599,66 @@ class TaskManagerGUI:
         ttk.Label(formFrame, text="Edit Task", font=("Helvetica", 14, "bold")).grid(row=0, column=0, columnspan=2, pady=(0, 10))
         ttk.Label(formFrame, text="Title:").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
         self.titleEntry = ttk.Entry(formFrame, width=30)
-        self.titleEntry.insert(0, task["title"])
+        self.titleEntry.insert(0, task.title)
         self.titleEntry.grid(row=1, column=1, padx=5, pady=5)
 
         ttk.Label(formFrame, text="Description:").grid(row=2, column=0, padx=5, pady=5, sticky=tk.W)
         self.descEntry = ttk.Entry(formFrame, width=30)
-        self.descEntry.insert(0, task["description"])
+        self.descEntry.insert(0, task.description)
         self.descEntry.grid(row=2, column=1, padx=5, pady=5)
 
         ttk.Label(formFrame, text="Priority:").grid(row=3, column=0, padx=5, pady=5, sticky=tk.W)
         self.priorityCombo = ttk.Combobox(formFrame, values=["high", "medium", "low"], width=27)
-        self.priorityCombo.set(task["priority"])
+        self.priorityCombo.set(str(task.priority))
         self.priorityCombo.grid(row=3, column=1, padx=5, pady=5)
 
         ttk.Label(formFrame, text="Due Date (DD-MM-YYYY):").grid(row=4, column=0, padx=5, pady=5, sticky=tk.W)
         self.dueDateEntry = ttk.Entry(formFrame, width=30)
-        self.dueDateEntry.insert(0, task["dueDate"])
+        self.dueDateEntry.insert(0, task.dueDate)
         self.dueDateEntry.grid(row=4, column=1, padx=5, pady=5)
 
         ttk.Label(formFrame, text="Completed:").grid(row=5, column=0, padx=5, pady=5, sticky=tk.W)
-        self.completedVar = tk.StringVar(value="yes" if task["completed"] else "no")
+        self.completedVar = tk.StringVar(value="yes" if task.completed else "no")
         ttk.Combobox(formFrame, textvariable=self.completedVar, values=["yes", "no"], width=27).grid(row=5, column=1, padx=5, pady=5)
 
-        ttk.Button(formFrame, text="Update", command=lambda: self.updateTask(selectedIndex)).grid(row=6, column=0, columnspan=2, pady=20)
+        self.addRepeatFields(formFrame, 6, task.repeat)
+
+        ttk.Button(formFrame, text="Update", command=lambda: self.updateTask(seq)).grid(row=8, column=0, columnspan=2, pady=20)
 
-    def updateTask(self, taskIndex):
+    @profiled
+    def updateTask(self, seq):
         """Update the selected task."""
         title = self.titleEntry.get()
         description = self.descEntry.get()
-        priority = self.priorityCombo.get().lower()
+        priority = Priority.parse(self.priorityCombo.get())
         dueDate = self.dueDateEntry.get()
         completed = self.completedVar.get() == "yes"
 
         if not title:
             messagebox.showerror("Error", "Title cannot be empty.")
             return
+        if priority is None:
+            messagebox.showerror("Error", "Invalid priority. Please choose high, medium or low.")
+            return
         if not validateDate(dueDate):
             messagebox.showerror("Error", "Invalid date format or value. Please use DD-MM-YYYY (e.g., 25-02-2025).")
             return
 
-        self.tasks[taskIndex] = {
-            "title": title,
-            "description": description,
-            "priority": priority,
-            "dueDate": dueDate,
-            "completed": completed
-        }
-        self.refreshTaskList()
+        task = self.tasks.get(seq)
+        repeat = self.readRepeat(parseDate(dueDate), task.repeat)
+        if repeat is False:
+            return
+
+        # Completing a recurring task finishes this occurrence and moves it on to the next;
+        # completing any other task records the day, which decides when it is archived
+        edited = finishOccurrence(Task(title, description, priority, parseDate(dueDate), completed, task.extra, repeat=repeat))
+        self.tasks.replaceSeq(seq, stampCompletion(edited, task))
+        recordChange("edit", task=self.tasks.get(seq))
+        self.showChanges([("edit", seq)])
         self.editWindow.destroy()
         messagebox.showinfo("Success", "Task updated successfully!")
 
+    @profiled
     def deleteTask(self):
         """Delete the selected task."""
         selected = self.taskList.selection()
@@ -228,22 +666,154 @@ class TaskManagerGUI:
             messagebox.showerror("Error", "Please select a task to delete.")
             return
 
-        selectedIndex = self.taskList.index(selected[0])
-        deletedTask = self.tasks.pop(selectedIndex)
-        self.refreshTaskList()
-        messagebox.showinfo("Success", f"Task '{deletedTask['title']}' deleted successfully!")
+        seq = int(selected[0])
+        deletedTask = self.tasks.removeSeq(seq)
+        recordChange("delete", task=deletedTask)
+        self.showChanges([("delete", seq)])
+        messagebox.showinfo("Success", f"Task '{deletedTask.title}' deleted successfully!")
+
+    @profiled
+    def openHistoryWindow(self):
+        """Open a window listing the archived tasks, with a search box and a Restore button."""
+        self.historyWindow = tk.Toplevel(self.root)
+        self.historyWindow.title("History")
+        self.historyWindow.geometry("700x450")
+
+        frame = ttk.Frame(self.historyWindow, padding="20")
+        frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        ttk.Label(frame, text="Search:").grid(row=0, column=0, padx=(0, 5), sticky=tk.W)
+        self.historySearchVar = tk.StringVar()
+        searchEntry = ttk.Entry(frame, textvariable=self.historySearchVar, width=40)
+        searchEntry.grid(row=0, column=1, sticky=tk.W)
+        searchEntry.bind("<Return>", lambda event: self.showHistory())
+        ttk.Button(frame, text="Search", command=self.showHistory).grid(row=0, column=2, padx=5)
+
+        self.historyList = ttk.Treeview(frame, columns=("Title", "Priority", "Due Date", "Completed"), show="headings", height=12)
+        for column, width in (("Title", 300), ("Priority", 100), ("Due Date", 120), ("Completed", 100)):
+            self.historyList.heading(column, text=column)
+            self.historyList.column(column, width=width)
+        self.historyList.grid(row=1, column=0, columnspan=3, pady=10)
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.historyList.yview)
+        self.historyList.configure(yscroll=scrollbar.set)
+        scrollbar.grid(row=1, column=3, sticky=(tk.N, tk.S))
+
+        ttk.Button(frame, text="Restore", command=self.restoreTask).grid(row=2, column=0, columnspan=3)
+        self.showHistory()
+
+    def showHistory(self):
+        """List the archived tasks, or only those matching the history search box."""
+        query = self.historySearchVar.get().strip()
+        self.historyTasks = self.archive.tasks()
+        numbered = self.archive.search(query) if query else enumerate(self.historyTasks, 1)
+        self.historyList.delete(*self.historyList.get_children())
+        for number, task in numbered:
+            # Row ids are numbers in historyTasks, so a restore finds the task whatever is shown
+            self.historyList.insert("", tk.END, iid=str(number), **rowOptions(task, False))
+
+    @profiled
+    def restoreTask(self):
+        """Move the selected archived task back into the task list."""
+        selected = self.historyList.selection()
+        if not selected:
+            messagebox.showerror("Error", "Please select a task to restore.", parent=self.historyWindow)
+            return
 
+        task = self.historyTasks[int(selected[0]) - 1]
+        seq = self.archive.restore(self.tasks, task)
+        if seq is None:
+            messagebox.showerror("Error", "That task is no longer in the archive.", parent=self.historyWindow)
+        else:
+            self.showChanges([("add", seq)])
+            messagebox.showinfo("Success", f"Task '{task.title}' restored.", parent=self.historyWindow)
+        self.showHistory()
+
+    @profiled
+    def switchList(self, event=None, name=None):
+        """Show another task list (the one chosen in the list selector by default), loading it if needed."""
+        name = (name or self.listVar.get()).strip()
+        if not name or name == self.workspaces.active.name:
+            return
+        try:
+            self.workspaces.filePath(name)
+        except WorkspaceError as error:
+            messagebox.showerror("Error", str(error))
+            self.listVar.set(self.workspaces.active.name)
+            return
+        if self.autoSaver is not None:
+            self.autoSaver.close()  # It snapshots the active list's journal, which is about to change
+        workspace = self.workspaces.switch(name)
+        self.tasks, self.archive = workspace.tasks, workspace.archive
+        self.alerts = AlertEngine(self.tasks)
+        self.autoSaver = startAutoSave()
+        self.listVar.set(name)
+        # Row ids are sequence numbers, which only mean something within one list
+        self.taskList.delete(*self.taskList.get_children())
+        self.setVirtual(len(self.tasks) > VIRTUAL_THRESHOLD)
+        self.firstRow = 0
+        self.refreshTaskList(self.sortBy)
+
+    @profiled
+    def openDueTodayWindow(self):
+        """Open a window listing the tasks due today in every task list."""
+        self.dueTodayWindow = tk.Toplevel(self.root)
+        self.dueTodayWindow.title("Due Today (All Lists)")
+        self.dueTodayWindow.geometry("750x400")
+
+        frame = ttk.Frame(self.dueTodayWindow, padding="20")
+        frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        columns = ("List", "Title", "Priority", "Due Date", "Completed")
+        self.dueList = ttk.Treeview(frame, columns=columns, show="headings", height=12)
+        for column, width in zip(columns, (100, 280, 90, 110, 90)):
+            self.dueList.heading(column, text=column)
+            self.dueList.column(column, width=width)
+        self.dueList.grid(row=0, column=0, pady=(0, 10))
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.dueList.yview)
+        self.dueList.configure(yscroll=scrollbar.set)
+        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+
+        for name, numbered in self.workspaces.dueToday():
+            for number, task in numbered:
+                options = rowOptions(task, False)
+                options["values"] = (name,) + options["values"]
+                # Row ids are "list:number", so Open List knows which list to switch to
+                self.dueList.insert("", tk.END, iid=f"{name}:{number}", **options)
+
+        ttk.Button(frame, text="Open List", command=self.openDueList).grid(row=1, column=0)
+
+    def openDueList(self):
+        """Switch to the list of the task selected in the due-today window."""
+        selected = self.dueList.selection()
+        if not selected:
+            messagebox.showerror("Error", "Please select a task.", parent=self.dueTodayWindow)
+            return
+        self.switchList(name=selected[0].rsplit(":", 1)[0])
+        self.dueTodayWindow.destroy()
+
+    @profiled
     def sortTasks(self, sortBy):
         """Sort tasks and refresh the display."""
         self.refreshTaskList(sortBy=sortBy)
 
+    @profiled
     def exit(self):
         """Save tasks and exit the application."""
-        saveTasks(self.tasks)
+        if self.loader is not None:
+            self.root.destroy()  # Nothing was changed yet; runGUI waits for the load to finish
+            return
+        if self.store is not None:
+            self.store.saveTasks(self.tasks)
+        else:
+            if self.autoSaver is not None:
+                self.autoSaver.close()
+            saveTasks(self.tasks)
         self.root.destroy()
 
-def runGUI(tasks):
-    """Run the GUI application."""
+def runGUI(tasks, store=None, archive=None, workspaces=None, listName=None):
+    """Run the GUI application; with tasks None, list listName of workspaces is loaded once the window shows."""
     root = tk.Tk()
-    app = TaskManagerGUI(root, tasks)
-    root.mainloop()
\ No newline at end of file
+    app = TaskManagerGUI(root, tasks, store, archive=archive, workspaces=workspaces, listName=listName)
+    root.mainloop()
+    if app.loader is not None:
+        app.loader.wait()  # Closed while loading; the caller closes the list once it is loaded
\ No newline at end of file
@@ -3,52 +3,197 @@
 Main entry point for the Task Manager application.
 Allows the user to choose between a console interface and a graphical interface (GUI)
 to manage tasks, including adding, editing, deleting, and sorting tasks.
+Commands given on the command line (see cli.py) run without any menu, and
+'serve' runs the HTTP/JSON API (see apiServer.py). Tasks completed long ago
+are moved to the archive at startup, or after commands that may change the
+list (see taskArchive.py). --list
+picks one of several named task lists, which are loaded only when used (see
+workspaces.py).
 """
-import os
-from fileOperations import loadTasks, saveTasks
-from taskOperations import addTask, editTask, deleteTask
-from displayUtils import showTasks
-from gui import runGUI
+import argparse
+import sys
+import profiling
+
+parser = argparse.ArgumentParser(
+    description="Task Manager",
+    epilog="commands: add TITLE --due DD-MM-YYYY [--priority P] [--description D], list [--sort KEY] [--offset N] [--limit N], "
+           "today, sort KEY, search WORD..., query [--sort KEY[:desc],...] [--pending] [--priority P] [--due-within DAYS] [--limit N], edit NUMBER [--title ...] [--completed yes|no], delete NUMBER, import PATH, export PATH (CSV, NDJSON or JSON), "
+           "export PATH --since N (changes after version N), apply PATH, version, "
+           "archive [--days N], history [WORD...], restore NUMBER, lists, today --all (due today in every list). "
+           "Separate several commands with ';', or use 'batch [PATH]' to read one per line from a file "
+           "or stdin. 'serve [--host H] [--port P]' runs the HTTP/JSON API. Without a command the interactive menu starts.")
+parser.add_argument("--storage", choices=["json", "sqlite"], default="json",
+                    help="storage engine: JSON file with change journal (default) or SQLite database")
+parser.add_argument("--file", default="tasks.json",
+                    help="task file for JSON storage; .ndjson/.jsonl files hold one task per line, "
+                         ".bin files use the memory-mapped binary format")
+parser.add_argument("--list", default="default", metavar="NAME",
+                    help="task list to use; lists other than 'default' are kept in workspaces/NAME.json")
+parser.add_argument("--max-open-lists", type=int, default=4, metavar="N",
+                    help="task lists kept loaded at once when switching between them (default 4)")
+parser.add_argument("--archive-after", type=int, default=30, metavar="DAYS",
+                    help="archive tasks completed more than DAYS days ago (default 30)")
+parser.add_argument("--no-archive", action="store_true", help="do not archive completed tasks at startup")
+parser.add_argument("--profile", action="store_true",
+                    help="print call counts and times of the hot paths on exit (or set TASKMANAGER_PROFILE=1)")
+parser.add_argument("--profile-stats", metavar="PATH", help="also run cProfile and write its pstats data to PATH")
+parser.add_argument("command", nargs=argparse.REMAINDER, help="command to run without the menu")
+args = parser.parse_args()
+if args.profile or args.profile_stats:
+    profiling.enable(args.profile_stats)
+
+# Imported once profiling is set up, so @profiled can wrap their functions
+from fileOperations import saveTasks, setChangeLog, syncTasks, isStreamable, TaskStream
+from taskOperations import addTask, editTask, deleteTask, findTasks, queryTasks, browseArchive, switchList, showDueInAllLists
+from displayUtils import pageTasks, clearScreen
+from workspaces import WorkspaceManager, WorkspaceError, DEFAULT_WORKSPACE
 
 # Main program
-tasks = loadTasks()
+workspaces = None
+if args.storage == "json":
+    # Commands archive after they run (see below), so the numbers an earlier 'list' showed still hold
+    archiveAtLoad = not args.no_archive and args.command[:1] in ([], ["serve"])
+    workspaces = WorkspaceManager(args.file, args.max_open_lists, args.archive_after, archiveAtLoad)
+    try:
+        listFile = workspaces.filePath(args.list)
+    except WorkspaceError as error:
+        parser.error(str(error))
+elif args.list != DEFAULT_WORKSPACE:
+    parser.error("--list needs JSON storage")
+
+if args.command and args.storage == "json":
+    from binaryTasks import isBinary, openMapped
+    from cli import isReadOnly, runCommands
+    if isReadOnly(args.command) and isStreamable(listFile):
+        # Listing needs no load: a binary file is read through a memory map and an NDJSON file
+        # is streamed, building tasks only as they are shown
+        if isBinary(listFile):
+            with openMapped(listFile) as mappedTasks:
+                failures = runCommands(mappedTasks, args.command, workspaces=workspaces)
+        else:
+            failures = runCommands(TaskStream(listFile), args.command, workspaces=workspaces)
+        sys.exit(1 if failures else 0)
+
+store = None
+tasks = None
+archive = None
+if args.storage == "sqlite":
+    from sqliteStorage import openStore
+    store = openStore(jsonPath=args.file)
+    tasks = store.loadTasks()
+    setChangeLog(store)  # Write each change straight to the database
+    saveTasks = store.saveTasks
+
+def loadList():
+    """Load the --list task list, unless the GUI is going to load it in the background."""
+    global tasks, archive
+    # Loads the list with its search index, journals each change as it happens instead of rewriting
+    # the file, and moves old completed tasks to the archive to keep them out of the tasks loaded every time
+    workspace = workspaces.switch(args.list)
+    tasks, archive = workspace.tasks, workspace.archive
+
+if args.command and store is None:
+    loadList()
+
+def closeLists():
+    """Flush every loaded task list (journal, search index and summary) before exiting."""
+    if workspaces is not None:
+        workspaces.close()
+
+def showStoredTasks(filterToday=False, sortBy=None):
+    """Show tasks a page at a time, letting the SQLite store filter and sort when it is in use."""
+    if store is not None:
+        return pageTasks(store.view(tasks), filterToday, sortBy)
+    if tasks is None:
+        # Not loaded yet: stream the file rather than load it just to show it
+        return pageTasks(TaskStream(listFile), filterToday=filterToday, sortBy=sortBy)
+    return pageTasks(tasks, filterToday=filterToday, sortBy=sortBy)
+
+if args.command[:1] == ["serve"]:
+    from apiServer import runServer
+    runServer(tasks, args.command[1:], saveTasks)
+    saveTasks(tasks)
+    closeLists()
+    sys.exit(0)
+
+if args.command:
+    # Batch mode: no menu, no screen clearing and no Tk import
+    from cli import runCommands, changesTasks
+    failures = runCommands(tasks, args.command, archive, workspaces, store)
+    if archive is not None and not args.no_archive and changesTasks(args.command):
+        archive.moveCompleted(tasks)  # Commands that only read journal nothing
+    saveTasks(tasks)
+    closeLists()
+    sys.exit(1 if failures else 0)
 
 print("Welcome to Task Manager!")
-print("1. Use Console Interface\n2. Use Graphical Interface (GUI)")
+print("1. Use Console Interface\n2. Use Graphical Interface (GUI)\n3. Run HTTP/JSON API server")
 interfaceChoice = input("Choose an interface: ")
+# The console shows today's tasks of a streamable file without loading it; anything else loads the list first
+streamToday = tasks is None and interfaceChoice == "1" and isStreamable(listFile)
+if tasks is None and interfaceChoice != "2" and not streamToday:
+    loadList()
 
 if interfaceChoice == "1":
     # Console interface
     while True:
-        os.system('cls' if os.name == 'nt' else 'clear')
-        print("\n1. Add task\n2. Show all tasks\n3. Show today's tasks\n4. Edit task\n5. Delete task\n6. Sort and show tasks\n7. Exit")
+        syncTasks()  # Pick up changes other processes saved to the task file meanwhile
+        clearScreen()
+        if workspaces is not None:
+            print(f"List: {args.list if tasks is None else workspaces.active.name}")
+        print("\n1. Add task\n2. Show all tasks\n3. Show today's tasks\n4. Edit task\n5. Delete task\n6. Sort and show tasks\n7. Search tasks\n8. Archived tasks\n9. Switch list\n10. Due today in all lists\n11. Exit")
         choice = input("Choose an option: ")
+        if tasks is None and choice != "3":
+            loadList()
         if choice == "1":
             addTask(tasks)
         elif choice == "2":
-            showTasks(tasks)
+            showStoredTasks()
         elif choice == "3":
-            showTasks(tasks, filterToday=True)
+            showStoredTasks(filterToday=True)
         elif choice == "4":
             editTask(tasks)
         elif choice == "5":
             deleteTask(tasks)
         elif choice == "6":
-            print("\nSort by:\n1. Priority\n2. Due date\n3. No sorting")
+            print("\nSort by:\n1. Priority\n2. Due date\n3. No sorting\n4. Custom query (filters, several keys, limit)")
             sortChoice = input("Choose a sorting option: ")
             sortBy = None
             if sortChoice == "1":
                 sortBy = "priority"
             elif sortChoice == "2":
                 sortBy = "dueDate"
-            showTasks(tasks, sortBy=sortBy)
+            if sortChoice == "4":
+                queryTasks(tasks)
+            else:
+                showStoredTasks(sortBy=sortBy)
         elif choice == "7":
+            findTasks(tasks)
+        elif choice == "8":
+            browseArchive(tasks, archive)
+        elif choice == "9":
+            workspace = switchList(workspaces)
+            if workspace is not None:
+                tasks, archive = workspace.tasks, workspace.archive
+        elif choice == "10":
+            showDueInAllLists(workspaces)
+        elif choice == "11":
             saveTasks(tasks)
+            closeLists()
             break
         input("\nPress Enter to continue...")
 elif interfaceChoice == "2":
-    # Graphical interface
-    runGUI(tasks)
+    # Graphical interface; tkinter is only imported when it is needed
+    from gui import runGUI
+    # Without SQLite, tasks is still None: the window opens at once and loads the list on a worker thread
+    runGUI(tasks, store, archive, workspaces, args.list)
+    closeLists()
+elif interfaceChoice == "3":
+    from apiServer import runServer
+    runServer(tasks, (), saveTasks)
+    saveTasks(tasks)
+    closeLists()
 else:
     print("Invalid choice. Exiting...")
-    saveTasks(tasks)
\ No newline at end of file
+    saveTasks(tasks)
+    closeLists()
\ No newline at end of file
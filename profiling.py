@@ -0,0 +1,83 @@
+# profiling.py
+"""
+Opt-in instrumentation for the Task Manager application.
+Enabled with main.py --profile or the TASKMANAGER_PROFILE environment
+variable. It records call counts and cumulative time for the functions
+marked with @profiled, plus counters such as date parses, bytes written and
+Treeview rows inserted or deleted, and prints a summary table on exit.
+--profile-stats PATH (or TASKMANAGER_PROFILE_STATS) also runs cProfile and
+dumps its pstats data to PATH.
+
+@profiled decides when a module is imported: with profiling off it returns
+the function unchanged, so enable() must run before the instrumented
+modules are imported. Counters cost one flag check when off.
+"""
+import atexit
+import os
+import sys
+import time
+from functools import wraps
+
+PROFILE_VARIABLE = "TASKMANAGER_PROFILE"
+STATS_VARIABLE = "TASKMANAGER_PROFILE_STATS"
+
+enabled = bool(os.environ.get(PROFILE_VARIABLE) or os.environ.get(STATS_VARIABLE))
+timings = {}  # Function name -> [calls, total seconds]
+counters = {}  # Counter name -> total
+profiler = None  # cProfile.Profile when pstats output was requested
+statsPath = None
+
+def enable(pstatsPath=None):
+    """Turn instrumentation on and print the summary at exit; also run cProfile if pstatsPath is given."""
+    global enabled, profiler, statsPath
+    enabled = True
+    statsPath = pstatsPath or statsPath or os.environ.get(STATS_VARIABLE)
+    if statsPath and profiler is None:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    atexit.unregister(report)
+    atexit.register(report)
+
+def profiled(function):
+    """Decorator recording calls and cumulative time of function; a no-op unless profiling is enabled."""
+    if not enabled:
+        return function
+    name = f"{function.__module__}.{function.__qualname__}"
+    timing = timings.setdefault(name, [0, 0.0])
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            timing[0] += 1
+            timing[1] += time.perf_counter() - start
+    return wrapper
+
+def addCount(name, amount=1):
+    """Add amount to a counter; does nothing unless profiling is enabled."""
+    if enabled:
+        counters[name] = counters.get(name, 0) + amount
+
+def report(file=None):
+    """Print the summary table, and dump the cProfile data if it was requested."""
+    file = file or sys.stderr
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(statsPath)
+    print("\nProfile summary", file=file)
+    print(f"{'function':<44} {'calls':>12} {'total ms':>11} {'mean ms':>9}", file=file)
+    for name, (calls, seconds) in sorted(timings.items(), key=lambda item: -item[1][1]):
+        if calls:
+            print(f"{name:<44} {calls:>12} {seconds * 1000:>11.2f} {seconds * 1000 / calls:>9.3f}", file=file)
+    if counters:
+        print(f"{'counter':<44} {'total':>12}", file=file)
+        for name, total in sorted(counters.items()):
+            print(f"{name:<44} {total:>12}", file=file)
+    if profiler is not None:
+        print(f"cProfile data written to {statsPath} (view with: python -m pstats {statsPath})", file=file)
+
+if enabled:
+    enable()
@@ -0,0 +1,194 @@
+# searchIndex.py
+"""
+Full-text search for the Task Manager application.
+An inverted index maps every word of a task's title and description to the
+tasks that contain it. Query words match as prefixes ("rep" finds "report")
+and all of them must match. The index is attached to a TaskCollection, which
+keeps it current on every add, edit and delete, and is saved next to the task
+file (tasks.json.index) so it does not have to be rebuilt at startup.
+"""
+import json
+import os
+import re
+from array import array
+from bisect import bisect_left
+from fileOperations import fileStamp
+
+TOKEN_PATTERN = re.compile(r"\w+")
+FILTER_RATIO = 16  # Check candidates directly once the next word has this many times more matches
+TERMS_END = "\U0010ffff"  # Sorts after any character a term can continue with
+
+def indexPath(filePath):
+    """Return the path of the search index that belongs to a task file."""
+    return filePath + ".index"
+
+def tokenize(text):
+    """Return the lowercase words of text."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+def taskTerms(task):
+    """Return the distinct words of a task's title and description."""
+    return set(tokenize(task.title + " " + task.description))
+
+def matchesAll(task, prefixes):
+    """Return True if every prefix starts some word of the task."""
+    terms = taskTerms(task)
+    return all(any(term.startswith(prefix) for term in terms) for prefix in prefixes)
+
+class SearchIndex:
+    """Inverted index from words to task sequence numbers."""
+
+    def __init__(self):
+        self.postings = {}  # Word -> sequence numbers (a set once changed, an array just after loading)
+        self.terms = []  # Sorted words, for prefix lookups; rebuilt when termsDirty
+        self.termsDirty = False
+        self.stamp = None  # fileStamp of the task file this index was last loaded from or saved with
+
+    def __len__(self):
+        return len(self.postings)
+
+    def posting(self, term):
+        """Return the set of sequence numbers for term, creating it if needed."""
+        posting = self.postings.get(term)
+        if posting is None:
+            posting = self.postings[term] = set()
+            self.termsDirty = True
+        elif not isinstance(posting, set):
+            posting = self.postings[term] = set(posting)
+        return posting
+
+    def add(self, seq, task):
+        """Index the words of a task."""
+        for term in taskTerms(task):
+            self.posting(term).add(seq)
+
+    def addMany(self, items):
+        """Index several (seq, task) pairs."""
+        postings = self.postings
+        for seq, task in items:
+            for term in TOKEN_PATTERN.findall((task.title + " " + task.description).lower()):
+                posting = postings.get(term)
+                if posting.__class__ is set:
+                    posting.add(seq)  # Fast path for words that are already indexed and changeable
+                else:
+                    self.posting(term).add(seq)
+
+    def remove(self, seq, task):
+        """Drop a task from the index; task must be the version that was indexed."""
+        for term in taskTerms(task):
+            posting = self.posting(term)
+            posting.discard(seq)
+            if not posting:
+                del self.postings[term]
+                self.termsDirty = True
+
+    def matching(self, prefix):
+        """Return the postings of every word that starts with prefix."""
+        if self.termsDirty:
+            self.terms = sorted(self.postings)
+            self.termsDirty = False
+        start = bisect_left(self.terms, prefix)
+        end = bisect_left(self.terms, prefix + TERMS_END, start)
+        return [self.postings[term] for term in self.terms[start:end]]
+
+    def search(self, query, tasks=None):
+        """Return the sequence numbers of tasks matching every word of query, in list order.
+
+        Given the TaskCollection, once few candidates are left the remaining
+        words are checked against those tasks instead of merging large postings.
+        """
+        words = set(tokenize(query))
+        if not words:
+            return []
+        candidates = []
+        for word in words:
+            postings = self.matching(word)
+            candidates.append((sum(len(posting) for posting in postings), word, postings))
+        # Start from the word with the fewest matches so the intersections stay small
+        candidates.sort(key=lambda candidate: candidate[0])
+        result = None
+        for position, (size, word, postings) in enumerate(candidates):
+            if result is not None and tasks is not None and len(result) * FILTER_RATIO < size:
+                remaining = [candidate[1] for candidate in candidates[position:]]
+                result = {seq for seq in result if matchesAll(tasks.get(seq), remaining)}
+                break
+            matches = set().union(*postings)
+            result = matches if result is None else result & matches
+            if not result:
+                return []
+        return sorted(result)
+
+    def save(self, tasks, filePath='tasks.json'):
+        """Write the index next to filePath, unless it is already saved for the file's current contents."""
+        stamp = fileStamp(filePath)
+        if stamp is None or stamp == self.stamp:
+            return
+        order = tasks.order
+        if order and order[-1] != len(order) - 1:
+            # Tasks were deleted this session: store list positions, which become the next sequence numbers
+            positionOf = {seq: index for index, seq in enumerate(order)}
+            postings = {term: [positionOf[seq] for seq in posting] for term, posting in self.postings.items()}
+        else:
+            postings = self.postings
+        terms = list(postings)
+        header = {"stamp": stamp, "tasks": len(tasks), "terms": terms,
+                  "counts": [len(postings[term]) for term in terms]}
+        positions = array('I')
+        for term in terms:
+            positions.extend(postings[term])
+        tempPath = indexPath(filePath) + ".tmp"
+        with open(tempPath, 'wb') as file:
+            file.write(json.dumps(header).encode("utf-8") + b"\n")
+            positions.tofile(file)
+        os.replace(tempPath, indexPath(filePath))
+        self.stamp = stamp
+
+def buildIndex(tasks):
+    """Build an index of every task in a TaskCollection."""
+    index = SearchIndex()
+    index.addMany((seq, tasks.get(seq)) for seq in tasks.sortedSeqs())
+    return index
+
+def loadIndex(tasks, filePath='tasks.json'):
+    """Attach the saved index of filePath to tasks, if it matches what was just loaded.
+
+    Must be called before tasks is changed. Returns the index, or None when
+    there is no usable saved index (one is then built on the first search).
+    """
+    stamp = fileStamp(filePath)
+    if stamp is None:
+        return None
+    try:
+        file = open(indexPath(filePath), 'rb')
+    except FileNotFoundError:
+        return None
+    with file:
+        try:
+            header = json.loads(file.readline())
+        except ValueError:
+            return None
+        if header.get("stamp") != stamp or header.get("tasks") != len(tasks):
+            return None
+        positions = array('I')
+        positions.frombytes(file.read())
+    counts = header["counts"]
+    if len(positions) != sum(counts):
+        return None  # Torn write
+    index = SearchIndex()
+    order = list(tasks.order)  # Indexed once per posting entry below
+    identity = not order or order[-1] == len(order) - 1
+    offset = 0
+    for term, count in zip(header["terms"], counts):
+        posting = positions[offset:offset + count]
+        index.postings[term] = posting if identity else [order[position] for position in posting]
+        offset += count
+    index.termsDirty = True
+    index.stamp = stamp
+    tasks.attachIndex(index)
+    return index
+
+def searchTasks(tasks, query):
+    """Return the sequence numbers of the tasks matching query, building the index on first use."""
+    if tasks.textIndex is None:
+        tasks.attachIndex(buildIndex(tasks))
+    return tasks.textIndex.search(query, tasks)
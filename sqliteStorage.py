@@ -0,0 +1,222 @@
+# sqliteStorage.py
+"""
+SQLite storage engine for the Task Manager application.
+Keeps tasks in a table indexed by due date, priority and completion so that
+"today's tasks" and the sorted views are answered by indexed queries instead
+of full scans in Python. Changes are written as they happen, in the same
+add/edit/delete form that the JSON journal uses. A recurring task's rule is
+kept as JSON in the repeat column, the task's stable id in uid and its
+extra JSON keys in extra; these columns are added to databases created
+before them, and rows without a uid get the id they are loaded with.
+"""
+import json
+import os
+import sqlite3
+from datetime import datetime
+from fileOperations import loadTasks, lockPath
+from taskCollection import TaskCollection
+from taskModel import Task, Priority, Recurrence, formatDate
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    priorityLevel INTEGER NOT NULL,
+    dueDate TEXT NOT NULL,
+    dueOrdinal INTEGER NOT NULL,
+    completed INTEGER NOT NULL,
+    repeat TEXT,
+    uid TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idxTasksDue ON tasks (dueOrdinal);
+CREATE INDEX IF NOT EXISTS idxTasksPriority ON tasks (priorityLevel DESC);
+CREATE INDEX IF NOT EXISTS idxTasksCompleted ON tasks (completed);
+"""
+RECURRING_INDEX = "CREATE INDEX IF NOT EXISTS idxTasksRecurring ON tasks (dueOrdinal) WHERE repeat IS NOT NULL"
+
+ADDED_COLUMNS = ("repeat", "uid", "extra")  # Columns missing from databases created before them, all TEXT
+COLUMNS = "title, description, priorityLevel, dueOrdinal, completed, repeat, uid, extra"
+INSERT = ("INSERT INTO tasks (title, description, priority, priorityLevel, dueDate, dueOrdinal, completed, repeat, "
+          "uid, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+ORDER_BY = {
+    None: "id",
+    "priority": "priorityLevel DESC, id",
+    "dueDate": "dueOrdinal, id",
+}
+
+def taskRow(task):
+    """Convert a task into the column values stored in the table."""
+    return (
+        task.title,
+        task.description,
+        str(task.priority),
+        int(task.priority),
+        formatDate(task.due),
+        task.due,
+        int(task.completed),
+        json.dumps(task.repeat.toDict()) if task.repeat is not None else None,
+        task.id,
+        json.dumps(task.extra) if task.extra else None,
+    )
+
+def rowTask(row):
+    """Convert a selected row back into a task."""
+    title, description, priorityLevel, dueOrdinal, completed, repeat, uid, extra = row
+    return Task(title, description, Priority(priorityLevel), dueOrdinal, bool(completed),
+                json.loads(extra) if extra else None, uid,
+                Recurrence.fromDict(json.loads(repeat)) if repeat else None)
+
+class SQLiteTaskStore:
+    """Task storage backed by an SQLite database file."""
+
+    def __init__(self, dbPath='tasks.db'):
+        self.dbPath = dbPath
+        # The API server writes from a worker thread; its lock keeps the connection to one thread at a time
+        self.connection = sqlite3.connect(dbPath, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        existing = {column[1] for column in self.connection.execute("PRAGMA table_info(tasks)")}
+        for column in ADDED_COLUMNS:
+            if column not in existing:
+                self.connection.execute(f"ALTER TABLE tasks ADD COLUMN {column} TEXT")
+        self.connection.execute(RECURRING_INDEX)
+        self.connection.commit()
+        self.rowIds = {}  # Task id -> row id, for the tasks returned by loadTasks and added since
+
+    def loadTasks(self):
+        """Load all tasks in insertion order."""
+        tasks = TaskCollection()
+        self.rowIds = {}
+        missing = []  # (new id, row id) of rows stored before tasks kept their id
+        for row in self.connection.execute(f"SELECT id, {COLUMNS} FROM tasks ORDER BY id"):
+            task = rowTask(row[1:])
+            tasks.append(task)  # Gives a task without an id its id
+            self.rowIds[task.id] = row[0]
+            if row[7] is None:
+                missing.append((task.id, row[0]))
+        if missing:
+            with self.connection:
+                self.connection.executemany("UPDATE tasks SET uid = ? WHERE id = ?", missing)
+        return tasks
+
+    def saveTasks(self, tasks):
+        """Make sure every recorded change is on disk."""
+        self.connection.commit()
+        print(f"Tasks saved to: {os.path.abspath(self.dbPath)}")
+
+    def replaceTasks(self, tasks):
+        """Replace the whole table with the given task list in one transaction."""
+        with self.connection:
+            self.connection.execute("DELETE FROM tasks")
+            self.connection.executemany(INSERT, map(taskRow, tasks))
+        rows = self.connection.execute("SELECT id FROM tasks ORDER BY id")
+        self.rowIds = {task.id: row[0] for task, row in zip(tasks, rows)}
+
+    def record(self, action, index=None, task=None):
+        """Apply an add, edit or delete made to the loaded task list."""
+        with self.connection:
+            self.applyChange(action, index, task)
+
+    def recordMany(self, changes):
+        """Apply several (action, index, task) changes in one transaction."""
+        with self.connection:
+            for change in changes:
+                self.applyChange(*change)
+
+    def applyChange(self, action, index=None, task=None):
+        """Execute the statement for one change inside the current transaction; the task's id finds its row."""
+        if action == "add":
+            cursor = self.connection.execute(INSERT, taskRow(task))
+            self.rowIds[task.id] = cursor.lastrowid
+        elif action == "edit":
+            self.connection.execute(
+                "UPDATE tasks SET title = ?, description = ?, priority = ?, priorityLevel = ?, "
+                "dueDate = ?, dueOrdinal = ?, completed = ?, repeat = ?, uid = ?, extra = ? WHERE id = ?",
+                taskRow(task) + (self.rowIds[task.id],))
+        elif action == "delete":
+            self.connection.execute("DELETE FROM tasks WHERE id = ?", (self.rowIds.pop(task.id),))
+
+    def iterTasks(self, filterToday=False, sortBy=None, today=None):
+        """Lazily yield tasks due today and/or in sorted order using the table indexes."""
+        query = f"SELECT {COLUMNS} FROM tasks"
+        params = ()
+        if filterToday:
+            # Pending recurring tasks due earlier may also occur today; their rules are checked in Python
+            today = today or datetime.now().date().toordinal()
+            query += " WHERE dueOrdinal = ? OR (repeat IS NOT NULL AND completed = 0 AND dueOrdinal < ?)"
+            params = (today, today)
+        query += " ORDER BY " + ORDER_BY.get(sortBy, "id")
+        tasks = map(rowTask, self.connection.execute(query, params))
+        return (task for task in tasks if task.occursOn(today)) if filterToday else tasks
+
+    def queryTasks(self, filterToday=False, sortBy=None, today=None):
+        """Return tasks due today and/or in sorted order using the table indexes."""
+        return list(self.iterTasks(filterToday, sortBy, today))
+
+    def view(self, tasks):
+        """Return a StoreView showing tasks, the TaskCollection loaded from this store."""
+        return StoreView(self, tasks)
+
+    def isEmpty(self):
+        """Return True if the database holds no tasks."""
+        return self.connection.execute("SELECT 1 FROM tasks LIMIT 1").fetchone() is None
+
+    def importJson(self, jsonPath='tasks.json'):
+        """Import every task from a JSON task file, replacing the table contents."""
+        hadLock = os.path.exists(lockPath(jsonPath))
+        tasks = loadTasks(jsonPath)
+        if not hadLock:
+            os.remove(lockPath(jsonPath))  # Created just for this read; nothing else uses the JSON file now
+        self.replaceTasks(tasks)
+        return len(tasks)
+
+    def close(self):
+        """Commit pending changes and close the database."""
+        self.connection.commit()
+        self.connection.close()
+
+class StoreView:
+    """The tasks loaded from a store, shown through its indexed queries (see displayUtils.renderTasks).
+
+    Rows are numbered by their place in the loaded TaskCollection, the number
+    edit and delete take.
+    """
+
+    def __init__(self, store, tasks):
+        self.store = store
+        self.tasks = tasks
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def __iter__(self):
+        return iter(self.tasks)
+
+    def numbered(self, found):
+        """Pair each task found by a query with its list number."""
+        seqById, indexOf = self.tasks.seqById, self.tasks.indexOf
+        return ((indexOf(seqById[task.id]) + 1, task) for task in found)
+
+    def numberedBy(self, sortBy=None):
+        """Lazily iterate over (list number, task) pairs in the order given by sortBy, like TaskCollection.numberedBy."""
+        if sortBy is None:
+            return enumerate(self.tasks, 1)
+        return self.numbered(self.store.iterTasks(sortBy=sortBy))
+
+    def numberedDueOn(self, day, sortBy=None):
+        """Lazily iterate over (list number, task) for the tasks due on day, in the sortBy order."""
+        return self.numbered(self.store.iterTasks(True, sortBy, day))
+
+def openStore(dbPath='tasks.db', jsonPath='tasks.json'):
+    """Open the SQLite store, migrating an existing JSON task file on first use."""
+    store = SQLiteTaskStore(dbPath)
+    version = store.connection.execute("PRAGMA user_version").fetchone()[0]
+    if version == 0:
+        if store.isEmpty() and os.path.exists(jsonPath):
+            count = store.importJson(jsonPath)
+            print(f"Imported {count} tasks from {os.path.abspath(jsonPath)}")
+        store.connection.execute("PRAGMA user_version = 1")  # Only migrate once
+    return store
\ No newline at end of file
@@ -0,0 +1,141 @@
+# taskArchive.py
+"""
+Archive of finished tasks for the Task Manager application.
+Tasks completed more than ARCHIVE_AFTER_DAYS ago are moved out of the task
+file into NDJSON files next to it, one per completion month
+(tasks.json.archive/2025-03.ndjson), so the tasks loaded, saved and shown
+every day stay few. The completion day is the completedAt date recorded when
+a task is marked completed (see taskModel.stampCompletion); tasks completed
+before it was recorded go by their due date. The archive is only read when history is shown or
+searched, one month file at a time, and a single task can be restored into
+the active list.
+"""
+import json
+import os
+from datetime import date
+from fileOperations import fileLock, recordChange, recordChanges, statSignature, syncTasks
+from searchIndex import tokenize, matchesAll
+from taskModel import Task, completedOn, stampCompletion
+
+ARCHIVE_AFTER_DAYS = 30
+PARTITION_EXTENSION = ".ndjson"
+
+def archivePath(filePath):
+    """Return the directory that holds the archive of a task file."""
+    return filePath + ".archive"
+
+def monthOf(ordinal):
+    """Return the YYYY-MM month of a day ordinal, which names its partition."""
+    day = date.fromordinal(ordinal)
+    return f"{day.year:04d}-{day.month:02d}"
+
+def readPartition(path):
+    """Return the tasks of one partition file, or [] if it does not exist."""
+    try:
+        with open(path, 'r', encoding="utf-8") as file:
+            tasks = [Task.fromDict(json.loads(line)) for line in file if line.strip()]
+    except FileNotFoundError:
+        return []
+    # A task archived again after a crash between the append and the delete appears twice
+    seen = set()
+    unique = []
+    for task in tasks:
+        if task.id not in seen:
+            seen.add(task.id)
+            unique.append(task)
+    return unique
+
+class TaskArchive:
+    """The archive of a task file, read lazily one month partition at a time."""
+
+    def __init__(self, filePath='tasks.json', archiveAfter=ARCHIVE_AFTER_DAYS):
+        self.filePath = filePath
+        self.archiveAfter = archiveAfter  # Default age, in days since completion, for moveCompleted
+        self.directory = archivePath(filePath)
+        self.partitions = {}  # Month -> (file signature, tasks) for the partitions read so far
+
+    def partitionPath(self, month):
+        """Return the file of a month's partition."""
+        return os.path.join(self.directory, month + PARTITION_EXTENSION)
+
+    def months(self):
+        """Return the archived months, oldest first, without reading any partition."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-len(PARTITION_EXTENSION)] for name in names if name.endswith(PARTITION_EXTENSION))
+
+    def partition(self, month):
+        """Return the tasks archived for month, re-reading the file only if it changed."""
+        path = self.partitionPath(month)
+        signature = statSignature(path)
+        cached = self.partitions.get(month)
+        if cached is None or cached[0] != signature:
+            cached = self.partitions[month] = (signature, readPartition(path))
+        return cached[1]
+
+    def tasks(self):
+        """Return every archived task, oldest month first."""
+        return [task for month in self.months() for task in self.partition(month)]
+
+    def search(self, query):
+        """Return (number in tasks(), task) for the archived tasks with words starting with every query word."""
+        prefixes = tokenize(query)
+        if not prefixes:
+            return []
+        return [(number, task) for number, task in enumerate(self.tasks(), 1) if matchesAll(task, prefixes)]
+
+    def moveCompleted(self, tasks, days=None, today=None):
+        """Move tasks completed more than days (by default archiveAfter) ago into the archive; return how many moved.
+
+        Tasks are appended to their partitions before they are deleted from
+        the task file, so a crash in between duplicates a task instead of
+        losing it.
+        """
+        cutoff = (today or date.today().toordinal()) - (self.archiveAfter if days is None else days)
+        with fileLock(self.filePath):
+            syncTasks()  # Archive the tasks as other processes last saved them
+            seqs = [seq for seq, task in tasks.bySeq.items() if task.completed and completedOn(task) < cutoff]
+            if not seqs:
+                return 0
+            byMonth = {}
+            for seq in seqs:
+                task = tasks.get(seq)
+                byMonth.setdefault(monthOf(completedOn(task)), []).append(task)
+            os.makedirs(self.directory, exist_ok=True)
+            for month, archived in byMonth.items():
+                with open(self.partitionPath(month), 'a', encoding="utf-8") as file:
+                    file.write("".join(json.dumps(task.toDict()) + "\n" for task in archived))
+                    file.flush()
+                    os.fsync(file.fileno())
+            removed = tasks.removeSeqs(seqs)
+            recordChanges([("delete", None, task) for task in removed])
+        return len(removed)
+
+    def restore(self, tasks, task):
+        """Move an archived task back into tasks and return its sequence number.
+
+        The task comes back as not completed, so it is not archived again at
+        the next start. Returns None if it was no longer in the archive.
+        """
+        month = monthOf(completedOn(task))
+        path = self.partitionPath(month)
+        with fileLock(self.filePath):
+            archived = readPartition(path)
+            remaining = [other for other in archived if other.id != task.id]
+            if len(remaining) == len(archived):
+                return None  # Already restored, e.g. by another process
+            if remaining:
+                tempPath = path + ".tmp"
+                with open(tempPath, 'w', encoding="utf-8") as file:
+                    file.write("".join(json.dumps(other.toDict()) + "\n" for other in remaining))
+                os.replace(tempPath, path)
+            else:
+                os.remove(path)
+            self.partitions.pop(month, None)
+            restored = stampCompletion(Task(task.title, task.description, task.priority, task.due, False,
+                                            task.extra, task.id, task.repeat))
+            tasks.append(restored)
+            recordChange("add", task=restored)
+        return tasks.seqAt(-1)
@@ -0,0 +1,391 @@
+# taskCollection.py
+"""
+Task collection for the Task Manager application.
+Behaves like the plain task list the rest of the application uses (append,
+indexing, pop) while keeping a priority-bucketed index and a due-date index
+up to date on every change, so sorted views are read straight from an index
+instead of copying and re-sorting the whole list.
+
+Tasks are stored by sequence number and found by their stable id in a hash
+index; the list order is kept apart, in a bucketed sorted list of sequence
+numbers. Editing or deleting a task by sequence number or id never looks up
+its list position.
+"""
+from bisect import bisect_left, insort
+from itertools import chain, islice, takewhile
+from taskModel import Priority, newTaskId
+
+SEQ_BITS = 32  # The due-date index packs (due, seq) into one int: due << SEQ_BITS | seq
+SEQ_MASK = (1 << SEQ_BITS) - 1
+
+class SortedList:
+    """Sorted sequence split into bounded buckets.
+
+    Finding a position is a binary search over the bucket maxima (O(log n))
+    followed by one inside a bucket; inserts and removals only shift the
+    elements of a single bucket.
+    """
+    bucketSize = 512
+
+    def __init__(self):
+        self.buckets = []
+        self.maxes = []
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        return chain.from_iterable(self.buckets)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        position, offset = self.locate(index)
+        return self.buckets[position][offset]
+
+    def locate(self, index):
+        """Return the bucket and the place in it of the value at a list index, walking from the nearer end."""
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("index out of range")
+        if index < self.length // 2:
+            for position, bucket in enumerate(self.buckets):
+                if index < len(bucket):
+                    return position, index
+                index -= len(bucket)
+        remaining = self.length - index
+        for position in range(len(self.buckets) - 1, -1, -1):
+            size = len(self.buckets[position])
+            if remaining <= size:
+                return position, size - remaining
+            remaining -= size
+
+    def add(self, value):
+        """Insert value keeping the sequence sorted."""
+        if not self.buckets:
+            self.buckets.append([value])
+            self.maxes.append(value)
+        else:
+            position = bisect_left(self.maxes, value)
+            if position == len(self.buckets):
+                position -= 1
+                self.buckets[position].append(value)
+                self.maxes[position] = value
+            else:
+                insort(self.buckets[position], value)
+            if len(self.buckets[position]) > 2 * self.bucketSize:
+                self.split(position)
+        self.length += 1
+
+    def update(self, values):
+        """Insert many values; large batches are merged in one pass instead of one by one."""
+        values = sorted(values)
+        if not values:
+            return
+        if not self.buckets or values[0] > self.maxes[-1]:
+            # Everything goes after the current end (e.g. new sequence numbers): just add buckets
+            merged = values
+        elif len(values) * 64 < self.length:
+            for value in values:
+                self.add(value)
+            return
+        else:
+            merged = list(self)
+            merged.extend(values)
+            merged.sort()  # Two sorted runs: Timsort merges them in linear time
+            self.buckets, self.maxes, self.length = [], [], 0
+        size = self.bucketSize
+        newBuckets = [merged[start:start + size] for start in range(0, len(merged), size)]
+        self.buckets.extend(newBuckets)
+        self.maxes.extend(bucket[-1] for bucket in newBuckets)
+        self.length += len(merged)
+
+    def remove(self, value):
+        """Remove one occurrence of value, raising ValueError if it is missing."""
+        position = bisect_left(self.maxes, value)
+        if position == len(self.buckets):
+            raise ValueError(f"{value!r} not in list")
+        bucket = self.buckets[position]
+        index = bisect_left(bucket, value)
+        if index == len(bucket) or bucket[index] != value:
+            raise ValueError(f"{value!r} not in list")
+        self.removeAt(position, index)
+
+    def pop(self, index=-1):
+        """Remove and return the value at a list index."""
+        position, offset = self.locate(index)
+        value = self.buckets[position][offset]
+        self.removeAt(position, offset)
+        return value
+
+    def removeAt(self, position, index):
+        """Remove the value at index of bucket position."""
+        bucket = self.buckets[position]
+        del bucket[index]
+        if bucket:
+            self.maxes[position] = bucket[-1]
+        else:
+            del self.buckets[position]
+            del self.maxes[position]
+        self.length -= 1
+
+    def rank(self, value):
+        """Return the number of values that sort before value."""
+        position = bisect_left(self.maxes, value)
+        before = sum(map(len, self.buckets[:position]))
+        if position < len(self.buckets):
+            before += bisect_left(self.buckets[position], value)
+        return before
+
+    def iterFrom(self, value):
+        """Iterate over the values that are not less than value, in order."""
+        position = bisect_left(self.maxes, value)
+        if position == len(self.buckets):
+            return iter(())
+        bucket = self.buckets[position]
+        return chain(islice(bucket, bisect_left(bucket, value), None),
+                     chain.from_iterable(self.buckets[position + 1:]))
+
+    def split(self, position):
+        """Split an overgrown bucket in two."""
+        bucket = self.buckets[position]
+        half = len(bucket) // 2
+        self.buckets[position:position + 1] = [bucket[:half], bucket[half:]]
+        self.maxes[position:position + 1] = [bucket[half - 1], bucket[-1]]
+
+class TaskCollection:
+    """List-like container of tasks with incrementally maintained sort indexes.
+
+    Tasks are replaced (tasks[i] = newTask), never changed in place, so the
+    indexes always see the old and new due date and priority. Every task gets
+    a stable id when it joins the collection; a replacement keeps the id of
+    the task it replaces.
+    """
+
+    def __init__(self, tasks=()):
+        self.order = SortedList()  # Sequence number of each task; they only grow, so this is list order
+        self.bySeq = {}
+        self.seqById = {}  # Task id -> sequence number
+        self.byDue = SortedList()  # due ordinal << SEQ_BITS | sequence number
+        self.byPriority = {priority: SortedList() for priority in sorted(Priority, reverse=True)}
+        self.recurring = set()  # Sequence numbers of recurring tasks, which are also due on later occurrences
+        self.nextSeq = 0
+        self.textIndex = None  # Optional searchIndex.SearchIndex kept current like the sort indexes
+        self.extend(tasks)
+
+    def __len__(self):
+        return len(self.order)
+
+    def __iter__(self):
+        bySeq = self.bySeq
+        return (bySeq[seq] for seq in self.order)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.bySeq[seq] for seq in self.order[index]]
+        return self.bySeq[self.order[index]]
+
+    def __setitem__(self, index, task):
+        self.replaceSeq(self.order[index], task)
+
+    def __eq__(self, other):
+        if isinstance(other, (TaskCollection, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"TaskCollection({list(self)!r})"
+
+    def append(self, task):
+        """Add a task at the end of the list."""
+        seq = self.nextSeq
+        self.nextSeq += 1
+        self.order.add(seq)
+        self.addToIndexes(seq, task)
+
+    def extend(self, tasks):
+        """Add several tasks at the end of the list, updating the indexes in bulk; returns their sequence numbers."""
+        seq = self.nextSeq
+        dues = []
+        seqsByPriority = {priority: [] for priority in self.byPriority}
+        seqById = self.seqById
+        for task in tasks:
+            if task.id is None or task.id in seqById:
+                task.id = newTaskId()
+            seqById[task.id] = seq
+            self.bySeq[seq] = task
+            dues.append(task.due << SEQ_BITS | seq)
+            seqsByPriority[task.priority].append(seq)
+            if task.repeat is not None:
+                self.recurring.add(seq)
+            seq += 1
+        added = range(self.nextSeq, seq)
+        self.order.update(added)
+        if self.textIndex is not None:
+            bySeq = self.bySeq
+            self.textIndex.addMany((addedSeq, bySeq[addedSeq]) for addedSeq in added)
+        self.nextSeq = seq
+        self.byDue.update(dues)
+        for priority, seqs in seqsByPriority.items():
+            self.byPriority[priority].update(seqs)
+        return added
+
+    def pop(self, index=-1):
+        """Remove and return the task at index."""
+        seq = self.order.pop(index)
+        task = self.bySeq[seq]
+        self.removeFromIndexes(seq, task)
+        return task
+
+    def getById(self, taskId):
+        """Return the task with a stable id, or None if there is none."""
+        seq = self.seqById.get(taskId)
+        return None if seq is None else self.bySeq[seq]
+
+    def replaceSeq(self, seq, task):
+        """Put task in place of the task with sequence number seq, keeping its id unless task has one."""
+        old = self.bySeq[seq]
+        if task.id is None:
+            task.id = old.id
+        self.removeFromIndexes(seq, old)
+        self.addToIndexes(seq, task)
+
+    def removeSeq(self, seq):
+        """Remove and return the task with sequence number seq."""
+        task = self.bySeq[seq]
+        self.order.remove(seq)
+        self.removeFromIndexes(seq, task)
+        return task
+
+    def removeSeqs(self, seqs):
+        """Remove the tasks with the given sequence numbers in one pass over the list; return them in list order."""
+        seqs = set(seqs)
+        removed = []
+        for seq in sorted(seqs):  # Sequence numbers only grow, so this is list order
+            task = self.bySeq[seq]
+            self.removeFromIndexes(seq, task)
+            removed.append(task)
+        order = SortedList()
+        order.update(seq for seq in self.order if seq not in seqs)
+        self.order = order
+        return removed
+
+    def seqAt(self, index):
+        """Return the stable sequence number of the task at index."""
+        return self.order[index]
+
+    def indexOf(self, seq):
+        """Return the list index of the task with sequence number seq."""
+        if seq not in self.bySeq:
+            raise KeyError(seq)
+        return self.order.rank(seq)
+
+    def get(self, seq):
+        """Return the task with sequence number seq."""
+        return self.bySeq[seq]
+
+    def hasSeq(self, seq):
+        """Return True if a task with sequence number seq is in the collection."""
+        return seq in self.bySeq
+
+    def attachIndex(self, textIndex):
+        """Keep textIndex (anything with add, addMany and remove) up to date from now on."""
+        self.textIndex = textIndex
+
+    def copy(self):
+        """Return the tasks as a plain list."""
+        return list(self)
+
+    def addToIndexes(self, seq, task):
+        """Store a task under seq and add it to the sort indexes."""
+        if task.id is None or task.id in self.seqById:
+            task.id = newTaskId()
+        self.seqById[task.id] = seq
+        self.bySeq[seq] = task
+        self.byDue.add(task.due << SEQ_BITS | seq)
+        self.byPriority[task.priority].add(seq)
+        if task.repeat is not None:
+            self.recurring.add(seq)
+        if self.textIndex is not None:
+            self.textIndex.add(seq, task)
+
+    def removeFromIndexes(self, seq, task):
+        """Drop a task's entries from the sort indexes."""
+        del self.bySeq[seq]
+        del self.seqById[task.id]
+        self.byDue.remove(task.due << SEQ_BITS | seq)
+        self.byPriority[task.priority].remove(seq)
+        self.recurring.discard(seq)
+        if self.textIndex is not None:
+            self.textIndex.remove(seq, task)
+
+    def sortedBy(self, sortBy=None):
+        """Lazily iterate over the tasks in the order given by sortBy.
+
+        "priority" yields the highest priority first and "dueDate" the earliest
+        date first; ties keep list order, as with a stable sort.
+        """
+        bySeq = self.bySeq
+        return (bySeq[seq] for seq in self.sortedSeqs(sortBy))
+
+    def numberedBy(self, sortBy=None):
+        """Lazily iterate over (list number, task) pairs in the order given by sortBy.
+
+        The number is the task's place in the list, which edit and delete take.
+        """
+        if sortBy is None:
+            return enumerate(self, 1)
+        rank, bySeq = self.order.rank, self.bySeq
+        return ((rank(seq) + 1, bySeq[seq]) for seq in self.sortedSeqs(sortBy))
+
+    def sortedSeqs(self, sortBy=None):
+        """Lazily iterate over sequence numbers in the order given by sortBy."""
+        if sortBy == "priority":
+            return (seq for bucket in self.byPriority.values() for seq in bucket)
+        elif sortBy == "dueDate":
+            return (key & SEQ_MASK for key in self.byDue)
+        return iter(self.order)
+
+    def seqsDueOn(self, due):
+        """Lazily iterate over the sequence numbers of the tasks due on a day ordinal, in list order.
+
+        Recurring tasks whose next occurrence is earlier but that also occur on
+        that day are included.
+        """
+        end = (due + 1) << SEQ_BITS
+        keys = takewhile(lambda key: key < end, self.byDue.iterFrom(due << SEQ_BITS))
+        seqs = (key & SEQ_MASK for key in keys)
+        bySeq = self.bySeq
+        repeating = [seq for seq in self.recurring if bySeq[seq].due < due and bySeq[seq].occursOn(due)]
+        if not repeating:
+            return seqs
+        return iter(sorted(chain(seqs, repeating)))
+
+    def position(self, seq, sortBy=None):
+        """Return where the task with sequence number seq appears in sortedSeqs(sortBy)."""
+        if sortBy == "priority":
+            priority = self.bySeq[seq].priority
+            before = sum(len(bucket) for level, bucket in self.byPriority.items() if level > priority)
+            return before + self.byPriority[priority].rank(seq)
+        elif sortBy == "dueDate":
+            return self.byDue.rank(self.bySeq[seq].due << SEQ_BITS | seq)
+        return self.indexOf(seq)
+
+    def sortKey(self, seq, sortBy=None):
+        """Return an int that sorts seq where sortedSeqs(sortBy) puts it; key & SEQ_MASK gives seq back."""
+        if sortBy == "priority":
+            return (Priority.HIGH - self.bySeq[seq].priority) << SEQ_BITS | seq
+        elif sortBy == "dueDate":
+            return self.bySeq[seq].due << SEQ_BITS | seq
+        return seq
+
+    def sortSeqs(self, seqs, sortBy=None):
+        """Return some sequence numbers in the order sortedSeqs(sortBy) would give them."""
+        bySeq = self.bySeq
+        if sortBy == "priority":
+            return sorted(seqs, key=lambda seq: (-bySeq[seq].priority, seq))
+        elif sortBy == "dueDate":
+            return sorted(seqs, key=lambda seq: (bySeq[seq].due, seq))
+        return sorted(seqs)
\ No newline at end of file
@@ -0,0 +1,40 @@
+# taskLoader.py
+"""
+Background loading for the Task Manager GUI.
+Parsing a large task file takes seconds, so the GUI opens its window first
+and loads the task list on a worker thread. The worker passes each batch of
+tasks to the UI thread through a queue as soon as it is parsed, and then
+the loaded list itself; the UI calls poll periodically (e.g. from
+root.after) and shows the batches as they arrive, so it never waits for the
+file.
+"""
+import queue
+import threading
+
+class TaskLoader:
+    """Runs a load on a worker thread and hands its progress to the UI thread."""
+
+    def __init__(self, load):
+        self.results = queue.Queue()  # ("batch", tasks) while parsing, then ("loaded", result) or ("failed", error)
+        self.thread = threading.Thread(target=self.work, args=(load,), name="load", daemon=True)
+        self.thread.start()
+
+    def work(self, load):
+        """Worker thread: run load, which calls the function it is given with each batch of parsed tasks."""
+        try:
+            result = load(lambda batch: self.results.put(("batch", batch)))
+        except Exception as error:  # Whatever went wrong, the UI must hear of it or it would wait forever
+            self.results.put(("failed", error))
+        else:
+            self.results.put(("loaded", result))
+
+    def poll(self):
+        """Return the next (kind, value) message from the worker, or None if there is none yet; call from the UI thread."""
+        try:
+            return self.results.get_nowait()
+        except queue.Empty:
+            return None
+
+    def wait(self):
+        """Block until the worker has finished loading."""
+        self.thread.join()
@@ -0,0 +1,285 @@
+# taskModel.py
+"""
+Task data model for the Task Manager application.
+Defines the compact Task record used by every module, the Priority enum,
+the Recurrence rule of repeating tasks and the helpers that convert
+DD-MM-YYYY due dates to and from day ordinals.
+
+A recurring task is stored once, with its due date set to its next pending
+occurrence. Occurrences are computed only for the day or window asked about,
+and completing one moves the task on to the next (finishOccurrence) instead
+of copying it.
+"""
+import os
+import re
+from calendar import monthrange
+from datetime import date
+from enum import IntEnum
+from functools import lru_cache
+from itertools import count
+from profiling import addCount
+
+DATE_FORMAT = "%d-%m-%Y"
+LAST_DAY = date.max.toordinal()
+REPEAT_NAMES = {"daily": ("day", 1), "weekly": ("week", 1), "monthly": ("month", 1)}
+REPEAT_PATTERN = re.compile(r"every\s+(?:(\d+)\s+)?(day|week|month)s?")
+SESSION_ID = os.urandom(6).hex()  # Makes task ids created by different processes distinct
+COMPLETED_AT = "completedAt"  # Extra key holding the DD-MM-YYYY date a task was completed on
+
+taskCounter = count(1)
+
+class Priority(IntEnum):
+    """Task priority; higher values sort first."""
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+
+    def __str__(self):
+        return PRIORITY_LABELS[self]
+
+    def __format__(self, formatSpec):
+        return format(str(self), formatSpec)
+
+    @classmethod
+    def parse(cls, value, default=None):
+        """Return the priority named by value (e.g. "High", "low "), or default."""
+        if isinstance(value, Priority):
+            return value
+        return PRIORITY_NAMES.get(str(value).strip().lower(), default)
+
+PRIORITY_LABELS = ("", "low", "medium", "high")  # Indexed by priority value
+PRIORITY_NAMES = {str(priority): priority for priority in Priority}
+
+@lru_cache(maxsize=65536)
+def parseDate(dateString):
+    """Return the day ordinal of a DD-MM-YYYY date, raising ValueError if invalid.
+
+    Accepts the same inputs as datetime.strptime(dateString, "%d-%m-%Y"),
+    without its overhead; equal strings share one cached ordinal object.
+    """
+    addCount("date parses")  # Only reached on a cache miss
+    parts = dateString.split("-")
+    if len(parts) != 3:
+        raise ValueError(f"Invalid date: {dateString!r}")
+    day, month, year = parts
+    if not (0 < len(day) <= 2 and 0 < len(month) <= 2 and len(year) == 4
+            and day.isdigit() and month.isdigit() and year.isdigit() and dateString.isascii()):
+        raise ValueError(f"Invalid date: {dateString!r}")
+    return date(int(year), int(month), int(day)).toordinal()
+
+@lru_cache(maxsize=65536)
+def formatDate(ordinal):
+    """Return the DD-MM-YYYY text of a day ordinal."""
+    day = date.fromordinal(ordinal)
+    return f"{day.day:02d}-{day.month:02d}-{day.year:04d}"
+
+def parseRepeat(text):
+    """Return (unit, every) for a rule such as "weekly" or "every 3 days", or None for "" or "none"."""
+    text = " ".join(text.lower().split())
+    if text in ("", "none", "no"):
+        return None
+    if text in REPEAT_NAMES:
+        return REPEAT_NAMES[text]
+    match = REPEAT_PATTERN.fullmatch(text)
+    if match is None or match.group(1) == "0":
+        raise ValueError(f"Invalid repeat rule: {text!r} (use daily, weekly, monthly or every N days/weeks/months)")
+    return match.group(2), int(match.group(1) or 1)
+
+class Recurrence:
+    """Repeat rule of a task: every N days, weeks or months from an anchor date, optionally until an end date."""
+    __slots__ = ("unit", "every", "anchor", "until")
+
+    def __init__(self, unit, every, anchor, until=None):
+        self.unit = unit
+        self.every = every
+        self.anchor = anchor  # Day ordinal of the first occurrence; monthly rules keep its day of the month
+        self.until = until  # Day ordinal of the last possible occurrence, or None
+
+    @classmethod
+    def fromText(cls, text, anchor, until=None):
+        """Build the rule a text such as "every 2 weeks" describes, or return None for no repeat."""
+        rule = parseRepeat(text)
+        return None if rule is None else cls(rule[0], rule[1], anchor, until)
+
+    @classmethod
+    def fromDict(cls, data):
+        """Build a rule from its JSON form."""
+        unit, every = data["unit"], int(data.get("every", 1))
+        if unit not in ("day", "week", "month") or every < 1:
+            raise ValueError(f"Invalid repeat rule: {data!r}")
+        until = data.get("until")
+        return cls(unit, every, parseDate(data["anchor"]), parseDate(until) if until else None)
+
+    def toDict(self):
+        """Return the JSON form of the rule."""
+        data = {"unit": self.unit, "every": self.every, "anchor": formatDate(self.anchor)}
+        if self.until is not None:
+            data["until"] = formatDate(self.until)
+        return data
+
+    def __str__(self):
+        if self.every == 1:
+            text = {"day": "daily", "week": "weekly", "month": "monthly"}[self.unit]
+        else:
+            text = f"every {self.every} {self.unit}s"
+        return text if self.until is None else f"{text} until {formatDate(self.until)}"
+
+    def __eq__(self, other):
+        if not isinstance(other, Recurrence):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in Recurrence.__slots__)
+
+    def __repr__(self):
+        return f"Recurrence({str(self)!r}, from {formatDate(self.anchor)!r})"
+
+    def occurrences(self, start, end):
+        """Lazily yield the day ordinals of the occurrences from start to end, both included."""
+        start = max(start, self.anchor)
+        if self.until is not None:
+            end = min(end, self.until)
+        if self.unit != "month":
+            step = self.every * (7 if self.unit == "week" else 1)
+            day = self.anchor + -(-(start - self.anchor) // step) * step  # First occurrence on or after start
+            while day <= end:
+                yield day
+                day += step
+            return
+        anchor = date.fromordinal(self.anchor)
+        first = date.fromordinal(start)
+        months = (first.year - anchor.year) * 12 + first.month - anchor.month
+        month = anchor.year * 12 + anchor.month - 1 + months // self.every * self.every
+        while True:
+            year, monthIndex = divmod(month, 12)
+            if year > date.max.year:
+                return
+            day = date(year, monthIndex + 1, min(anchor.day, monthrange(year, monthIndex + 1)[1])).toordinal()
+            if day > end:
+                return
+            if day >= start:
+                yield day
+            month += self.every
+
+    def occursOn(self, day):
+        """Return True if the rule has an occurrence on a day ordinal."""
+        return next(self.occurrences(day, day), None) is not None
+
+    def nextAfter(self, day):
+        """Return the first occurrence after a day ordinal, or None if the series has ended."""
+        return next(self.occurrences(day + 1, LAST_DAY), None)
+
+def newTaskId():
+    """Return a new task id, unique across processes."""
+    return f"{SESSION_ID}-{next(taskCounter):x}"
+
+class Task:
+    """A single task. The due date is kept as a day ordinal, parsed once."""
+    __slots__ = ("title", "description", "priority", "due", "completed", "extra", "id", "repeat")
+
+    def __init__(self, title, description, priority, due, completed=False, extra=None, id=None, repeat=None):
+        self.title = title
+        self.description = description
+        self.priority = priority
+        self.due = due
+        self.completed = completed
+        self.extra = extra  # Unknown JSON keys, kept so that saving is lossless
+        self.id = id  # Stable id, set when the task first joins a TaskCollection
+        self.repeat = repeat  # Recurrence, or None for a one-off task
+
+    @property
+    def dueDate(self):
+        """Due date as DD-MM-YYYY text."""
+        return formatDate(self.due)
+
+    @classmethod
+    def fromDict(cls, data):
+        """Build a task from its JSON form, normalizing the priority; raises ValueError for an unknown one."""
+        extra = {key: value for key, value in data.items() if key not in JSON_KEYS} or None
+        priority = Priority.parse(data.get("priority"))
+        if priority is None:
+            raise ValueError(f"Invalid priority {data.get('priority')!r} for task {data['title']!r}")
+        return cls(
+            data["title"],
+            data.get("description", ""),
+            priority,
+            parseDate(data["dueDate"]),
+            bool(data.get("completed", False)),
+            extra,
+            data.get("id"),
+            Recurrence.fromDict(data["repeat"]) if data.get("repeat") else None,
+        )
+
+    def toDict(self):
+        """Return the JSON form of the task."""
+        data = {
+            "title": self.title,
+            "description": self.description,
+            "priority": str(self.priority),
+            "dueDate": self.dueDate,
+            "completed": self.completed
+        }
+        if self.id is not None:
+            data["id"] = self.id
+        if self.repeat is not None:
+            data["repeat"] = self.repeat.toDict()
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def occursOn(self, day):
+        """Return True if the task is due on a day ordinal; a recurring task also on any later occurrence."""
+        if self.due == day:
+            return True
+        return self.repeat is not None and not self.completed and self.due < day and self.repeat.occursOn(day)
+
+    def __eq__(self, other):
+        if not isinstance(other, Task):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in Task.__slots__)
+
+    def __repr__(self):
+        return f"Task({self.title!r}, {str(self.priority)!r}, {self.dueDate!r}, completed={self.completed})"
+
+def finishOccurrence(task, today=None):
+    """Return a recurring task just marked completed moved on to its next pending occurrence.
+
+    Occurrences missed before today are skipped. A one-off or pending task, or
+    one whose series has ended, is returned unchanged.
+    """
+    if task.repeat is None or not task.completed:
+        return task
+    nextDue = task.repeat.nextAfter(max(task.due, today or date.today().toordinal()))
+    if nextDue is None:
+        return task
+    return Task(task.title, task.description, task.priority, nextDue, False, task.extra, task.id, task.repeat)
+
+def stampCompletion(task, previous=None, today=None):
+    """Record in task.extra the day an edit completes task; drop the record while the task is pending.
+
+    previous is the task before the edit, or None for a new task. A task that
+    stays completed keeps the day it was first completed on, as does a new
+    task that arrives with one. Returns task.
+    """
+    extra = task.extra or {}
+    if task.completed:
+        if previous.completed if previous is not None else COMPLETED_AT in extra:
+            return task
+        extra = dict(extra)
+        extra[COMPLETED_AT] = formatDate(today or date.today().toordinal())
+    elif COMPLETED_AT in extra:
+        extra = {key: value for key, value in extra.items() if key != COMPLETED_AT}
+    else:
+        return task
+    task.extra = extra or None
+    return task
+
+def completedOn(task):
+    """Return the day ordinal a completed task was completed on, or its due date if that was not recorded."""
+    completedAt = task.extra.get(COMPLETED_AT) if task.extra else None
+    if isinstance(completedAt, str):
+        try:
+            return parseDate(completedAt)
+        except ValueError:
+            pass
+    return task.due
+
+JSON_KEYS = ("title", "description", "priority", "dueDate", "completed", "id", "repeat")
\ No newline at end of file
@@ -1,23 +1,62 @@
 # taskOperations.py
 """
 Module for task operations in the Task Manager application.
-Provides functions to add, edit, and delete tasks, including validation for dates.
+Provides functions to add, edit, delete, search and query tasks, including validation for dates,
+to browse and restore archived tasks, and to switch between task lists.
 """
-from datetime import datetime
+from fileOperations import recordChange
+from profiling import profiled
+from taskModel import Task, Priority, Recurrence, parseDate, finishOccurrence, stampCompletion
 
+@profiled
 def validateDate(dateString):
     """Validate if the date string is in DD-MM-YYYY format and is a valid date."""
     try:
-        datetime.strptime(dateString, "%d-%m-%Y")
+        parseDate(dateString)
         return True
     except ValueError:
         return False
 
+def inputPriority(prompt, default=None, optional=False):
+    """Ask for a priority until a valid one is entered; a blank gives default, or None if optional."""
+    while True:
+        text = input(prompt)
+        if not text.strip() and (default is not None or optional):
+            return default
+        priority = Priority.parse(text)
+        if priority is not None:
+            return priority
+        print("Invalid priority. Please enter high, medium or low.")
+
+def inputRepeat(anchor, current=None):
+    """Ask for a repeat rule (and its end date) starting on anchor; a blank answer keeps current."""
+    default = str(current) if current is not None else "none"
+    while True:
+        text = input(f"Repeat (none, daily, weekly, monthly, every N days/weeks/months) [{default}]: ")
+        if not text.strip():
+            return current
+        try:
+            repeat = Recurrence.fromText(text, anchor)
+            break
+        except ValueError as error:
+            print(error)
+    if repeat is None:
+        return None
+    while True:
+        until = input("Repeat until (DD-MM-YYYY, blank for no end): ").strip()
+        if not until:
+            return repeat
+        if validateDate(until):
+            repeat.until = parseDate(until)
+            return repeat
+        print("Invalid date format or value. Please use DD-MM-YYYY (e.g., 25-02-2025).")
+
+@profiled
 def addTask(tasks):
     """Add a new task to the list with validated input."""
     title = input("Task title: ")
     description = input("Description: ")
-    priority = input("Priority (high/medium/low): ").lower()
+    priority = inputPriority("Priority (high/medium/low): ")
     
     while True:
         dueDate = input("Due date (DD-MM-YYYY): ")
@@ -25,25 +64,22 @@ def addTask(tasks):
             break
         print("Invalid date format or value. Please use DD-MM-YYYY (e.g., 25-02-2025).")
     
-    task = {
-        "title": title,
-        "description": description,
-        "priority": priority,
-        "dueDate": dueDate,
-        "completed": False
-    }
+    repeat = inputRepeat(parseDate(dueDate))
+    task = Task(title, description, priority, parseDate(dueDate), repeat=repeat)
     tasks.append(task)
+    recordChange("add", task=task)
     print("Task added successfully!")
 
+@profiled
 def editTask(tasks):
     """Edit an existing task."""
-    from displayUtils import showTasks
+    from displayUtils import pageTasks
     
     if not tasks:
         print("No tasks available to edit.")
         return
     
-    numTasks = showTasks(tasks)
+    numTasks = pageTasks(tasks)
     while True:
         try:
             taskIndex = int(input(f"Enter the task number to edit (1-{numTasks}): ")) - 1
@@ -54,40 +90,41 @@ def editTask(tasks):
             print("Please enter a valid number.")
     
     task = tasks[taskIndex]
-    print(f"\nEditing task: {task['title']}")
+    print(f"\nEditing task: {task.title}")
     print("Leave blank to keep current value.")
     
-    newTitle = input(f"New title [{task['title']}]: ") or task['title']
-    newDescription = input(f"New description [{task['description']}]: ") or task['description']
-    newPriority = input(f"New priority (high/medium/low) [{task['priority']}]: ").lower() or task['priority']
+    newTitle = input(f"New title [{task.title}]: ") or task.title
+    newDescription = input(f"New description [{task.description}]: ") or task.description
+    newPriority = inputPriority(f"New priority (high/medium/low) [{task.priority}]: ", task.priority)
     
     while True:
-        newDueDate = input(f"New due date (DD-MM-YYYY) [{task['dueDate']}]: ") or task['dueDate']
+        newDueDate = input(f"New due date (DD-MM-YYYY) [{task.dueDate}]: ") or task.dueDate
         if validateDate(newDueDate):
             break
         print("Invalid date format or value. Please use DD-MM-YYYY (e.g., 25-02-2025).")
     
-    newCompleted = input(f"Completed? (yes/no) [{'yes' if task['completed'] else 'no'}]: ").lower()
-    newCompleted = True if newCompleted == "yes" else False if newCompleted == "no" else task['completed']
+    newRepeat = inputRepeat(parseDate(newDueDate), task.repeat)
+    
+    newCompleted = input(f"Completed? (yes/no) [{'yes' if task.completed else 'no'}]: ").lower()
+    newCompleted = True if newCompleted == "yes" else False if newCompleted == "no" else task.completed
     
-    tasks[taskIndex] = {
-        "title": newTitle,
-        "description": newDescription,
-        "priority": newPriority,
-        "dueDate": newDueDate,
-        "completed": newCompleted
-    }
+    # Completing a recurring task finishes this occurrence and moves it on to the next;
+    # completing any other task records the day, which decides when it is archived
+    tasks[taskIndex] = stampCompletion(finishOccurrence(Task(newTitle, newDescription, newPriority, parseDate(newDueDate),
+                                                             newCompleted, task.extra, repeat=newRepeat)), task)
+    recordChange("edit", taskIndex, tasks[taskIndex])
     print("Task updated successfully!")
 
+@profiled
 def deleteTask(tasks):
     """Delete an existing task."""
-    from displayUtils import showTasks
+    from displayUtils import pageTasks
     
     if not tasks:
         print("No tasks available to delete.")
         return
     
-    numTasks = showTasks(tasks)
+    numTasks = pageTasks(tasks)
     while True:
         try:
             taskIndex = int(input(f"Enter the task number to delete (1-{numTasks}): ")) - 1
@@ -98,4 +135,104 @@ def deleteTask(tasks):
             print("Please enter a valid number.")
     
     deletedTask = tasks.pop(taskIndex)
-    print(f"Task '{deletedTask['title']}' deleted successfully!")
\ No newline at end of file
+    recordChange("delete", taskIndex, deletedTask)
+    print(f"Task '{deletedTask.title}' deleted successfully!")
+
+@profiled
+def findTasks(tasks):
+    """Search task titles and descriptions and show the matches."""
+    from displayUtils import showSearchResults
+    from searchIndex import searchTasks
+    
+    query = input("Search for: ")
+    showSearchResults(tasks, searchTasks(tasks, query))
+
+def inputCount(prompt):
+    """Ask for a non-negative whole number until one (or a blank, giving None) is entered."""
+    while True:
+        text = input(prompt).strip()
+        if not text:
+            return None
+        if text.isdigit():
+            return int(text)
+        print("Please enter a whole number, or leave blank.")
+
+@profiled
+def queryTasks(tasks):
+    """Ask for filters, sort keys and a limit, and show the matching tasks."""
+    from displayUtils import showSearchResults
+    from taskQuery import buildQuery, parseOrderKeys, QueryError
+    
+    while True:
+        try:
+            orderBy = parseOrderKeys(input("Sort keys, e.g. priority:desc,dueDate "
+                                           "(title, priority, dueDate, completed; ':desc' for descending): "))
+            break
+        except QueryError as error:
+            print(error)
+    pending = input("Only unfinished tasks? (yes/no) [no]: ").strip().lower() == "yes"
+    priority = inputPriority("Only this priority (high/medium/low, blank for any): ", optional=True)
+    dueWithinDays = inputCount("Only tasks due within how many days (blank for any): ")
+    limit = inputCount("Show at most how many tasks (blank for all): ")
+    query = buildQuery(orderBy, pending, priority, dueWithinDays, limit)
+    showSearchResults(tasks, query.seqs(tasks))
+
+def browseArchive(tasks, archive):
+    """Show or search the archived tasks and restore one of them."""
+    from displayUtils import pageTasks, showArchivedTasks
+    
+    if archive is None:
+        print("The archive is only available with JSON storage.")
+        return
+    print("\n1. Show archived tasks\n2. Search archived tasks\n3. Restore an archived task")
+    choice = input("Choose an option: ")
+    if choice == "1":
+        pageTasks(archive.tasks())
+    elif choice == "2":
+        showArchivedTasks(archive.search(input("Search for: ")))
+    elif choice == "3":
+        archived = archive.tasks()
+        if not archived:
+            print("No archived tasks.")
+            return
+        numTasks = pageTasks(archived)
+        while True:
+            try:
+                number = int(input(f"Enter the task number to restore (1-{numTasks}): "))
+                if 1 <= number <= numTasks:
+                    break
+                print(f"Please enter a number between 1 and {numTasks}.")
+            except ValueError:
+                print("Please enter a valid number.")
+        task = archived[number - 1]
+        if archive.restore(tasks, task) is None:
+            print("That task is no longer in the archive.")
+        else:
+            print(f"Task '{task.title}' restored.")
+
+def switchList(workspaces):
+    """Show the task lists and switch to the one chosen (or a new one); returns its Workspace, or None."""
+    from displayUtils import showLists
+    from workspaces import WorkspaceError
+    
+    if workspaces is None:
+        print("Task lists are only available with JSON storage.")
+        return None
+    showLists(workspaces.overview(), workspaces.active.name)
+    name = input("List to switch to (a new name creates it, blank to stay): ").strip()
+    if not name:
+        return None
+    try:
+        return workspaces.switch(name)
+    except WorkspaceError as error:
+        print(error)
+        return None
+
+def showDueInAllLists(workspaces):
+    """Show the tasks due today in every task list."""
+    from displayUtils import showListTasks
+    
+    if workspaces is None:
+        print("Task lists are only available with JSON storage.")
+        return
+    showListTasks(workspaces.dueToday())
@@ -0,0 +1,165 @@
+# taskQuery.py
+"""
+Task queries for the Task Manager application.
+A Query combines filter conditions, an ordering on several keys (each
+ascending or descending) and an optional limit. Its conditions and its sort
+key are each built into a single function from small closures when the
+query is created, and
+a limit is served by heapq top-k selection (O(n log k)) instead of a full
+sort. Ties keep list order, like a stable sort.
+"""
+import heapq
+import operator
+from datetime import date
+from itertools import islice
+from operator import attrgetter
+from taskModel import Priority
+
+def foldedTitle(task):
+    """Return a task's title for case-insensitive comparison."""
+    return task.title.casefold()
+
+FIELDS = {  # Query field -> function reading it from a task
+    "title": foldedTitle,
+    "priority": attrgetter("priority"),
+    "dueDate": attrgetter("due"),
+    "completed": attrgetter("completed"),
+}
+ATTRIBUTES = {"priority": "priority", "dueDate": "due", "completed": "completed"}  # Fields read as plain attributes
+OPERATORS = {"==": operator.eq, "!=": operator.ne, "<": operator.lt,
+             "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+# Orders the TaskCollection indexes already keep, so no sorting is needed
+INDEXED_ORDERS = {(): None, (("priority", True),): "priority", (("dueDate", False),): "dueDate"}
+SORT_ORDERS = {None: (), "priority": ("priority:desc",), "dueDate": ("dueDate",)}  # The single-key sorts
+
+class QueryError(ValueError):
+    """Raised for an unknown field, operator or sort key."""
+
+class Descending:
+    """Sort key wrapper that reverses the order of values that cannot be negated, such as titles."""
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+def condition(read, compare, value):
+    """Return a function testing compare(read(task), value)."""
+    return lambda task: compare(read(task), value)
+
+def keyPart(field, descending):
+    """Return the function computing one field's part of a sort key."""
+    read = FIELDS[field]
+    if not descending:
+        return read
+    if field == "title":
+        return lambda task: Descending(read(task))
+    return lambda task: -read(task)
+
+def parseOrder(key):
+    """Split a sort key such as "priority:desc" into (field, descending); a leading '-' also means descending."""
+    key = key.strip()
+    field, _, direction = key.lstrip("+-").partition(":")
+    if field not in FIELDS or direction not in ("", "asc", "desc"):
+        raise QueryError(f"unknown sort key {key!r} (use {', '.join(FIELDS)}, with ':desc' for descending)")
+    return field, direction == "desc" or key.startswith("-")
+
+def parseOrderKeys(text):
+    """Split comma-separated sort keys such as "priority:desc,dueDate" into (field, descending) pairs."""
+    return tuple(parseOrder(key) for key in text.split(",") if key.strip())
+
+class Query:
+    """Filter conditions, a multi-key order and a limit, compiled once and run on any task list."""
+
+    def __init__(self, where=(), orderBy=(), limit=None):
+        self.where = list(where)  # (field, operator, value) tuples or functions of a task
+        self.orderBy = tuple(key if isinstance(key, tuple) else parseOrder(key) for key in orderBy)
+        self.limit = limit
+        self.matches = self.compileConditions()
+        self.key = self.compileKey()
+
+    def compileConditions(self):
+        """Return one function testing every condition, or None if there are none."""
+        tests = []
+        for where in self.where:
+            if callable(where):
+                tests.append(where)
+                continue
+            field, name, value = where
+            if field not in FIELDS:
+                raise QueryError(f"unknown field {field!r}")
+            if name not in OPERATORS:
+                raise QueryError(f"unknown operator {name!r}")
+            tests.append(condition(FIELDS[field], OPERATORS[name], value))
+        if not tests:
+            return None
+        if len(tests) == 1:
+            return tests[0]
+        return lambda task: all(test(task) for test in tests)
+
+    def compileKey(self):
+        """Return one function computing the whole sort key of a task, or None for list order."""
+        if not self.orderBy:
+            return None
+        if all(field in ATTRIBUTES and not descending for field, descending in self.orderBy):
+            # Plain ascending attributes: one attrgetter builds the whole key tuple in C
+            return attrgetter(*(ATTRIBUTES[field] for field, descending in self.orderBy))
+        parts = [keyPart(field, descending) for field, descending in self.orderBy]
+        if len(parts) == 1:
+            return parts[0]
+        return lambda task: tuple(part(task) for part in parts)
+
+    def run(self, tasks):
+        """Return the matching tasks of any iterable of tasks, in query order."""
+        if self.matches is not None:
+            tasks = filter(self.matches, tasks)
+        if self.key is None:
+            return list(tasks if self.limit is None else islice(tasks, self.limit))
+        if self.limit is None:
+            return sorted(tasks, key=self.key)
+        return heapq.nsmallest(self.limit, tasks, key=self.key)
+
+    def seqs(self, tasks, candidates=None):
+        """Return the sequence numbers of the matching tasks of a TaskCollection, in query order.
+
+        candidates, if given, restricts the query to those sequence numbers
+        (e.g. the matches of a text search).
+        """
+        if candidates is None and self.matches is None and self.orderBy in INDEXED_ORDERS:
+            # Read straight from the collection's sort index: O(k) for a limit of k
+            return list(islice(tasks.sortedSeqs(INDEXED_ORDERS[self.orderBy]), self.limit))
+        source = tasks if candidates is None else (tasks.get(seq) for seq in sorted(candidates))
+        seqById = tasks.seqById
+        return [seqById[task.id] for task in self.run(source)]
+
+def dueWithin(days, today=None):
+    """Condition for tasks due at most days from today, overdue ones included."""
+    return ("dueDate", "<=", (today or date.today().toordinal()) + days)
+
+def buildQuery(orderBy=(), pending=False, priority=None, dueWithinDays=None, limit=None):
+    """Build a Query from the options the console, command line and GUI offer.
+
+    orderBy is a list of sort keys (or (field, descending) pairs from
+    parseOrderKeys) or one comma-separated string such as "priority:desc,dueDate";
+    priority is a Priority or its name.
+    """
+    if isinstance(orderBy, str):
+        orderBy = parseOrderKeys(orderBy)
+    where = []
+    if pending:
+        where.append(("completed", "==", False))
+    if priority is not None:
+        level = Priority.parse(priority)
+        if level is None:
+            raise QueryError("priority must be high, medium or low")
+        where.append(("priority", "==", level))
+    if dueWithinDays is not None:
+        where.append(dueWithin(dueWithinDays))
+    if limit is not None and limit < 0:
+        raise QueryError("limit must not be negative")
+    return Query(where, orderBy, limit)
@@ -0,0 +1,121 @@
+# taskTable.py
+"""
+Columnar task table for bulk analytics over large task lists.
+Holds due-date ordinals, priority codes and completed flags in NumPy arrays
+and titles/descriptions/ids in offset-indexed string stores, so that sorting,
+"due today" and due-soon alerts run as vectorized masks and argsort instead
+of Python loops. The few recurring tasks and tasks with extra keys keep those
+by row, so every task converts back to the Task it came from, and "due today"
+also finds recurring tasks with an occurrence today. NumPy is optional; the
+rest of the application does not need it.
+"""
+from datetime import date
+from displayUtils import Colors, PRIORITY_COLORS, titleText
+from taskModel import Task, Priority, formatDate
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+class StringStore:
+    """Immutable list of strings kept as one UTF-8 buffer plus offsets."""
+
+    def __init__(self, strings):
+        encoded = [string.encode("utf-8") for string in strings]
+        self.data = b"".join(encoded)
+        self.offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=self.offsets[1:])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        return self.data[self.offsets[index]:self.offsets[index + 1]].decode("utf-8")
+
+class TaskTable:
+    """Read-only columnar view of a task list."""
+
+    def __init__(self, tasks):
+        if np is None:
+            raise ImportError("TaskTable requires NumPy (pip install numpy)")
+        count = len(tasks)
+        self.due = np.fromiter((task.due for task in tasks), dtype=np.int32, count=count)
+        self.priority = np.fromiter((task.priority for task in tasks), dtype=np.int8, count=count)
+        self.completed = np.fromiter((task.completed for task in tasks), dtype=np.bool_, count=count)
+        self.titles = StringStore([task.title for task in tasks])
+        self.descriptions = StringStore([task.description for task in tasks])
+        self.ids = StringStore([task.id or "" for task in tasks])
+        self.repeats = {index: task.repeat for index, task in enumerate(tasks) if task.repeat is not None}
+        self.extras = {index: task.extra for index, task in enumerate(tasks) if task.extra}
+
+    @classmethod
+    def fromFile(cls, filePath='tasks.json'):
+        """Build a table from the tasks returned by fileOperations.loadTasks."""
+        from fileOperations import loadTasks
+        return cls(loadTasks(filePath))
+
+    def __len__(self):
+        return len(self.due)
+
+    def task(self, index):
+        """Materialize the task at index as a Task object."""
+        return Task(
+            self.titles[index],
+            self.descriptions[index],
+            Priority(int(self.priority[index])),
+            int(self.due[index]),
+            bool(self.completed[index]),
+            self.extras.get(index),
+            self.ids[index] or None,
+            self.repeats.get(index),
+        )
+
+    def sortOrder(self, sortBy=None):
+        """Return row indices in the order displayUtils.sortTasks would produce."""
+        if sortBy == "priority":
+            # Negating keeps the sort stable while putting the highest priority first
+            return np.argsort(-self.priority, kind="stable")
+        elif sortBy == "dueDate":
+            return np.argsort(self.due, kind="stable")
+        return np.arange(len(self))
+
+    def dueTodayMask(self, today=None):
+        """Boolean mask of tasks due today, recurring tasks with an occurrence today included."""
+        today = today or date.today().toordinal()
+        mask = self.due == today
+        for index in self.repeats:
+            if self.due[index] < today and self.task(index).occursOn(today):
+                mask[index] = True
+        return mask
+
+    def alertMask(self, today=None):
+        """Boolean mask of unfinished tasks due within one day (or overdue)."""
+        return (self.due - (today or date.today().toordinal()) <= 1) & ~self.completed
+
+    def countAlerts(self, today=None):
+        """Number of tasks that would show the "(!)" alert."""
+        return int(np.count_nonzero(self.alertMask(today)))
+
+def showTable(table, filterToday=False, sortBy=None):
+    """Display a TaskTable like displayUtils.showTasks, filtering and sorting with NumPy."""
+    today = date.today().toordinal()
+    order = table.sortOrder(sortBy)
+    alerts = table.alertMask(today)[order]
+    positions = np.arange(1, len(order) + 1)
+    if filterToday:
+        keep = table.dueTodayMask(today)[order]
+        order, alerts, positions = order[keep], alerts[keep], positions[keep]
+
+    lines = []
+    for i, row, alert in zip(positions.tolist(), order.tolist(), alerts.tolist()):
+        priority = Priority(int(table.priority[row]))
+        status = "✔" if table.completed[row] else "✘"
+        title = titleText(table.task(row)) if row in table.repeats else table.titles[row]
+        lines.append(f"{PRIORITY_COLORS[priority]}{i}. {title} - {priority} - "
+                     f"{formatDate(int(table.due[row]))} [{status}]{' (!)' if alert else ''}{Colors.RESET}")
+    if lines:
+        print("\n".join(lines))
+    if alerts.any():
+        print(f"{Colors.RED}Warning! Some tasks are close to their due date.{Colors.RESET}")
+    return len(table)
\ No newline at end of file
@@ -0,0 +1,6 @@
+# __init__.py
+"""
+Behaviour checks for the Task Manager application.
+Run from the repository root with python -m pytest (or python -m unittest
+discover -s tests -t .).
+"""
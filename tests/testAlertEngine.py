@@ -0,0 +1,61 @@
+# testAlertEngine.py
+"""
+Checks which tasks show the due-soon alert as days pass and as tasks are
+added, edited, completed and deleted.
+"""
+import unittest
+from datetime import date, datetime
+from alertEngine import AlertEngine
+from taskCollection import TaskCollection
+from taskModel import Task, Priority
+
+TODAY = date(2025, 3, 10).toordinal()
+
+def task(title, due, completed=False):
+    return Task(title, "", Priority.LOW, due, completed)
+
+class AlertEngineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tasks = TaskCollection([task("overdue", TODAY - 3), task("tomorrow", TODAY + 1),
+                                     task("in three days", TODAY + 3), task("done", TODAY, True),
+                                     task("next week", TODAY + 7)])
+        self.engine = AlertEngine(self.tasks, TODAY)
+
+    def alerting(self):
+        return sorted(task.title for seq, task in self.tasks.bySeq.items() if self.engine.isAlerting(seq))
+
+    def testTasksDueWithinADayAlert(self):
+        self.assertEqual(self.alerting(), ["overdue", "tomorrow"])
+
+    def testAdvanceReturnsOnlyTheNewAlerts(self):
+        started = self.engine.advance(TODAY + 2)
+        self.assertEqual([self.tasks.get(seq).title for seq in started], ["in three days"])
+        self.assertEqual(self.engine.advance(TODAY + 2), [])
+        self.assertEqual(len(self.engine.advance(TODAY + 6)), 1)
+        self.assertEqual(self.alerting(), ["in three days", "next week", "overdue", "tomorrow"])
+
+    def testChangesMoveTasksInAndOut(self):
+        seq = self.tasks.seqAt(4)
+        self.tasks[4] = task("next week", TODAY)
+        self.engine.taskChanged(seq)
+        self.assertIn("next week", self.alerting())
+        self.tasks[1] = task("tomorrow", TODAY + 1, True)
+        self.engine.taskChanged(self.tasks.seqAt(1))
+        self.assertNotIn("tomorrow", self.alerting())
+        removed = self.tasks.seqAt(2)
+        self.tasks.pop(2)
+        self.engine.taskRemoved(removed)
+        self.assertEqual(self.engine.advance(TODAY + 5), [])  # Its heap entry is stale
+        self.tasks.append(task("added", TODAY + 2))
+        self.engine.taskChanged(self.tasks.seqAt(-1))
+        self.assertIn("added", self.alerting())
+
+    def testSecondsUntilNextChange(self):
+        now = datetime(2025, 3, 10, 18, 0)
+        self.assertEqual(self.engine.secondsUntilNextChange(now), 30 * 3600)  # From midnight two days on
+        self.engine.advance(TODAY + 6)
+        self.assertIsNone(self.engine.secondsUntilNextChange(now))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+# testApiServer.py
+"""
+Checks the REST API: the task routes and their error statuses, and, over a
+real connection, that malformed or oversized requests get an error response
+instead of hanging or dropping the connection.
+"""
+import asyncio
+import json
+import unittest
+from apiServer import TaskServer, MAX_BODY_SIZE
+from taskCollection import TaskCollection
+from taskModel import Task, Priority, parseDate
+
+class TaskRoutesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tasks = TaskCollection([Task("write report", "", Priority.MEDIUM, parseDate("03-03-2025")),
+                                     Task("call bank", "", Priority.HIGH, parseDate("05-03-2025"))])
+        self.saved = []
+        self.server = TaskServer(self.tasks, save=self.saved.append)
+
+    def request(self, method, target, data=None):
+        return self.server.respond(method, target, b"" if data is None else json.dumps(data).encode("utf-8"))
+
+    def testAddEditAndDelete(self):
+        status, added = self.request("POST", "/tasks", {"title": "pay rent", "dueDate": "01-03-2025"})
+        self.assertEqual((status, added["priority"], added["completed"]), (201, "medium", False))
+        target = "/tasks/" + added["id"]
+        status, edited = self.request("PATCH", target, {"priority": "high", "description": "by transfer"})
+        self.assertEqual((status, edited["title"], edited["priority"], edited["id"]), (200, "pay rent", "high", added["id"]))
+        self.assertEqual(self.request("GET", target), (200, edited))
+        self.assertEqual(self.request("DELETE", target)[0], 200)
+        self.assertEqual(self.request("GET", target)[0], 404)
+        self.assertEqual(len(self.tasks), 2)
+        self.server.flush()
+        self.assertEqual(self.saved, [self.tasks])  # Three changes, one save
+
+    def testListSortsAndPages(self):
+        self.request("POST", "/tasks", {"title": "pay rent", "dueDate": "01-03-2025", "priority": "low"})
+        status, page = self.request("GET", "/tasks?sort=dueDate&offset=1&limit=1")
+        self.assertEqual((status, page["total"], [task["title"] for task in page["tasks"]]), (200, 3, ["write report"]))
+        page = self.request("GET", "/tasks?sort=priority")[1]
+        self.assertEqual([task["title"] for task in page["tasks"]], ["call bank", "write report", "pay rent"])
+
+    def testErrors(self):
+        self.assertEqual(self.request("GET", "/tasks?sort=title")[0], 400)
+        self.assertEqual(self.request("GET", "/tasks?limit=-1")[0], 400)
+        self.assertEqual(self.server.respond("POST", "/tasks", b"{not json")[0], 400)
+        self.assertEqual(self.request("POST", "/tasks", {"title": "no date"})[0], 400)
+        self.assertEqual(self.request("POST", "/tasks", {"title": "x", "dueDate": "31-02-2025"})[0], 400)
+        self.assertEqual(self.request("POST", "/tasks", {"title": "x", "dueDate": "01-03-2025", "priority": "urgent"})[0], 400)
+        self.assertEqual(self.request("DELETE", "/tasks")[0], 405)
+        self.assertEqual(self.request("GET", "/projects")[0], 404)
+        self.assertEqual(len(self.tasks), 2)
+
+class ConnectionTest(unittest.TestCase):
+
+    def exchange(self, data):
+        """Send raw bytes to a running server and return everything it answers before closing."""
+        async def run():
+            server = TaskServer(TaskCollection(), save=lambda tasks: None)
+            listening = asyncio.get_running_loop().create_future()
+            serving = asyncio.create_task(server.serve("127.0.0.1", 0, listening.set_result))
+            port = (await listening).sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(data)
+            await writer.drain()
+            response = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            serving.cancel()
+            try:
+                await serving
+            except asyncio.CancelledError:
+                pass
+            return response
+        return asyncio.run(run())
+
+    def status(self, response):
+        return int(response.split(b" ", 2)[1])
+
+    def testBadContentLengthGetsBadRequest(self):
+        for length in (b"abc", b"-5", b"1.5"):
+            response = self.exchange(b"POST /tasks HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n{}")
+            self.assertEqual(self.status(response), 400, length)
+            self.assertIn(b"Content-Length", response)
+
+    def testOversizedBodyIsRefusedBeforeItIsRead(self):
+        head = f"POST /tasks HTTP/1.1\r\nContent-Length: {MAX_BODY_SIZE + 1}\r\n\r\n".encode("latin-1")
+        self.assertEqual(self.status(self.exchange(head)), 413)
+
+    def testMalformedRequestLine(self):
+        self.assertEqual(self.status(self.exchange(b"GARBAGE\r\n\r\n")), 400)
+
+    def testKeepAliveServesSeveralRequests(self):
+        body = b'{"title": "a", "dueDate": "01-03-2025"}'
+        response = self.exchange(b"POST /tasks HTTP/1.1\r\nContent-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+                                 + b"GET /tasks HTTP/1.1\r\nConnection: close\r\n\r\n")
+        self.assertEqual(response.count(b"HTTP/1.1 "), 2)
+        self.assertIn(b'"total":1', response)
+
+if __name__ == "__main__":
+    unittest.main()
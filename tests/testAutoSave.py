@@ -0,0 +1,76 @@
+# testAutoSave.py
+"""
+Checks that the autosaver folds the journal into a new snapshot once
+changes pause, and that a snapshot overtaken by a later change is dropped
+instead of losing that change.
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import fileOperations
+from autoSave import startAutoSave
+from fileOperations import writeSnapshot, loadTasks, openJournal, closeJournal, recordChange, journalPath
+from taskModel import Task, Priority
+
+class AutoSaveTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "tasks.json")
+        writeSnapshot([Task("a", "", Priority.LOW, 739000)], self.path)
+        self.tasks = loadTasks(self.path)
+        openJournal(self.tasks, self.path)
+        self.saver = startAutoSave(delay=0)
+
+    def tearDown(self):
+        self.saver.close()
+        closeJournal()
+        for loaded in (fileOperations.loadedStamps, fileOperations.loadedJournals, fileOperations.loadedBases):
+            loaded.pop(self.path, None)
+        shutil.rmtree(self.directory)
+
+    def add(self, title):
+        task = Task(title, "", Priority.LOW, 739000)
+        self.tasks.append(task)
+        recordChange("add", task=task)
+        self.saver.changed()
+
+    def pollUntilSaved(self):
+        for attempt in range(500):
+            saved = self.saver.poll()
+            if saved is not None:
+                return saved
+            time.sleep(0.01)
+        self.fail("no snapshot was written")
+
+    def snapshotTitles(self):
+        with open(self.path, 'r', encoding="utf-8") as file:
+            return [item["title"] for item in json.load(file)]
+
+    def testNothingToSaveWithoutAJournal(self):
+        closeJournal()
+        self.assertIsNone(startAutoSave())
+
+    def testSnapshotFoldsTheJournal(self):
+        self.add("b")
+        self.add("c")
+        self.assertEqual(self.pollUntilSaved(), 2)
+        self.assertEqual(self.snapshotTitles(), ["a", "b", "c"])
+        with open(journalPath(self.path), 'rb') as file:
+            self.assertEqual(len(file.read().splitlines()), 1)  # Only the header is left
+        self.assertIsNone(self.saver.poll())  # Nothing new to save
+
+    def testChangeWhileSavingMakesTheSnapshotStale(self):
+        self.add("b")
+        self.saver.poll()  # Hands the snapshot to the worker
+        self.add("c")  # Journaled before the snapshot is installed
+        self.assertEqual(self.pollUntilSaved(), 2)
+        self.assertEqual(self.snapshotTitles(), ["a", "b", "c"])
+        fileOperations.loadedStamps.pop(self.path, None)
+        self.assertEqual([task.title for task in loadTasks(self.path)], ["a", "b", "c"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+# testBinaryTasks.py
+"""
+Checks that tasks survive the binary format unchanged, read whole or
+through the memory map, and that the mapped views answer like a list.
+"""
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from binaryTasks import encodeTasks, decodeTasks, openMapped
+from fileOperations import writeSnapshot, loadTasks, closeJournal
+from taskCollection import TaskCollection
+from taskModel import Task, Priority, Recurrence
+
+def sampleTasks(count=200, seed=4):
+    """Return tasks using every field: unicode text, ids, extra keys and repeat rules."""
+    rng = random.Random(seed)
+    tasks = []
+    for i in range(count):
+        due = 739000 + rng.randrange(60)
+        repeat = Recurrence.fromText(rng.choice(("daily", "every 2 weeks", "monthly")), due,
+                                     due + 90 if i % 2 else None) if i % 5 == 0 else None
+        tasks.append(Task(f"Tâche {i} ✓", "" if i % 3 else f"détails {i}", rng.choice(list(Priority)), due,
+                          rng.random() < 0.3, {"tag": i, "nested": [1, "a"]} if i % 7 == 0 else None,
+                          f"id-{i}" if i % 11 else None, repeat))
+    return tasks
+
+class BinaryTasksTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "tasks.bin")
+
+    def tearDown(self):
+        closeJournal()
+        shutil.rmtree(self.directory)
+
+    def testEncodeDecodeKeepsEveryField(self):
+        tasks = sampleTasks()
+        self.assertEqual(list(decodeTasks(encodeTasks(tasks))), tasks)
+        self.assertEqual(list(decodeTasks(encodeTasks([]))), [])
+
+    def testMappedFileMatchesTheTasks(self):
+        tasks = sampleTasks()
+        with open(self.path, 'wb') as file:
+            file.write(encodeTasks(tasks))
+        collection = TaskCollection(sampleTasks())
+        with openMapped(self.path) as mapped:
+            self.assertEqual(len(mapped), len(tasks))
+            self.assertEqual(list(mapped), tasks)
+            self.assertEqual(mapped[-1], tasks[-1])
+            for sortBy in (None, "priority", "dueDate"):
+                # The collection gives id-less tasks an id, so the orders are compared by title
+                self.assertEqual([task.title for task in mapped.sortedBy(sortBy)],
+                                 [task.title for task in collection.sortedBy(sortBy)])
+            for day in range(739000, 739070, 3):
+                expected = [index for index, task in enumerate(tasks) if task.occursOn(day)]
+                self.assertEqual(mapped.dueOn(day), expected)
+                self.assertEqual(mapped.countDueOn(day), len(expected))
+
+    def testCloseWithALiveSortedByIterator(self):
+        with open(self.path, 'wb') as file:
+            file.write(encodeTasks(sampleTasks(10)))
+        with openMapped(self.path) as mapped:
+            remaining = iter(mapped.sortedBy("priority"))
+            next(remaining)
+        with self.assertRaises(ValueError):
+            next(remaining)
+
+    def testSnapshotRoundTripThroughLoadTasks(self):
+        tasks = [task for task in sampleTasks() if task.id is not None]
+        writeSnapshot(tasks, self.path)
+        self.assertEqual(list(loadTasks(self.path)), tasks)
+
+if __name__ == "__main__":
+    unittest.main()
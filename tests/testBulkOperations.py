@@ -0,0 +1,90 @@
+# testBulkOperations.py
+"""
+Checks that tasks exported to CSV or NDJSON import back unchanged, and that
+invalid rows are reported by row number instead of stopping the import.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from bulkOperations import importTasks, exportTasks
+from taskCollection import TaskCollection
+from taskModel import Task, Priority, Recurrence, parseDate
+
+def sampleTasks():
+    due = parseDate("31-01-2025")
+    return [
+        Task("Pay rent", "by transfer", Priority.HIGH, due, repeat=Recurrence.fromText("monthly", due)),
+        Task("Read, then \"summarize\"", "line one\nline two", Priority.MEDIUM, parseDate("02-02-2025"), True),
+        Task("Water plants", "", Priority.LOW, parseDate("29-02-2024")),
+    ]
+
+def fields(task):
+    return (task.title, task.description, task.priority, task.due, task.completed, str(task.repeat or ""))
+
+class BulkOperationsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def write(self, name, text):
+        with open(self.path(name), 'w', encoding="utf-8") as file:
+            file.write(text)
+        return self.path(name)
+
+    def assertRoundTrip(self, name):
+        tasks = TaskCollection(sampleTasks())
+        self.assertEqual(exportTasks(tasks, self.path(name), chunkSize=2), 3)
+        imported = TaskCollection()
+        report = importTasks(imported, self.path(name), chunkSize=2)
+        self.assertEqual((report.accepted, report.rejected), (3, []))
+        self.assertEqual([fields(task) for task in imported], [fields(task) for task in tasks])
+
+    def testCsvRoundTrip(self):
+        self.assertRoundTrip("tasks.csv")
+
+    def testNdjsonRoundTrip(self):
+        self.assertRoundTrip("tasks.ndjson")
+
+    def testImportedTasksGetNewIds(self):
+        tasks = TaskCollection(sampleTasks())
+        exportTasks(tasks, self.path("tasks.ndjson"))
+        imported = TaskCollection()
+        importTasks(imported, self.path("tasks.ndjson"))
+        self.assertEqual(len({task.id for task in imported} | {task.id for task in tasks}), 6)
+
+    def testInvalidCsvRowsAreRejectedByRowNumber(self):
+        path = self.write("tasks.csv", "title,description,priority,dueDate,completed\n"
+                                       "ok,,High,01-03-2025,no\n"
+                                       ",no title,Low,01-03-2025,no\n"
+                                       "bad priority,,urgent,01-03-2025,no\n"
+                                       "bad date,,Low,2025-03-01,no\n"
+                                       "bad completed,,Low,01-03-2025,maybe\n"
+                                       "also ok,,low ,02-03-2025,yes\n")
+        tasks = TaskCollection()
+        report = importTasks(tasks, path)
+        self.assertEqual(report.accepted, 2)
+        self.assertEqual([number for number, reason in report.rejected], [3, 4, 5, 6])
+        self.assertIn("missing title", report.rejected[0][1])
+        self.assertEqual([(task.title, task.priority, task.completed) for task in tasks],
+                         [("ok", Priority.HIGH, False), ("also ok", Priority.LOW, True)])
+
+    def testMalformedNdjsonLineIsRejected(self):
+        path = self.write("tasks.ndjson", '{"title": "a", "priority": "Low", "dueDate": "01-03-2025"}\n'
+                                          '{"title": \n'
+                                          '\n'
+                                          '["not", "a", "task"]\n')
+        tasks = TaskCollection()
+        report = importTasks(tasks, path)
+        self.assertEqual(report.accepted, 1)
+        self.assertEqual([number for number, reason in report.rejected], [2, 4])
+        self.assertTrue(report.rejected[0][1].startswith("malformed JSON"))
+
+if __name__ == "__main__":
+    unittest.main()
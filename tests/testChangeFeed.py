@@ -0,0 +1,113 @@
+# testChangeFeed.py
+"""
+Checks that deltas written by exportChanges bring another copy of a store
+up to date through applyChanges, including overlapping and out-of-order
+deltas.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import fileOperations
+from bulkOperations import exportChanges, applyChanges
+from fileOperations import (writeSnapshot, loadTasks, openJournal, activateJournal, closeJournal, recordChange,
+                            recordChanges)
+from taskModel import Task, Priority, Recurrence
+
+class ChangeFeedTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.paths = []
+        self.source, self.sourceJournal = self.openStore("source", [
+            Task(f"t{number}", "", Priority.LOW, 739000 + number, id=f"t{number}") for number in range(5)])
+        self.copy, self.copyJournal = self.openStore("copy", [])
+        self.deltaPath = os.path.join(self.directory, "delta.ndjson")
+
+    def tearDown(self):
+        for journal in (self.sourceJournal, self.copyJournal):
+            closeJournal(journal)
+        for path in self.paths:
+            for loaded in (fileOperations.loadedStamps, fileOperations.loadedJournals, fileOperations.loadedBases):
+                loaded.pop(path, None)
+        shutil.rmtree(self.directory)
+
+    def openStore(self, name, tasks):
+        """Create a journaled store holding tasks; returns (tasks, journal)."""
+        os.mkdir(os.path.join(self.directory, name))
+        path = os.path.join(self.directory, name, "tasks.json")
+        self.paths.append(path)
+        writeSnapshot(tasks, path)
+        tasks = loadTasks(path)
+        return tasks, openJournal(tasks, path, closeActive=False)
+
+    def export(self, since=0):
+        activateJournal(self.sourceJournal)
+        return exportChanges(self.source, self.sourceJournal.feed, self.deltaPath, since)
+
+    def apply(self):
+        activateJournal(self.copyJournal)
+        return applyChanges(self.copy, self.deltaPath, self.copyJournal.filePath, self.copyJournal.feed.id())
+
+    def changeSource(self, step):
+        """Add, edit and delete a few source tasks, journaling each change."""
+        activateJournal(self.sourceJournal)
+        added = Task(f"new {step}", "", Priority.HIGH, 739100, repeat=Recurrence.fromText("weekly", 739100))
+        self.source.append(added)
+        recordChange("add", task=added)
+        seq = self.source.seqAt(0)
+        old = self.source.get(seq)
+        self.source.replaceSeq(seq, Task(old.title + " edited", "note", old.priority, old.due, True, id=old.id))
+        recordChange("edit", task=self.source.get(seq))
+        recordChanges([("delete", None, self.source.removeSeq(self.source.seqAt(1)))])
+
+    def assertCopyMatches(self):
+        self.assertEqual({task.id: task.toDict() for task in self.copy},
+                         {task.id: task.toDict() for task in self.source})
+
+    def testFullThenIncrementalDeltas(self):
+        written, version = self.export()
+        self.assertEqual(written, 5)
+        self.assertEqual(self.apply(), (5, version))
+        self.assertCopyMatches()
+        self.changeSource(1)
+        self.changeSource(2)
+        written, newVersion = self.export(since=version)
+        self.assertGreater(newVersion, version)
+        self.apply()
+        self.assertCopyMatches()
+        # The copy's own journal kept the applied changes
+        fileOperations.loadedStamps.pop(self.copyJournal.filePath, None)
+        reloaded, stamp, header, offset = fileOperations.readTaskFile(self.copyJournal.filePath)
+        self.assertEqual({task.id: task.toDict() for task in reloaded}, {task.id: task.toDict() for task in self.copy})
+
+    def testOverlappingDeltaAppliesOnlyNewChanges(self):
+        self.export()
+        self.apply()
+        self.changeSource(1)
+        self.export()  # From version 0 again
+        applied, version = self.apply()
+        self.assertEqual(applied, 3)  # Only the add, the edit and the delete
+        self.assertCopyMatches()
+        self.export()
+        self.assertEqual(self.apply()[0], 0)
+
+    def testDeltaWithAGapIsRefused(self):
+        self.export()
+        self.apply()
+        self.changeSource(1)
+        skipped = self.sourceJournal.feed.version()  # The changes up to here never reach the copy
+        self.changeSource(2)
+        self.export(since=skipped)
+        with self.assertRaises(ValueError):
+            self.apply()
+        self.assertNotEqual({task.id for task in self.copy}, {task.id for task in self.source})
+
+    def testOwnDeltaIsRefused(self):
+        self.export()
+        activateJournal(self.sourceJournal)
+        with self.assertRaises(ValueError):
+            applyChanges(self.source, self.deltaPath, self.sourceJournal.filePath, self.sourceJournal.feed.id())
+
+if __name__ == "__main__":
+    unittest.main()
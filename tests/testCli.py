@@ -0,0 +1,108 @@
+# testCli.py
+"""
+Checks the command-line interface: commands chained with ';' or read from a
+batch file change the task list, and a failing command is reported without
+stopping the others.
+"""
+import contextlib
+import io
+import os
+import re
+import shutil
+import tempfile
+import unittest
+from cli import runCommands, splitCommands, changesTasks
+from taskCollection import TaskCollection
+from taskModel import Priority, formatDate
+
+COLOR_CODE = re.compile(r"\x1b\[\d+m")
+TASK_LINE = re.compile(r"(\d+)\. (.*?) - ")
+
+class CliTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tasks = TaskCollection()
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def runLine(self, *argv):
+        """Run a command line; returns (failures, stdout, stderr)."""
+        output, errors = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(errors):
+            failures = runCommands(self.tasks, list(argv))
+        return failures, COLOR_CODE.sub("", output.getvalue()), errors.getvalue()
+
+    def shown(self, *argv):
+        """Return the (number, title) pairs a command shows."""
+        return [(int(number), title) for number, title in TASK_LINE.findall(self.runLine(*argv)[1])]
+
+    def addSamples(self):
+        self.runLine("add", "write report", "--due", "03-03-2030", "--priority", "medium", ";",
+                     "add", "call bank", "--due", "01-03-2030", "--priority", "high", "--description", "about the loan", ";",
+                     "add", "water plants", "--due", "02-03-2030", "--priority", "low")
+
+    def testChainedCommands(self):
+        self.addSamples()
+        self.assertEqual([(task.title, task.priority, formatDate(task.due)) for task in self.tasks],
+                         [("write report", Priority.MEDIUM, "03-03-2030"), ("call bank", Priority.HIGH, "01-03-2030"),
+                          ("water plants", Priority.LOW, "02-03-2030")])
+        self.assertEqual(self.runLine("edit", "1", "--completed", "yes", "--title", "send report", ";", "delete", "2")[0], 0)
+        self.assertEqual([(task.title, task.completed) for task in self.tasks],
+                         [("send report", True), ("water plants", False)])
+        self.assertEqual(self.shown("list"), [(1, "send report"), (2, "water plants")])
+
+    def testFailingCommandDoesNotStopTheOthers(self):
+        self.addSamples()
+        failures, output, errors = self.runLine("delete", "7", ";", "add", "late", "--due", "31-02-2030", ";",
+                                                "frobnicate", ";", "delete", "1")
+        self.assertEqual(failures, 3)
+        self.assertIn("error: command 1 (delete 7): task number must be between 1 and 3", errors)
+        self.assertIn("error: command 2", errors)
+        self.assertIn("error: command 3", errors)
+        self.assertEqual([task.title for task in self.tasks], ["call bank", "water plants"])
+
+    def testBatchFile(self):
+        path = os.path.join(self.directory, "commands.txt")
+        with open(path, 'w', encoding="utf-8") as file:
+            file.write("# weekly chores\n"
+                       "add 'clean the desk' --due 04-03-2030\n"
+                       "\n"
+                       "add \"take out bins\" --due 05-03-2030 --priority high\n"
+                       "edit 1 --description 'and the shelf'\n")
+        self.assertEqual(self.runLine("batch", path)[0], 0)
+        self.assertEqual([(task.title, task.description) for task in self.tasks],
+                         [("clean the desk", "and the shelf"), ("take out bins", "")])
+
+    def testSearchShowsListNumbers(self):
+        self.addSamples()
+        self.assertEqual(self.shown("search", "ba", "lo"), [(2, "call bank")])
+
+    def testSortedViewsShowTheNumbersEditTakes(self):
+        self.addSamples()
+        self.assertEqual(self.shown("sort", "priority"), [(2, "call bank"), (1, "write report"), (3, "water plants")])
+        self.assertEqual(self.shown("list", "--sort", "dueDate"), [(2, "call bank"), (3, "water plants"), (1, "write report")])
+        self.runLine("edit", "2", "--title", "call the bank")
+        self.assertEqual(self.tasks[1].title, "call the bank")
+
+    def testQueryOrderAndLimit(self):
+        self.addSamples()
+        self.assertEqual(self.shown("query", "--sort", "priority:desc,dueDate", "--limit", "2"),
+                         [(2, "call bank"), (1, "write report")])
+        self.assertEqual(self.shown("query", "--sort", "dueDate:desc", "--pending"),
+                         [(1, "write report"), (3, "water plants"), (2, "call bank")])
+        self.assertEqual(self.runLine("query", "--sort", "due")[0], 1)
+
+    def testOnlyChangingCommandsMayArchive(self):
+        self.assertFalse(changesTasks(["list", ";", "search", "bank", ";", "query", "--limit", "3", ";", "export", "x.csv"]))
+        self.assertTrue(changesTasks(["list", ";", "edit", "1", "--completed", "yes"]))
+        self.assertTrue(changesTasks(["batch", "commands.txt"]))
+        self.assertTrue(changesTasks([]))
+
+    def testSplitCommands(self):
+        self.assertEqual(splitCommands(["list", ";", ";", "add", "x", ";"]), [["list"], ["add", "x"]])
+        self.assertEqual(splitCommands([]), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+# testJournal.py
+"""
+Checks the change journal: journaled changes are replayed when the task
+file is loaded again, a big journal is folded into a new snapshot, and two
+processes sharing one task file merge their changes. The other process is a
+real subprocess, so the file lock, the journal and the in-memory state are
+exercised as in normal use.
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+import fileOperations
+from fileOperations import (writeSnapshot, loadTasks, openJournal, closeJournal, recordChange, syncTasks,
+                            journalPath)
+from taskModel import Task, Priority
+
+def task(title):
+    return Task(title, "", Priority.LOW, 739000)
+
+class JournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "tasks.json")
+        writeSnapshot([task("a"), task("b")], self.path)
+        self.tasks = loadTasks(self.path)
+        openJournal(self.tasks, self.path)
+
+    def tearDown(self):
+        closeJournal()
+        for loaded in (fileOperations.loadedStamps, fileOperations.loadedJournals, fileOperations.loadedBases):
+            loaded.pop(self.path, None)
+        shutil.rmtree(self.directory)
+
+    def reloaded(self):
+        """Return the titles of the task file as a new process would load it."""
+        return [task.title for task in loadTasks(self.path)]
+
+    def snapshotTitles(self):
+        with open(self.path, 'r', encoding="utf-8") as file:
+            return [task["title"] for task in json.load(file)]
+
+    def change(self):
+        self.tasks.append(task("c"))
+        recordChange("add", task=self.tasks[-1])
+        self.tasks[0] = task("a edited")
+        recordChange("edit", 0, self.tasks[0])
+        self.tasks.pop(1)
+        recordChange("delete", 1)
+
+    def testChangesAreReplayedOnLoad(self):
+        self.change()
+        self.assertEqual(self.snapshotTitles(), ["a", "b"])  # Nothing rewritten yet
+        self.assertEqual(self.reloaded(), ["a edited", "c"])
+
+    def testTornLastEntryIsIgnored(self):
+        self.change()
+        with open(journalPath(self.path), 'a', encoding="utf-8") as file:
+            file.write('{"action": "add", "task": {"tit')
+        self.assertEqual(self.reloaded(), ["a edited", "c"])
+
+    def testJournalOfAnOlderSnapshotIsIgnored(self):
+        self.change()
+        closeJournal()
+        writeSnapshot([task("replaced")], self.path)  # Written by a version that knew no journal
+        self.assertEqual(self.reloaded(), ["replaced"])
+
+    def testBigJournalIsFoldedIntoASnapshot(self):
+        closeJournal()
+        openJournal(self.tasks, self.path, compactSize=500)
+        for number in range(20):
+            self.tasks.append(task(f"t{number}"))
+            recordChange("add", task=self.tasks[-1])
+        self.assertGreater(len(self.snapshotTitles()), 2)
+        self.assertLess(os.path.getsize(journalPath(self.path)), 1000)
+        self.assertEqual(self.reloaded(), [task.title for task in self.tasks])
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OTHER_PROCESS = """
+import sys
+from fileOperations import loadTasks, openJournal, closeJournal, recordChange
+from taskModel import Task, Priority
+path, command, argument = sys.argv[1:]
+tasks = loadTasks(path)
+openJournal(tasks, path)
+if command == "retitle":
+    taskId, title = argument.split("=")
+    seq = tasks.seqById[taskId]
+    old = tasks.get(seq)
+    tasks.replaceSeq(seq, Task(title, old.description, old.priority, old.due, id=old.id))
+    recordChange("edit", task=tasks.get(seq))
+elif command == "add":
+    for number in range(int(argument)):
+        task = Task(f"other {number}", "", Priority.LOW, 739000)
+        tasks.append(task)
+        recordChange("add", task=task)
+closeJournal()
+"""
+
+def otherProcess(path, command, argument):
+    """Run one change in a separate process using the same task file."""
+    subprocess.run([sys.executable, "-c", OTHER_PROCESS, path, command, argument], cwd=ROOT, check=True)
+
+class JournalMergeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "tasks.json")
+        writeSnapshot([Task("a", "", Priority.LOW, 739000, id="a"), Task("b", "", Priority.HIGH, 739001, id="b")],
+                      self.path)
+        self.tasks = loadTasks(self.path)
+        openJournal(self.tasks, self.path)
+
+    def tearDown(self):
+        closeJournal()
+        for loaded in (fileOperations.loadedStamps, fileOperations.loadedJournals, fileOperations.loadedBases):
+            loaded.pop(self.path, None)
+        shutil.rmtree(self.directory)
+
+    def retitle(self, taskId, title):
+        seq = self.tasks.seqById[taskId]
+        old = self.tasks.get(seq)
+        self.tasks.replaceSeq(seq, Task(title, old.description, old.priority, old.due, id=old.id))
+        recordChange("edit", task=self.tasks.get(seq))
+
+    def reloaded(self):
+        """Return {id: title} of the task file as a new process would load it."""
+        fileOperations.loadedStamps.pop(self.path, None)
+        tasks, stamp, header, offset = fileOperations.readTaskFile(self.path)
+        return {task.id: task.title for task in tasks}
+
+    def testLastEditWins(self):
+        self.retitle("a", "first")
+        otherProcess(self.path, "retitle", "a=second")
+        syncTasks()
+        self.assertEqual(self.tasks.getById("a").title, "second")
+        self.assertEqual(self.reloaded(), {"a": "second", "b": "b"})
+        self.retitle("a", "third")
+        self.assertEqual(self.reloaded(), {"a": "third", "b": "b"})
+
+    def testEditsOfDifferentTasksAreBothKept(self):
+        otherProcess(self.path, "retitle", "b=theirs")
+        self.retitle("a", "ours")  # Recorded without syncing first: the journal catches up before appending
+        self.assertEqual({task.id: task.title for task in self.tasks}, {"a": "ours", "b": "theirs"})
+        self.assertEqual(self.reloaded(), {"a": "ours", "b": "theirs"})
+
+    def testAddsFromBothProcessesKeepUniqueIds(self):
+        for number in range(20):
+            task = Task(f"ours {number}", "", Priority.MEDIUM, 739000)
+            self.tasks.append(task)
+            recordChange("add", task=task)
+        otherProcess(self.path, "add", "20")
+        syncTasks()
+        ids = [task.id for task in self.tasks]
+        self.assertEqual(len(ids), 42)
+        self.assertEqual(len(set(ids)), 42)
+        self.assertEqual(set(self.reloaded()), set(ids))
+
+if __name__ == "__main__":
+    unittest.main()
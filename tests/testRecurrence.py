@@ -0,0 +1,58 @@
+# testRecurrence.py
+"""
+Checks Recurrence occurrences, in particular monthly rules anchored on a
+day that some months do not have.
+"""
+import unittest
+from taskModel import Task, Priority, Recurrence, parseDate, formatDate, finishOccurrence
+
+def day(text):
+    return parseDate(text)
+
+class RecurrenceTest(unittest.TestCase):
+
+    def testMonthlyOnThe31stFallsOnTheLastDayOfShorterMonths(self):
+        rule = Recurrence.fromText("monthly", day("31-01-2024"))
+        dates = [formatDate(occurrence) for occurrence in rule.occurrences(day("01-01-2024"), day("31-05-2024"))]
+        self.assertEqual(dates, ["31-01-2024", "29-02-2024", "31-03-2024", "30-04-2024", "31-05-2024"])
+        self.assertTrue(rule.occursOn(day("29-02-2024")))
+        self.assertFalse(rule.occursOn(day("28-02-2024")))
+        self.assertFalse(rule.occursOn(day("01-03-2024")))
+
+    def testNextAfterCrossesMonthAndYearEnds(self):
+        rule = Recurrence.fromText("every 2 months", day("31-12-2025"))
+        self.assertEqual(formatDate(rule.nextAfter(day("31-12-2025"))), "28-02-2026")
+        self.assertEqual(formatDate(rule.nextAfter(day("28-02-2026"))), "30-04-2026")
+        self.assertEqual(formatDate(rule.nextAfter(day("15-11-2026"))), "31-12-2026")
+
+    def testDailyAndWeeklyRulesStepFromTheAnchor(self):
+        weekly = Recurrence.fromText("weekly", day("29-01-2025"))
+        self.assertEqual(formatDate(weekly.nextAfter(day("29-01-2025"))), "05-02-2025")
+        self.assertTrue(weekly.occursOn(day("26-02-2025")))
+        self.assertFalse(weekly.occursOn(day("22-01-2025")))  # Before the anchor
+        everyThreeDays = Recurrence.fromText("every 3 days", day("30-12-2024"))
+        self.assertEqual(formatDate(everyThreeDays.nextAfter(day("30-12-2024"))), "02-01-2025")
+
+    def testUntilEndsTheSeries(self):
+        rule = Recurrence.fromText("monthly", day("31-01-2025"), day("31-03-2025"))
+        self.assertEqual(formatDate(rule.nextAfter(day("31-01-2025"))), "28-02-2025")
+        self.assertEqual(formatDate(rule.nextAfter(day("28-02-2025"))), "31-03-2025")
+        self.assertIsNone(rule.nextAfter(day("31-03-2025")))
+        self.assertFalse(rule.occursOn(day("30-04-2025")))
+
+    def testTaskOccursOnLaterOccurrencesUntilCompleted(self):
+        due = day("31-01-2025")
+        task = Task("rent", "", Priority.HIGH, due, repeat=Recurrence.fromText("monthly", due))
+        self.assertTrue(task.occursOn(day("28-02-2025")))
+        task.completed = True
+        self.assertFalse(task.occursOn(day("28-02-2025")))
+
+    def testFinishingAnOccurrenceMovesToTheNextOne(self):
+        due = day("31-01-2025")
+        task = Task("rent", "", Priority.HIGH, due, True, repeat=Recurrence.fromText("monthly", due))
+        moved = finishOccurrence(task, today=due)
+        self.assertEqual(formatDate(moved.due), "28-02-2025")
+        self.assertFalse(moved.completed)
+
+if __name__ == "__main__":
+    unittest.main()
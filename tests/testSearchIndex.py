@@ -0,0 +1,84 @@
+# testSearchIndex.py
+"""
+Checks prefix search through the inverted index, in particular that it
+stays correct as tasks are added, edited and deleted, and that a saved index
+is only reused for the file it was saved with.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import fileOperations
+from fileOperations import writeSnapshot, loadTasks, saveTasks
+from searchIndex import searchTasks, loadIndex
+from taskCollection import TaskCollection
+from taskModel import Task, Priority
+
+def task(title, description=""):
+    return Task(title, description, Priority.LOW, 739000)
+
+class SearchIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tasks = TaskCollection([task("Buy milk", "and bread"), task("Call the bank"),
+                                     task("Buy stamps"), task("Bake bread")])
+
+    def titles(self, query):
+        return [self.tasks.get(seq).title for seq in searchTasks(self.tasks, query)]
+
+    def testWordsMatchByPrefixInListOrder(self):
+        self.assertEqual(self.titles("bu"), ["Buy milk", "Buy stamps"])
+        self.assertEqual(self.titles("BREAD"), ["Buy milk", "Bake bread"])
+        self.assertEqual(self.titles("b br"), ["Buy milk", "Bake bread"])
+        self.assertEqual(self.titles("buy bank"), [])
+        self.assertEqual(self.titles("   "), [])
+
+    def testSearchFollowsAddsEditsAndDeletes(self):
+        self.assertEqual(self.titles("bread"), ["Buy milk", "Bake bread"])  # Builds the index
+        self.tasks.append(task("Bread knife"))
+        self.tasks[0] = task("Buy oat milk")
+        self.tasks.pop(3)  # Bake bread
+        self.assertEqual(self.titles("bread"), ["Bread knife"])
+        self.assertEqual(self.titles("oat"), ["Buy oat milk"])
+        self.assertEqual(self.titles("ba"), ["Call the bank"])
+        self.tasks.pop(0)
+        self.assertEqual(self.titles("bu"), ["Buy stamps"])
+        self.assertEqual(self.titles("milk"), [])
+
+    def testManyMatchesAreFilteredByTheRarestWord(self):
+        self.tasks.extend(task(f"report {number}") for number in range(100))
+        self.tasks.append(task("report urgent"))
+        self.assertEqual(self.titles("rep urg"), ["report urgent"])
+
+class SavedIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "tasks.json")
+        writeSnapshot([task("Buy milk"), task("Call the bank"), task("Buy stamps")], self.path)
+
+    def tearDown(self):
+        for loaded in (fileOperations.loadedStamps, fileOperations.loadedJournals, fileOperations.loadedBases):
+            loaded.pop(self.path, None)
+        shutil.rmtree(self.directory)
+
+    def testSavedIndexIsReusedAfterDeletes(self):
+        tasks = loadTasks(self.path)
+        searchTasks(tasks, "buy")
+        tasks.pop(0)
+        saveTasks(tasks, self.path)
+        tasks.textIndex.save(tasks, self.path)
+        reloaded = loadTasks(self.path)
+        self.assertIsNotNone(loadIndex(reloaded, self.path))
+        self.assertEqual([reloaded.get(seq).title for seq in searchTasks(reloaded, "b")],
+                         ["Call the bank", "Buy stamps"])
+
+    def testIndexOfAnotherFileVersionIsIgnored(self):
+        tasks = loadTasks(self.path)
+        searchTasks(tasks, "buy")
+        tasks.textIndex.save(tasks, self.path)
+        writeSnapshot([task("Walk the dog")], self.path)
+        self.assertIsNone(loadIndex(loadTasks(self.path), self.path))
+
+if __name__ == "__main__":
+    unittest.main()
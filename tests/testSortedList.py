@@ -0,0 +1,101 @@
+# testSortedList.py
+"""
+Checks taskCollection.SortedList against a plain sorted list, with small
+buckets so that splits and emptied buckets happen often, and the positions
+TaskCollection reports against its sorted views.
+"""
+import random
+import unittest
+from bisect import bisect_left, insort
+from taskCollection import SortedList, TaskCollection
+from taskModel import Task, Priority
+
+class SortedListTest(unittest.TestCase):
+
+    def newList(self):
+        values = SortedList()
+        values.bucketSize = 4
+        return values
+
+    def assertSame(self, values, expected):
+        self.assertEqual(list(values), expected)
+        self.assertEqual(len(values), len(expected))
+        self.assertEqual(values.maxes, [bucket[-1] for bucket in values.buckets])
+
+    def testRandomInsertsAndRemovalsStaySorted(self):
+        rng = random.Random(1)
+        values, expected = self.newList(), []
+        for _ in range(3000):
+            if expected and rng.random() < 0.4:
+                value = rng.choice(expected)
+                values.remove(value)
+                expected.remove(value)
+            else:
+                value = rng.randrange(500)
+                values.add(value)
+                insort(expected, value)
+        self.assertSame(values, expected)
+
+    def testRankIsThePositionOfAValue(self):
+        rng = random.Random(2)
+        values, expected = self.newList(), []
+        for value in rng.sample(range(10000), 300):
+            values.add(value)
+            insort(expected, value)
+        for probe in range(-1, 10001, 37):
+            self.assertEqual(values.rank(probe), bisect_left(expected, probe))
+        for index, value in enumerate(expected):
+            self.assertEqual(values.rank(value), index)
+            self.assertEqual(values[index], value)
+            self.assertEqual(values[index - len(expected)], value)
+
+    def testIterFromStartsAtTheFirstValueNotLess(self):
+        values = self.newList()
+        values.update(range(0, 100, 2))
+        self.assertEqual(list(values.iterFrom(51)), list(range(52, 100, 2)))
+        self.assertEqual(list(values.iterFrom(100)), [])
+
+    def testUpdateMergesWithExistingValues(self):
+        values = self.newList()
+        values.update(range(0, 200, 2))
+        values.update(range(1, 200, 2))  # Interleaved: merged in one pass
+        values.update([300, 301])  # After the end: new buckets only
+        values.add(150)
+        self.assertSame(values, sorted(list(range(200)) + [150, 300, 301]))
+
+    def testPopAndMissingValues(self):
+        values = self.newList()
+        values.update(range(20))
+        self.assertEqual(values.pop(), 19)
+        self.assertEqual(values.pop(0), 0)
+        self.assertSame(values, list(range(1, 19)))
+        with self.assertRaises(ValueError):
+            values.remove(0)
+        with self.assertRaises(ValueError):
+            values.remove(99)
+        with self.assertRaises(IndexError):
+            values[18]
+
+class TaskCollectionPositionTest(unittest.TestCase):
+
+    def testPositionsMatchTheSortedViews(self):
+        rng = random.Random(3)
+        tasks = TaskCollection()
+        for step in range(600):
+            if len(tasks) and rng.random() < 0.3:
+                tasks.removeSeq(tasks.seqAt(rng.randrange(len(tasks))))
+            elif len(tasks) and rng.random() < 0.3:
+                seq = tasks.seqAt(rng.randrange(len(tasks)))
+                tasks.replaceSeq(seq, Task(f"e{step}", "", rng.choice(list(Priority)), 739000 + rng.randrange(30)))
+            else:
+                tasks.append(Task(f"t{step}", "", rng.choice(list(Priority)), 739000 + rng.randrange(30)))
+        for sortBy in (None, "priority", "dueDate"):
+            order = list(tasks.sortedSeqs(sortBy))
+            self.assertEqual([tasks.position(seq, sortBy) for seq in order], list(range(len(order))))
+            keys = [tasks.sortKey(seq, sortBy) for seq in order]
+            self.assertEqual(keys, sorted(keys))
+        byPriority = list(tasks.sortedBy("priority"))
+        self.assertEqual(byPriority, sorted(tasks, key=lambda task: -task.priority))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+# testSqliteStorage.py
+"""
+Checks the SQLite storage engine: changes survive reopening the database,
+indexed queries answer the today and sorted views, and a JSON task file is
+migrated once.
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import fileOperations
+from fileOperations import lockPath
+from sqliteStorage import SQLiteTaskStore, openStore
+from taskModel import Task, Priority, Recurrence
+
+TODAY = 739000
+
+def sampleTasks():
+    return [Task("write report", "", Priority.MEDIUM, TODAY + 2),
+            Task("call bank", "", Priority.HIGH, TODAY),
+            Task("water plants", "", Priority.LOW, TODAY - 3, repeat=Recurrence.fromText("every 3 days", TODAY - 3)),
+            Task("pay rent", "", Priority.HIGH, TODAY + 1, True)]
+
+class SQLiteStorageTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.dbPath = os.path.join(self.directory, "tasks.db")
+        self.store = SQLiteTaskStore(self.dbPath)
+        self.store.replaceTasks(sampleTasks())
+        self.tasks = self.store.loadTasks()
+
+    def tearDown(self):
+        self.store.close()
+        for loaded in (fileOperations.loadedStamps, fileOperations.loadedJournals, fileOperations.loadedBases):
+            for path in [path for path in loaded if path.startswith(self.directory)]:
+                del loaded[path]
+        shutil.rmtree(self.directory)
+
+    def reopen(self):
+        self.store.close()
+        self.store = SQLiteTaskStore(self.dbPath)
+        return self.store.loadTasks()
+
+    def titles(self, tasks):
+        return [task.title for task in tasks]
+
+    def testChangesSurviveReopening(self):
+        added = Task("book flights", "window seat", Priority.LOW, TODAY + 9)
+        self.tasks.append(added)
+        self.store.record("add", task=added)
+        edited = Task("write summary", "", Priority.HIGH, TODAY + 2, id=self.tasks[0].id)
+        self.tasks[0] = edited
+        self.store.record("edit", 0, edited)
+        self.store.recordMany([("delete", 1, self.tasks.pop(1))])
+        reloaded = self.reopen()
+        self.assertEqual([task.toDict() for task in reloaded], [task.toDict() for task in self.tasks])
+        self.assertEqual(str(reloaded[1].repeat), "every 3 days")
+
+    def testIndexedQueries(self):
+        self.assertEqual(self.titles(self.store.queryTasks(sortBy="priority")),
+                         ["call bank", "pay rent", "write report", "water plants"])
+        self.assertEqual(self.titles(self.store.queryTasks(sortBy="dueDate")),
+                         ["water plants", "call bank", "pay rent", "write report"])
+        # The recurring task comes round again today; the completed one does not
+        self.assertEqual(self.titles(self.store.queryTasks(True, "priority", TODAY)), ["call bank", "water plants"])
+        self.assertEqual(self.titles(self.store.queryTasks(True, None, TODAY + 1)), ["pay rent"])
+
+    def testJsonFileIsMigratedOnce(self):
+        self.store.close()
+        os.remove(self.dbPath)
+        jsonPath = os.path.join(self.directory, "tasks.json")
+        with open(jsonPath, 'w', encoding="utf-8") as file:
+            json.dump([task.toDict() for task in sampleTasks()], file)
+        self.store = openStore(self.dbPath, jsonPath)
+        self.assertEqual(self.titles(self.store.loadTasks()), self.titles(sampleTasks()))
+        self.store.replaceTasks([])
+        self.store.close()
+        self.store = openStore(self.dbPath, jsonPath)
+        self.assertTrue(self.store.isEmpty())  # Not imported again
+
+    def testViewNumbersQueriedRowsByListPosition(self):
+        view = self.store.view(self.tasks)
+        self.assertEqual([(number, task.title) for number, task in view.numberedBy("priority")],
+                         [(2, "call bank"), (4, "pay rent"), (1, "write report"), (3, "water plants")])
+        self.assertEqual([(number, task.title) for number, task in view.numberedDueOn(TODAY, "dueDate")],
+                         [(3, "water plants"), (2, "call bank")])
+        self.assertEqual(len(view), 4)
+
+    def testImportLeavesNoLockFile(self):
+        jsonPath = os.path.join(self.directory, "tasks.json")
+        with open(jsonPath, 'w', encoding="utf-8") as file:
+            json.dump([task.toDict() for task in sampleTasks()], file)
+        self.assertEqual(self.store.importJson(jsonPath), 4)
+        self.assertFalse(os.path.exists(lockPath(jsonPath)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+# testTaskArchive.py
+"""
+Checks which completed tasks are moved to the archive, the month partitions
+they land in, and searching and restoring archived tasks.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import fileOperations
+from datetime import date
+from fileOperations import writeSnapshot, loadTasks, openJournal, closeJournal
+from taskArchive import TaskArchive
+from taskModel import Task, Priority, parseDate, stampCompletion
+
+TODAY = date(2025, 3, 31).toordinal()
+
+class TaskArchiveTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "tasks.json")
+        writeSnapshot([
+            Task("old report", "", Priority.LOW, TODAY - 31, True, id="old"),
+            Task("boundary", "", Priority.LOW, TODAY - 30, True, id="boundary"),
+            Task("pending", "", Priority.HIGH, TODAY - 60, id="pending"),
+            Task("january report", "", Priority.MEDIUM, parseDate("15-01-2025"), True, id="january"),
+            Task("recent", "", Priority.LOW, TODAY - 1, True, id="recent"),
+        ], self.path)
+        self.tasks = loadTasks(self.path)
+        self.journal = openJournal(self.tasks, self.path)
+        self.archive = TaskArchive(self.path, archiveAfter=30)
+
+    def tearDown(self):
+        closeJournal()
+        for loaded in (fileOperations.loadedStamps, fileOperations.loadedJournals, fileOperations.loadedBases):
+            loaded.pop(self.path, None)
+        shutil.rmtree(self.directory)
+
+    def ids(self, tasks):
+        return [task.id for task in tasks]
+
+    def reload(self):
+        closeJournal()
+        fileOperations.loadedStamps.pop(self.path, None)
+        self.tasks = loadTasks(self.path)
+        self.journal = openJournal(self.tasks, self.path)
+
+    def testOnlyTasksCompletedBeforeTheThresholdMove(self):
+        self.assertEqual(self.archive.moveCompleted(self.tasks, today=TODAY), 2)
+        self.assertEqual(self.ids(self.tasks), ["boundary", "pending", "recent"])
+        self.assertEqual(self.archive.months(), ["2025-01", "2025-02"])
+        self.assertEqual(self.ids(self.archive.partition("2025-02")), ["old"])
+        self.assertEqual(self.archive.moveCompleted(self.tasks, today=TODAY), 0)
+        self.assertEqual(self.archive.moveCompleted(self.tasks, days=0, today=TODAY), 2)
+        self.assertEqual(self.ids(self.archive.tasks()), ["january", "old", "boundary", "recent"])
+        self.reload()  # The moves were journaled
+        self.assertEqual(self.ids(self.tasks), ["pending"])
+
+    def testSearchAndRestore(self):
+        self.archive.moveCompleted(self.tasks, today=TODAY)
+        found = self.archive.search("rep")
+        self.assertEqual([(number, task.id) for number, task in found], [(1, "january"), (2, "old")])
+        self.archive.restore(self.tasks, found[0][1])
+        restored = self.tasks[-1]
+        self.assertEqual(restored.id, "january")
+        self.assertFalse(restored.completed)
+        self.assertEqual(self.archive.months(), ["2025-02"])  # Its partition became empty
+        self.assertIsNone(self.archive.restore(self.tasks, found[0][1]))
+        self.assertEqual(self.archive.moveCompleted(self.tasks, today=TODAY), 0)
+
+    def testTaskArchivedTwiceAfterACrashIsReadOnce(self):
+        self.archive.moveCompleted(self.tasks, today=TODAY)
+        partition = self.archive.partitionPath("2025-02")
+        with open(partition, 'r', encoding="utf-8") as file:
+            line = file.read()
+        with open(partition, 'a', encoding="utf-8") as file:
+            file.write(line)
+        self.assertEqual(self.ids(self.archive.partition("2025-02")), ["old"])
+
+    def testCompletionDayDecidesWhenATaskMoves(self):
+        lateFinish = stampCompletion(Task("late finish", "", Priority.LOW, TODAY - 90, True), today=TODAY - 2)
+        earlyFinish = stampCompletion(Task("early finish", "", Priority.LOW, TODAY + 5, True), today=TODAY - 45)
+        self.tasks.extend([lateFinish, earlyFinish])
+        self.archive.moveCompleted(self.tasks, today=TODAY)
+        self.assertIn(lateFinish.id, self.ids(self.tasks))
+        self.assertEqual(self.ids(self.archive.partition("2025-02")), ["old", earlyFinish.id])
+        restored = self.archive.restore(self.tasks, self.archive.partition("2025-02")[1])
+        self.assertNotIn("completedAt", self.tasks.get(restored).extra or {})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+# testTaskModel.py
+"""
+Checks the Task record's JSON form: priorities and dates are normalized on
+load and written back in the file's spelling.
+"""
+import unittest
+from taskModel import Task, Priority, parseDate, formatDate
+
+class TaskModelTest(unittest.TestCase):
+
+    def testPrioritySpellingsAreNormalized(self):
+        for text, priority in (("High", Priority.HIGH), ("low ", Priority.LOW), (" MEDIUM", Priority.MEDIUM)):
+            self.assertIs(Priority.parse(text), priority)
+        self.assertIsNone(Priority.parse("urgent"))
+        self.assertGreater(Priority.HIGH, Priority.MEDIUM)
+
+    def testJsonRoundTrip(self):
+        data = {"title": "pay rent", "description": "by transfer", "priority": "low ",
+                "dueDate": "29-02-2024", "completed": True, "note": "kept"}
+        task = Task.fromDict(data)
+        self.assertEqual((task.priority, formatDate(task.due), task.completed), (Priority.LOW, "29-02-2024", True))
+        again = task.toDict()
+        self.assertEqual(again["priority"], "low")
+        self.assertEqual(again["note"], "kept")
+        self.assertEqual(Task.fromDict(again).toDict(), again)
+
+    def testInvalidDatesAreRejected(self):
+        for text in ("31-02-2025", "2025-01-31", "1-1-25"):
+            with self.assertRaises(ValueError):
+                parseDate(text)
+
+    def testUnknownPriorityIsRejected(self):
+        with self.assertRaises(ValueError):
+            Task.fromDict({"title": "a", "description": "", "priority": "urgent", "dueDate": "01-03-2025"})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+# testTaskQuery.py
+"""
+Checks query filters, multi-key ordering and limits, and that queries read
+from the collection's sort indexes give the same answer as a full sort.
+"""
+import unittest
+from taskCollection import TaskCollection
+from taskModel import Task, Priority
+from taskQuery import Query, QueryError, buildQuery, dueWithin, parseOrderKeys
+
+TODAY = 739000
+
+def sampleTasks():
+    return TaskCollection([
+        Task("write report", "", Priority.MEDIUM, TODAY + 3),
+        Task("Call bank", "", Priority.HIGH, TODAY + 1),
+        Task("archive mail", "", Priority.LOW, TODAY - 2, True),
+        Task("book flights", "", Priority.HIGH, TODAY + 10),
+        Task("pay rent", "", Priority.HIGH, TODAY + 1),
+        Task("clean desk", "", Priority.LOW, TODAY),
+    ])
+
+def titles(tasks):
+    return [task.title for task in tasks]
+
+class TaskQueryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tasks = sampleTasks()
+
+    def testOrderBySeveralKeys(self):
+        query = buildQuery("priority:desc,dueDate")
+        self.assertEqual(titles(query.run(self.tasks)),
+                         ["Call bank", "pay rent", "book flights", "write report", "archive mail", "clean desk"])
+        query = buildQuery(["dueDate:desc", "title"])
+        self.assertEqual(titles(query.run(self.tasks)),
+                         ["book flights", "write report", "Call bank", "pay rent", "clean desk", "archive mail"])
+
+    def testTitlesSortWithoutCaseAndDescend(self):
+        self.assertEqual(titles(buildQuery("title").run(self.tasks))[:3], ["archive mail", "book flights", "Call bank"])
+        self.assertEqual(titles(buildQuery("-title").run(self.tasks))[:2], ["write report", "pay rent"])
+
+    def testLimitKeepsTheFirstTasksInQueryOrder(self):
+        self.assertEqual(titles(buildQuery("priority:desc,dueDate", limit=2).run(self.tasks)), ["Call bank", "pay rent"])
+        self.assertEqual(titles(buildQuery(limit=2).run(self.tasks)), ["write report", "Call bank"])
+        self.assertEqual(buildQuery("dueDate", limit=0).run(self.tasks), [])
+
+    def testFilters(self):
+        query = buildQuery("dueDate", pending=True, priority="high")
+        self.assertEqual(titles(query.run(self.tasks)), ["Call bank", "pay rent", "book flights"])
+        query = Query([dueWithin(1, TODAY), ("completed", "==", False)], ["title"])
+        self.assertEqual(titles(query.run(self.tasks)), ["Call bank", "clean desk", "pay rent"])
+        query = Query([("dueDate", "<=", TODAY), ("completed", "==", True)])
+        self.assertEqual(titles(query.run(self.tasks)), ["archive mail"])
+
+    def testIndexedOrdersMatchAFullSort(self):
+        for orderBy in ("", "priority:desc", "dueDate"):
+            for limit in (None, 0, 1, 4):
+                query = buildQuery(orderBy, limit=limit)
+                self.assertEqual([self.tasks.get(seq) for seq in query.seqs(self.tasks)], query.run(self.tasks),
+                                 (orderBy, limit))
+
+    def testSeqsWithinSearchCandidates(self):
+        candidates = {self.tasks.seqAt(1), self.tasks.seqAt(3), self.tasks.seqAt(5)}
+        seqs = buildQuery("dueDate:desc", limit=2).seqs(self.tasks, candidates)
+        self.assertEqual(titles(self.tasks.get(seq) for seq in seqs), ["book flights", "Call bank"])
+
+    def testInvalidQueries(self):
+        self.assertEqual(parseOrderKeys("priority:desc, -dueDate,title:asc"),
+                         (("priority", True), ("dueDate", True), ("title", False)))
+        for orderBy in ("size", "priority:down", "due"):
+            with self.assertRaises(QueryError):
+                buildQuery(orderBy)
+        with self.assertRaises(QueryError):
+            buildQuery(priority="urgent")
+        with self.assertRaises(QueryError):
+            buildQuery(limit=-1)
+        with self.assertRaises(QueryError):
+            Query([("dueDate", "~", TODAY)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+# testWorkspaces.py
+"""
+Checks named task lists: switching loads and evicts lists through the LRU
+cache, and lists that are not loaded are answered from their summaries,
+which are rebuilt once their task file changes.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import fileOperations
+from fileOperations import closeJournal, recordChange, writeSnapshot
+from taskModel import Task, Priority
+from workspaces import WorkspaceManager, WorkspaceError, readSummary
+
+TODAY = 739000
+
+class WorkspacesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.defaultFile = os.path.join(self.directory, "tasks.json")
+        self.manager = WorkspaceManager(self.defaultFile, capacity=1, autoArchive=False)
+
+    def tearDown(self):
+        self.manager.close()
+        closeJournal()
+        for loaded in (fileOperations.loadedStamps, fileOperations.loadedJournals, fileOperations.loadedBases):
+            for path in [path for path in loaded if path.startswith(self.directory)]:
+                del loaded[path]
+        shutil.rmtree(self.directory)
+
+    def add(self, title, due=TODAY, completed=False):
+        task = Task(title, "", Priority.LOW, due, completed)
+        self.manager.active.tasks.append(task)
+        recordChange("add", task=task)
+
+    def testNames(self):
+        self.assertEqual(self.manager.names(), ["default"])
+        self.manager.switch("work")
+        self.manager.switch("home")
+        self.assertEqual(self.manager.names(), ["default", "home", "work"])
+        for name in ("../secret", "", "two words"):
+            with self.assertRaises(WorkspaceError):
+                self.manager.switch(name)
+
+    def testEvictedListIsAnsweredFromItsSummary(self):
+        self.manager.switch("work")
+        self.add("standup")
+        self.add("review", TODAY + 3, True)
+        self.add("retro", TODAY + 30)
+        self.manager.switch("default")  # Evicts work, writing its summary
+        self.add("groceries")
+        self.assertEqual(list(self.manager.loaded), ["default"])
+        workFile = self.manager.filePath("work")
+        self.assertEqual(readSummary(workFile)["count"], 3)
+        self.assertEqual(self.manager.overview(TODAY), [("default", 1, 1, True), ("work", 3, 2, False)])
+        due = self.manager.dueToday(TODAY)
+        self.assertEqual([(name, [(number, task.title) for number, task in numbered]) for name, numbered in due],
+                         [("default", [(1, "groceries")]), ("work", [(1, "standup")])])
+        self.assertEqual(self.manager.dueToday(TODAY + 3)[0][1][0][0], 2)  # Numbered by list position
+
+    def testSummaryIsRebuiltWhenTheFileChanges(self):
+        self.manager.switch("work")
+        self.add("standup")
+        self.manager.switch("default")
+        workFile = self.manager.filePath("work")
+        os.remove(workFile + ".journal")
+        writeSnapshot([Task("plan", "", Priority.HIGH, TODAY), Task("ship", "", Priority.HIGH, TODAY)], workFile)
+        self.assertEqual(self.manager.overview(TODAY)[1], ("work", 2, 2, False))
+        self.assertEqual(readSummary(workFile)["count"], 2)
+
+    def testSwitchingBackReloadsTheList(self):
+        self.manager.switch("work")
+        self.add("standup")
+        self.manager.switch("default")
+        workspace = self.manager.switch("work")
+        self.assertEqual([task.title for task in workspace.tasks], ["standup"])
+        self.assertEqual(list(self.manager.loaded), ["work"])
+
+if __name__ == "__main__":
+    unittest.main()
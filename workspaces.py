@@ -0,0 +1,235 @@
+# workspaces.py
+"""
+Named task lists (workspaces) for the Task Manager application.
+The default list is the --file task file and every other list NAME lives in
+workspaces/NAME.json next to it (NAME.bin or NAME.ndjson if --file uses that
+format). A list is only loaded when the console,
+command line or GUI switches to it, and at most CACHE_SIZE lists stay
+loaded: opening another one flushes the least recently used list (its
+journal compacted if it grew, its search index and summary rewritten if it
+changed) and drops it.
+
+Every list keeps a small summary beside its task file (NAME.json.summary)
+with its task counts, the tasks due over the next SUMMARY_DAYS days and its
+pending recurring tasks, stamped with the state of the task file and
+journal it was built from. The cross-list "due today" view answers from
+these summaries, and only rebuilds the summary of a list that changed since.
+"""
+import json
+import os
+import re
+from collections import OrderedDict
+from datetime import date
+from fileOperations import (loadTasks, iterTasks, openJournal, activateJournal, closeJournal, fileLock,
+                            journalPath, statSignature)
+from searchIndex import loadIndex
+from taskArchive import TaskArchive, ARCHIVE_AFTER_DAYS
+from taskModel import Task
+
+DEFAULT_WORKSPACE = "default"
+WORKSPACE_DIRECTORY = "workspaces"
+SUMMARY_EXTENSION = ".summary"
+CACHE_SIZE = 4  # Lists kept loaded at once
+SUMMARY_DAYS = 7  # Days of upcoming tasks kept in a summary
+NAME_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
+class WorkspaceError(ValueError):
+    """Raised for an invalid list name."""
+
+def summaryPath(filePath):
+    """Return the summary file of a task file."""
+    return filePath + SUMMARY_EXTENSION
+
+def fileSignature(filePath):
+    """Return the state of a task file and its journal, as stored in summaries."""
+    return [list(signature) if signature else None
+            for signature in (statSignature(filePath), statSignature(journalPath(filePath)))]
+
+def summarize(numbered, today=None):
+    """Build the summary of a list from its tasks given as (number, task) pairs."""
+    today = today or date.today().toordinal()
+    horizon = today + SUMMARY_DAYS
+    count = pending = 0
+    upcoming = []
+    for number, task in numbered:
+        count += 1
+        pending += not task.completed
+        # A pending recurring task may occur on any later day, whatever its next due date
+        if today <= task.due < horizon or (task.repeat is not None and not task.completed):
+            upcoming.append([number, task.toDict()])
+    return {"built": today, "horizon": horizon, "count": count, "pending": pending, "upcoming": upcoming}
+
+def summaryDueOn(summary, day):
+    """Return (number, task) for the tasks of a summary due on day, in list order."""
+    numbered = [(number, Task.fromDict(data)) for number, data in summary["upcoming"]]
+    return [(number, task) for number, task in numbered if task.occursOn(day)]
+
+def readSummary(filePath):
+    """Return the stored summary of a task file, or None if there is none."""
+    try:
+        with open(summaryPath(filePath), 'r', encoding="utf-8") as file:
+            return json.load(file)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def writeSummary(filePath, summary):
+    """Store the summary of a task file."""
+    tempPath = summaryPath(filePath) + ".tmp"
+    with open(tempPath, 'w', encoding="utf-8") as file:
+        json.dump(summary, file)
+    os.replace(tempPath, summaryPath(filePath))
+
+class Workspace:
+    """A loaded task list with its journal and archive."""
+
+    def __init__(self, name, filePath, tasks, journal, archive):
+        self.name = name
+        self.filePath = filePath
+        self.tasks = tasks
+        self.journal = journal
+        self.archive = archive
+
+    def isDirty(self):
+        """Return True if the list changed since its summary was written."""
+        summary = readSummary(self.filePath)
+        return summary is None or summary.get("signature") != fileSignature(self.filePath)
+
+    def flush(self):
+        """Write what a dropped list leaves behind: a compacted journal, the search index and the summary."""
+        self.journal.compactIfNeeded()
+        if not self.isDirty():
+            return
+        textIndex = getattr(self.tasks, "textIndex", None)
+        if textIndex is not None:
+            textIndex.save(self.tasks, self.filePath)
+        with fileLock(self.filePath):
+            self.journal.sync()  # Summarize the list as other processes last saved it
+            summary = summarize(enumerate(self.tasks, 1))
+            summary["signature"] = fileSignature(self.filePath)
+        writeSummary(self.filePath, summary)
+
+class WorkspaceManager:
+    """The named task lists of a task file, loaded on demand and kept in an LRU cache."""
+
+    def __init__(self, defaultFile='tasks.json', capacity=CACHE_SIZE, archiveAfter=ARCHIVE_AFTER_DAYS,
+                 autoArchive=True):
+        self.defaultFile = defaultFile
+        self.extension = os.path.splitext(defaultFile)[1] or ".json"  # Lists use the default list's file format
+        self.directory = os.path.join(os.path.dirname(defaultFile), WORKSPACE_DIRECTORY)
+        self.capacity = max(1, capacity)
+        self.archiveAfter = archiveAfter
+        self.autoArchive = autoArchive  # Archive old completed tasks when a list is loaded
+        self.loaded = OrderedDict()  # Name -> Workspace, least recently used first
+        self.active = None
+
+    def filePath(self, name):
+        """Return the task file of a list."""
+        if name == DEFAULT_WORKSPACE:
+            return self.defaultFile
+        if not NAME_PATTERN.fullmatch(name):
+            raise WorkspaceError(f"invalid list name {name!r} (use letters, digits, '-' and '_')")
+        return os.path.join(self.directory, name + self.extension)
+
+    def names(self):
+        """Return the names of every list, the default one first, without loading any."""
+        try:
+            files = os.listdir(self.directory)
+        except FileNotFoundError:
+            files = []
+        # A list's task file may not be written yet while its journal already is
+        suffixes = (self.extension, journalPath(self.extension), summaryPath(self.extension))
+        names = {name[:-len(suffix)] for name in files for suffix in suffixes if name.endswith(suffix)}
+        names.update(self.loaded)
+        names.discard(DEFAULT_WORKSPACE)
+        return [DEFAULT_WORKSPACE] + sorted(name for name in names if NAME_PATTERN.fullmatch(name))
+
+    def switch(self, name, progress=None):
+        """Make a list the active one, loading it first if it is not in the cache; returns its Workspace.
+
+        A list that does not exist yet is created empty. progress is passed on
+        to loadTasks when the list is loaded.
+        """
+        workspace = self.loaded.get(name)
+        if workspace is None:
+            workspace = self.load(name, progress)
+        else:
+            self.loaded.move_to_end(name)
+            activateJournal(workspace.journal)
+        self.active = workspace
+        while len(self.loaded) > self.capacity:
+            self.evict(next(iter(self.loaded)))
+        return workspace
+
+    def load(self, name, progress=None):
+        """Load a list, make its journal the active one and add it to the cache."""
+        filePath = self.filePath(name)
+        if name != DEFAULT_WORKSPACE:
+            os.makedirs(self.directory, exist_ok=True)
+        tasks = loadTasks(filePath, progress)
+        loadIndex(tasks, filePath)
+        journal = openJournal(tasks, filePath, closeActive=False)
+        archive = TaskArchive(filePath, self.archiveAfter)
+        if self.autoArchive:
+            archive.moveCompleted(tasks)
+        workspace = self.loaded[name] = Workspace(name, filePath, tasks, journal, archive)
+        return workspace
+
+    def evict(self, name):
+        """Flush a loaded list and drop it from the cache."""
+        workspace = self.loaded.pop(name)
+        workspace.flush()
+        closeJournal(workspace.journal)
+        if workspace is self.active:
+            self.active = None
+
+    def close(self):
+        """Flush and drop every loaded list."""
+        for name in list(self.loaded):
+            self.evict(name)
+
+    def summary(self, name, today=None):
+        """Return the summary of a list, rebuilding it (without caching the list) if it is out of date."""
+        today = today or date.today().toordinal()
+        filePath = self.filePath(name)
+        summary = readSummary(filePath)
+        if summary is not None and summary.get("signature") == fileSignature(filePath) \
+                and summary["built"] <= today < summary["horizon"]:
+            return summary
+        with fileLock(filePath):
+            signature = fileSignature(filePath)
+            summary = summarize(enumerate(iterTasks(filePath), 1), today)
+        summary["signature"] = signature
+        writeSummary(filePath, summary)
+        return summary
+
+    def overview(self, today=None):
+        """Return (list name, task count, pending count, loaded) for every list."""
+        rows = []
+        for name in self.names():
+            workspace = self.loaded.get(name)
+            if workspace is not None:
+                tasks = workspace.tasks
+                rows.append((name, len(tasks), sum(not task.completed for task in tasks), True))
+            else:
+                summary = self.summary(name, today)
+                rows.append((name, summary["count"], summary["pending"], False))
+        return rows
+
+    def dueToday(self, today=None):
+        """Return (list name, [(number, task)]) for every list with tasks due today.
+
+        Loaded lists answer from their due-date index; the others from their summaries.
+        """
+        today = today or date.today().toordinal()
+        due = []
+        for name in self.names():
+            workspace = self.loaded.get(name)
+            if workspace is not None:
+                workspace.journal.sync()
+                tasks = workspace.tasks
+                numbered = [(tasks.indexOf(seq) + 1, tasks.get(seq)) for seq in tasks.seqsDueOn(today)]
+            else:
+                numbered = summaryDueOn(self.summary(name, today), today)
+            if numbered:
+                due.append((name, numbered))
+        return due